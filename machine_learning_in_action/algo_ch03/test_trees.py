@@ -0,0 +1,112 @@
+"""
+NAME:               test_trees.py (data_projects/machine_learning_in_action/algo_ch03/)
+
+DESCRIPTION:        Pytest checks for the ID3 decision tree algorithm in trees.py.
+
+NOTE:               Run with 'python -m pytest' from this directory or the repository root.
+"""
+
+
+# ====================================================================================
+# ================================ IMPORT STATEMENTS =================================
+# ====================================================================================
+
+
+import pytest                               # Library for writing and running test functions
+import numpy as np                          # Library for simple linear mathematical operations
+import trees                                # Modular program under test (ID3 decision trees)
+
+
+# ====================================================================================
+# ============================ COMPILED TREE FILE CHECKS =============================
+# ====================================================================================
+
+
+# ============= FUNCTION TO CHECK STORE/GRAB ROUND-TRIP OF COMPILED TREE =============
+def test_store_and_grab_tree_round_trip(tmp_path):
+    dt = trees.ID3_Decision_Tree_Algorithm()
+    decision_tree = {"no surfacing": {0: "no", 1: {"flippers": {0: "no", 1: "yes"}}}}
+    path = str(tmp_path / "tree.bin")
+
+    dt.store_tree(decision_tree, path)
+    assert dt.grab_tree(path) == decision_tree
+
+    compiled_tree = dt.grab_compiled_tree(path)
+    for test_vector, class_label in (([0, 0], "no"), ([1, 0], "no"), ([1, 1], "yes")):
+        assert compiled_tree.classify(["no surfacing", "flippers"], test_vector) == class_label
+
+# ============ FUNCTION TO CHECK ROUND-TRIP OF NUMPY AND BOOLEAN VALUES ==============
+@pytest.mark.parametrize("decision_tree, expected_tree", [
+    ({"f": {np.int64(0): "no", np.int64(1): "yes"}}, {"f": {0: "no", 1: "yes"}}),
+    ({"f": {True: "yes", False: "no"}}, {"f": {True: "yes", False: "no"}}),
+    ({np.str_("f"): {np.bool_(True): np.float64(1.5), np.bool_(False): np.int32(-2)}}, {"f": {True: 1.5, False: -2}})])
+def test_store_and_grab_tree_round_trips_numpy_and_bool_values(tmp_path, decision_tree, expected_tree):
+    dt = trees.ID3_Decision_Tree_Algorithm()
+    path = str(tmp_path / "tree.bin")
+
+    dt.store_tree(decision_tree, path)
+    grabbed_tree = dt.grab_tree(path)
+
+    # Booleans come back as booleans rather than as the integers they compare equal to
+    assert grabbed_tree == expected_tree
+    assert [type(key) for key in grabbed_tree["f"]] == [type(key) for key in expected_tree["f"]]
+    assert [type(value) for value in grabbed_tree["f"].values()] == [type(value) for value in expected_tree["f"].values()]
+
+# ================= FUNCTION TO CHECK REJECTION OF NON-TREE FILE MAGIC ===============
+def test_read_tree_buffer_rejects_bad_magic(tmp_path):
+    dt = trees.ID3_Decision_Tree_Algorithm()
+    path = str(tmp_path / "tree.bin")
+    dt.store_tree({"flippers": {0: "no", 1: "yes"}}, path)
+
+    with open(path, "rb") as f:
+        buffer = b"XXXX" + f.read()[4:]
+    with pytest.raises(ValueError):
+        dt.read_tree_buffer(buffer)
+
+# =============== FUNCTION TO CHECK REJECTION OF TRUNCATED CONSTANT TABLE ============
+@pytest.mark.parametrize("missing_bytes", [1, 3, 6])
+def test_read_tree_buffer_rejects_truncated_constants(tmp_path, missing_bytes):
+    dt = trees.ID3_Decision_Tree_Algorithm()
+    path = str(tmp_path / "tree.bin")
+    dt.store_tree({"flippers": {0: "no", 1: "yes"}}, path)
+
+    # The last constant is "yes" (5-byte entry header plus 3 bytes), so these cut into its payload and its header
+    with open(path, "rb") as f:
+        buffer = f.read()[:-missing_bytes]
+    with pytest.raises(ValueError):
+        dt.read_tree_buffer(buffer)
+
+
+# ====================================================================================
+# ============================ NUMERIC THRESHOLD CHECKS ==============================
+# ====================================================================================
+
+
+# =============== FUNCTION TO CHECK THRESHOLD TREE ON NUMERIC FEATURES ===============
+def test_threshold_tree_classifies_numeric_data():
+    dt = trees.ID3_Decision_Tree_Algorithm()
+    labels = ["length", "width"]
+    dataset = [[1.0, 5.2, "short"], [1.5, 3.1, "short"], [2.2, 4.4, "short"],
+               [3.9, 0.7, "medium"], [4.4, 2.5, "medium"], [5.1, 1.9, "medium"],
+               [7.0, 6.3, "long"], [8.1, 0.4, "long"], [9.6, 2.8, "long"]]
+    decision_tree = dt.create_tree([row[:] for row in dataset], labels[:], numeric_labels = set(labels))
+
+    # Every branch key of the root is a numeric threshold on a continuous feature
+    assert all(isinstance(key, tuple) for key in decision_tree[list(decision_tree)[0]])
+    for row in dataset:
+        assert dt.classify(decision_tree, labels, row[:-1]) == row[-1]
+    assert dt.classify(decision_tree, labels, [1.2, 9.9]) == "short"
+    assert dt.classify(decision_tree, labels, [8.8, 9.9]) == "long"
+
+# =============== FUNCTION TO CHECK ENTROPY CACHE STATISTICS PER BUILD ===============
+def test_entropy_cache_statistics_reset_per_build():
+    dt = trees.ID3_Decision_Tree_Algorithm()
+    dataset = [[1.0, 0, "no"], [2.0, 1, "no"], [3.0, 1, "yes"], [4.0, 0, "yes"], [5.0, 1, "yes"]]
+
+    dt.create_tree([row[:] for row in dataset], ["size", "flippers"], numeric_labels = {"size"})
+    first_statistics = dt.get_entropy_cache_statistics()
+    dt.create_tree([row[:] for row in dataset], ["size", "flippers"], numeric_labels = {"size"})
+
+    # A second identical build reports the same counts instead of accumulating across builds
+    assert dt.get_entropy_cache_statistics() == first_statistics
+    assert first_statistics["misses"] == first_statistics["cached_entropies"]
@@ -0,0 +1,232 @@
+"""
+NAME:               tree_exporter.py (data_projects/machine_learning_in_action/algo_ch03/)
+
+DESCRIPTION:        Python text export of decision tree ML algorithms as SVG or Graphviz dot.
+
+                    Unlike tree_plotter.py, nothing here depends on matplotlib: nodes and
+                    edges are written out as text while the tree is walked, so very large
+                    trees can be exported quickly. Subtrees below a depth, leaf-count, or
+                    sample-count threshold can be collapsed into a single placeholder node.
+
+NOTE:               Original source code is Python 2, but my code is Python 3.
+
+CREDIT:             Machine Learning In Action (Peter Harrington)
+"""
+
+
+# ====================================================================================
+# ================================ IMPORT STATEMENTS =================================
+# ====================================================================================
+
+
+import os                                   # Library for basic operating system mechanics
+from xml.sax.saxutils import escape         # Package for escaping text placed inside SVG markup
+from time import time as t                  # Package for tracking modular and program runtime
+
+
+# ====================================================================================
+# ============================== INITIALIZING CONSTANTS ==============================
+# ====================================================================================
+
+
+NODE_SPACING_X = 120                        # Horizontal SVG distance (pixels) between neighbouring leafs
+NODE_SPACING_Y = 80                         # Vertical SVG distance (pixels) between tree levels
+NODE_HALF_HEIGHT = 12                       # Half the height (pixels) of every SVG node box
+CHARACTER_WIDTH = 7                         # Approximate width (pixels) of one label character
+SVG_MARGIN = 20                             # Blank border (pixels) around the SVG drawing
+
+
+# ====================================================================================
+# =================== HELPER FUNCTIONS FOR EXPORTING DECISION TREES ==================
+# ====================================================================================
+
+
+# ==================== FUNCTION TO FORMAT BRANCH KEY AS EDGE TEXT ====================
+def format_branch_key(key):
+    # Numeric threshold branches are stored as ("<=", threshold) or (">", threshold) tuples
+    if type(key).__name__ == "tuple":
+        return "{} {:.4g}".format(key[0], key[1])
+    return str(key)
+
+# ================ FUNCTION TO MEASURE DISPLAYED TREE UNDER COLLAPSING ===============
+def measure_displayed_tree(decision_tree, max_depth = None, min_leafs = None, node_samples = None, min_samples = None):
+    raw_leafs = dict()
+    displayed_leafs = dict()
+    displayed_height = dict()
+    collapsed = set()
+
+    # Post-order walk with an explicit stack so that children are measured before their parents
+    stack = [(decision_tree, 0, False)]
+
+    while stack:
+        subtree, level, children_measured = stack.pop()
+        if type(subtree).__name__ != "dict":
+            continue
+
+        tree_dictionary = subtree[list(subtree)[0]]
+        if not children_measured:
+            stack.append((subtree, level, True))
+            for child in tree_dictionary.values():
+                stack.append((child, level + 1, False))
+            continue
+
+        children = [child for child in tree_dictionary.values() if type(child).__name__ == "dict"]
+        number_of_leafs = len(tree_dictionary) - len(children) + sum(raw_leafs[id(child)] for child in children)
+        raw_leafs[id(subtree)] = number_of_leafs
+
+        # Collapsed subtrees are drawn as one placeholder leaf regardless of what lies below
+        if (max_depth is not None and level >= max_depth) or (min_leafs is not None and number_of_leafs < min_leafs) or (min_samples is not None and node_samples is not None and node_samples.get(id(subtree), 0) < min_samples):
+            collapsed.add(id(subtree))
+            displayed_leafs[id(subtree)] = 1
+            displayed_height[id(subtree)] = 0
+        else:
+            displayed_leafs[id(subtree)] = len(tree_dictionary) - len(children) + sum(displayed_leafs[id(child)] for child in children)
+            displayed_height[id(subtree)] = 1 + max([displayed_height[id(child)] for child in children] + [0])
+
+    measurements = {"raw_leafs": raw_leafs,
+                    "displayed_leafs": displayed_leafs,
+                    "displayed_height": displayed_height,
+                    "collapsed": collapsed,
+                    "node_samples": node_samples}
+    return measurements
+
+# ================== FUNCTION TO WALK DISPLAYED TREE NODES IN ORDER ==================
+def walk_displayed_tree(decision_tree, measurements):
+    displayed_leafs = measurements["displayed_leafs"]
+    node_samples = measurements["node_samples"]
+    number_of_nodes = 0
+    leaf_offset = 0
+
+    # Pre-order walk yielding (node id, parent id, parent x, kind, text, branch text, level, x) per displayed node
+    stack = [(decision_tree, -1, 0.0, "", 0)]
+
+    while stack:
+        subtree, parent_id, parent_x, branch_text, level = stack.pop()
+        node_id = number_of_nodes
+        number_of_nodes += 1
+
+        # Leafs take the next unit slot from left to right
+        if type(subtree).__name__ != "dict":
+            yield node_id, parent_id, parent_x, "leaf", str(subtree), branch_text, level, leaf_offset + 0.5
+            leaf_offset += 1
+            continue
+
+        tree_string = list(subtree)[0]
+        tree_dictionary = subtree[tree_string]
+        node_text = str(tree_string)
+        if node_samples is not None:
+            node_text = "{} (n={})".format(node_text, node_samples.get(id(subtree), 0))
+
+        # Collapsed subtrees occupy a single slot and report how many leafs they hide
+        if id(subtree) in measurements["collapsed"]:
+            node_text = "{} [+{} leafs]".format(node_text, measurements["raw_leafs"][id(subtree)])
+            yield node_id, parent_id, parent_x, "collapsed", node_text, branch_text, level, leaf_offset + 0.5
+            leaf_offset += 1
+            continue
+
+        # Decision nodes are centred over the slots their displayed leafs will occupy
+        node_x = leaf_offset + displayed_leafs[id(subtree)] / 2.0
+        yield node_id, parent_id, parent_x, "decision", node_text, branch_text, level, node_x
+
+        for key in reversed(list(tree_dictionary.keys())):
+            stack.append((tree_dictionary[key], node_id, node_x, format_branch_key(key), level + 1))
+
+# ================= FUNCTION TO STREAM DECISION TREE AS GRAPHVIZ DOT =================
+def generate_tree_dot(decision_tree, max_depth = None, min_leafs = None, node_samples = None, min_samples = None):
+    measurements = measure_displayed_tree(decision_tree, max_depth, min_leafs, node_samples, min_samples)
+    node_shapes = {"decision": "shape=box", "leaf": "shape=ellipse", "collapsed": "shape=box, style=dashed"}
+
+    # Graphviz performs its own layout, so nodes and edges are emitted in a single streaming pass
+    yield "digraph decision_tree {\n"
+    yield "    node [fontname=\"Helvetica\"];\n"
+
+    for node_id, parent_id, _, kind, node_text, branch_text, _, _ in walk_displayed_tree(decision_tree, measurements):
+        yield "    n{} [label=\"{}\", {}];\n".format(node_id, node_text.replace("\\", "\\\\").replace("\"", "\\\""), node_shapes[kind])
+        if parent_id >= 0:
+            yield "    n{} -> n{} [label=\"{}\"];\n".format(parent_id, node_id, branch_text.replace("\\", "\\\\").replace("\"", "\\\""))
+
+    yield "}\n"
+
+# =================== FUNCTION TO STREAM DECISION TREE AS SVG TEXT ===================
+def generate_tree_svg(decision_tree, max_depth = None, min_leafs = None, node_samples = None, min_samples = None):
+    measurements = measure_displayed_tree(decision_tree, max_depth, min_leafs, node_samples, min_samples)
+
+    # Canvas size comes from the measuring pass, so nodes can be written as soon as they are reached
+    if type(decision_tree).__name__ == "dict":
+        width = measurements["displayed_leafs"][id(decision_tree)] * NODE_SPACING_X + 2 * SVG_MARGIN
+        height = measurements["displayed_height"][id(decision_tree)] * NODE_SPACING_Y + 2 * (SVG_MARGIN + NODE_HALF_HEIGHT)
+    else:
+        width = NODE_SPACING_X + 2 * SVG_MARGIN
+        height = 2 * (SVG_MARGIN + NODE_HALF_HEIGHT)
+
+    yield "<svg xmlns=\"http://www.w3.org/2000/svg\" width=\"{0}\" height=\"{1}\" viewBox=\"0 0 {0} {1}\" font-family=\"Helvetica\" font-size=\"11\">\n".format(width, height)
+
+    for _, parent_id, parent_x, kind, node_text, branch_text, level, node_x in walk_displayed_tree(decision_tree, measurements):
+        x = SVG_MARGIN + node_x * NODE_SPACING_X
+        y = SVG_MARGIN + NODE_HALF_HEIGHT + level * NODE_SPACING_Y
+
+        # Edges run from the bottom of the parent box to the top of the child box so boxes stay unobscured
+        if parent_id >= 0:
+            x0 = SVG_MARGIN + parent_x * NODE_SPACING_X
+            y0 = y - NODE_SPACING_Y + NODE_HALF_HEIGHT
+            y1 = y - NODE_HALF_HEIGHT
+            yield "<line x1=\"{:.1f}\" y1=\"{}\" x2=\"{:.1f}\" y2=\"{}\" stroke=\"#666\"/>\n".format(x0, y0, x, y1)
+            yield "<text x=\"{:.1f}\" y=\"{:.1f}\" text-anchor=\"middle\">{}</text>\n".format((x0 + x) / 2.0, (y0 + y1) / 2.0, escape(branch_text))
+
+        # Decision nodes are square boxes, leafs rounded, and collapsed subtrees dashed
+        box_width = CHARACTER_WIDTH * len(node_text) + 12
+        corner_radius = NODE_HALF_HEIGHT if kind == "leaf" else 0
+        dashes = " stroke-dasharray=\"4 2\"" if kind == "collapsed" else ""
+        yield "<rect x=\"{:.1f}\" y=\"{}\" width=\"{}\" height=\"{}\" rx=\"{}\" fill=\"#ccc\" stroke=\"#000\"{}/>\n".format(x - box_width / 2.0, y - NODE_HALF_HEIGHT, box_width, 2 * NODE_HALF_HEIGHT, corner_radius, dashes)
+        yield "<text x=\"{:.1f}\" y=\"{}\" text-anchor=\"middle\" dominant-baseline=\"central\">{}</text>\n".format(x, y, escape(node_text))
+
+    yield "</svg>\n"
+
+# ===================== FUNCTION TO WRITE STREAMED EXPORT TO FILE ====================
+def write_tree_export(chunks, output):
+    # Accepts either an open text stream or a file path
+    if hasattr(output, "write"):
+        output.writelines(chunks)
+        return
+
+    with open(output, "w", encoding = "utf-8") as f:
+        f.writelines(chunks)
+    return
+
+# =================== FUNCTION TO EXPORT DECISION TREE AS DOT FILE ===================
+def export_tree_dot(decision_tree, output, max_depth = None, min_leafs = None, node_samples = None, min_samples = None):
+    write_tree_export(generate_tree_dot(decision_tree, max_depth, min_leafs, node_samples, min_samples), output)
+    return
+
+# =================== FUNCTION TO EXPORT DECISION TREE AS SVG FILE ===================
+def export_tree_svg(decision_tree, output, max_depth = None, min_leafs = None, node_samples = None, min_samples = None):
+    write_tree_export(generate_tree_svg(decision_tree, max_depth, min_leafs, node_samples, min_samples), output)
+    return
+
+
+# ====================================================================================
+# ================================= MAIN RUN FUNCTION ================================
+# ====================================================================================
+
+
+def main():
+    # Track starting time of program
+    t0 = t()
+
+    # Exports the sample tree from tree_plotter.retrieve_tree(1) in both formats
+    dt = {"no surfacing": {0: "no", 1: {"flippers": {0: {"head": {0: "no", 1: "yes"}}, 1: "no"}}}}
+    export_tree_dot(dt, "decision_tree.dot")
+    export_tree_svg(dt, "decision_tree.svg", max_depth = 2)
+    for path in ("decision_tree.dot", "decision_tree.svg"):
+        print("{}: {} BYTES\n".format(path, os.path.getsize(path)))
+        os.remove(path)
+
+    # Track ending time of program and determine overall program runtime
+    t1 = t()
+    delta = (t1 - t0) * 1000
+
+    print("Real program runtime is {0:.4g} milliseconds.\n".format(delta))
+    return
+
+if __name__ == "__main__":
+    main()
@@ -16,7 +16,10 @@ CREDIT:             Machine Learning In Action (Peter Harrington)
 # ====================================================================================
 
 
+import numpy as np                          # Library for simple linear mathematical operations
 import matplotlib.pyplot as plt             # Module for MATLAB-like data visualization capability
+from matplotlib.collections import LineCollection   # Module for drawing many line segments as one artist
+from tree_exporter import format_branch_key # Helper for labelling nominal and threshold branches
 from time import time as t                  # Package for tracking modular and program runtime
 
 
@@ -27,7 +30,6 @@ from time import time as t                  # Package for tracking modular and p
 
 decision_node = dict(boxstyle = "sawtooth", fc = "0.8")     # Initialize decision nodes (branching nodes)
 leaf_node = dict(boxstyle = "round4", fc = "0.8")           # Initialize leaf nodes (ending nodes)
-arrow_args = dict(arrowstyle = "<-")                        # Initialize arrow arguments with text
 
 
 # ====================================================================================
@@ -35,79 +37,114 @@ arrow_args = dict(arrowstyle = "<-")                        # Initialize arrow a
 # ====================================================================================
 
 
-# =========================== FUNCTION TO PLOT SINGLE NODE ===========================
-def plot_node(node_text, center_point, parent_point, node_type):
-    # Draw annotated text information on single declarative node
-    create_plot.ax1.annotate(node_text, xy = parent_point, xycoords = "axes fraction", xytext = center_point, textcoords = "axes fraction", va = "center", ha = "center", bbox = node_type, arrowprops = arrow_args)
-
-# ============== FUNCTION TO PLOT TEXT BETWEEN PARENT AND CHILD ELEMENTS =============
-def plot_mid_text(center_point, parent_point, text_string):
-    x_mid = ((parent_point[0] - center_point[0]) / 2.0) + center_point[0]
-    y_mid = ((parent_point[1] - center_point[1]) / 2.0) + center_point[1]
-    create_plot.ax1.text(x_mid, y_mid, text_string)
-
-# ================= FUNCTION TO PLOT DECISION TREE BASED ON ALL NODES ================
-def plot_tree(decision_tree, parent_point, node_text):
-    # Get width and height of decision tree
-    number_of_leafs = get_number_of_leafs(decision_tree)
-    get_tree_depth(decision_tree)
+# ==================== FUNCTION TO COMPUTE TREE LAYOUT IN ONE PASS ===================
+def compute_tree_layout(decision_tree):
+    node_text = []
+    node_is_leaf = []
+    node_parent = []
+    node_level = []
+    node_x_units = []
+    node_leafs = []
+    edge_text = []
+    number_of_leafs = 0
 
-    # Initialize tree string list for nodal iteration
-    tree_string = list(decision_tree)[0]
-    center_point = (plot_tree.xOff + (1.0 + float(number_of_leafs)) / 2.0 / plot_tree.totalW, plot_tree.yOff)
-    
-    # Plot values of nodal children on tree
-    plot_mid_text(center_point, parent_point, node_text)
-    plot_node(tree_string, center_point, parent_point, decision_node)
-    tree_dictionary = decision_tree[tree_string]
-    
-    # Decrement y-axis offset on tree
-    plot_tree.yOff = plot_tree.yOff - (1.0 / plot_tree.totalD)
-
-    # Nodal iteration for generating branching visualization
-    for key in tree_dictionary.keys():
-        if type(tree_dictionary[key]).__name__ == "dict":
-            plot_tree(tree_dictionary[key], center_point, str(key))
-        else:
-            plot_tree.xOff = plot_tree.xOff + (1.0 / plot_tree.totalW)
-            plot_node(tree_dictionary[key], (plot_tree.xOff, plot_tree.yOff), center_point, leaf_node)
-            plot_mid_text((plot_tree.xOff, plot_tree.yOff), center_point, str(key))
-    
-    plot_tree.yOff = plot_tree.yOff + (1.0 / plot_tree.totalD)
+    # Explicit stack replaces recursion; "exit" entries centre decision nodes once their leaves are placed
+    stack = [("enter", decision_tree, -1, "", 0)]
+
+    while stack:
+        entry = stack.pop()
+
+        if entry[0] == "exit":
+            _, node_id, first_leaf = entry
+            node_leafs[node_id] = number_of_leafs - first_leaf
+            node_x_units[node_id] = first_leaf + node_leafs[node_id] / 2.0
+            continue
+
+        _, subtree, parent_id, branch_text, level = entry
+        node_id = len(node_text)
+        node_parent.append(parent_id)
+        node_level.append(level)
+        edge_text.append(branch_text)
+
+        # Leaf nodes are spaced one unit apart in the order they are reached
+        if type(subtree).__name__ != "dict":
+            node_text.append(str(subtree))
+            node_is_leaf.append(True)
+            node_x_units.append(number_of_leafs + 0.5)
+            node_leafs.append(1)
+            number_of_leafs += 1
+            continue
+
+        tree_string = list(subtree)[0]
+        tree_dictionary = subtree[tree_string]
+        node_text.append(str(tree_string))
+        node_is_leaf.append(False)
+        node_x_units.append(0.0)
+        node_leafs.append(0)
+
+        # Children are pushed in reverse so they are laid out left to right in key order
+        stack.append(("exit", node_id, number_of_leafs))
+        for key in reversed(list(tree_dictionary.keys())):
+            stack.append(("enter", tree_dictionary[key], node_id, format_branch_key(key), level + 1))
+
+    # Tree depth counts decision levels, matching the former recursive get_tree_depth()
+    tree_depth = max(level for level, is_leaf in zip(node_level, node_is_leaf) if is_leaf)
+    node_points = np.empty((len(node_text), 2))
+    node_points[:, 0] = np.array(node_x_units) / max(number_of_leafs, 1)
+    node_points[:, 1] = 1.0 - np.array(node_level, dtype = float) / max(tree_depth, 1)
+
+    layout = {"number_of_leafs": number_of_leafs,
+              "tree_depth": tree_depth,
+              "node_text": node_text,
+              "node_is_leaf": np.array(node_is_leaf),
+              "node_parent": np.array(node_parent),
+              "node_leafs": np.array(node_leafs),
+              "node_points": node_points,
+              "edge_text": edge_text}
+
+    # print("TREE LAYOUT HAS {} NODES, {} LEAFS, AND DEPTH {}\n".format(len(node_text), number_of_leafs, tree_depth))
+    return layout
+
+# =================== FUNCTION TO RENDER TREE LAYOUT AS COLLECTIONS ==================
+def render_tree_layout(ax, layout, label_limit = 500):
+    node_points = layout["node_points"]
+    node_parent = layout["node_parent"]
+    node_is_leaf = layout["node_is_leaf"]
+    child_ids = np.nonzero(node_parent >= 0)[0]
+    parent_points = node_points[node_parent[child_ids]]
+    child_points = node_points[child_ids]
+
+    # Draws every parent-child edge as a single line collection
+    edges = np.stack((parent_points, child_points), axis = 1)
+    ax.add_collection(LineCollection(edges, colors = "0.4", linewidths = 1.0, zorder = 1))
+
+    # Draws decision and leaf nodes as one marker collection each
+    ax.scatter(node_points[~node_is_leaf, 0], node_points[~node_is_leaf, 1], s = 120, marker = "s", c = decision_node["fc"], edgecolors = "black", zorder = 2)
+    ax.scatter(node_points[node_is_leaf, 0], node_points[node_is_leaf, 1], s = 120, marker = "o", c = leaf_node["fc"], edgecolors = "black", zorder = 2)
+
+    # Text is one artist per label, so labels are skipped for trees too large to read anyway
+    if len(layout["node_text"]) <= label_limit:
+        for node_id, text_string in enumerate(layout["node_text"]):
+            ax.text(node_points[node_id, 0], node_points[node_id, 1], text_string, va = "center", ha = "center", bbox = leaf_node if node_is_leaf[node_id] else decision_node, zorder = 3)
+
+        mid_points = (parent_points + child_points) / 2.0
+        for mid_point, child_id in zip(mid_points, child_ids):
+            ax.text(mid_point[0], mid_point[1], layout["edge_text"][child_id], zorder = 3)
+
+    ax.set_xlim(0.0, 1.0)
+    ax.set_ylim(-0.05, 1.05)
     return
 
 # ================ FUNCTION TO CALCULATE NUMBER OF LEAF NODES IN DATA ================
 def get_number_of_leafs(decision_tree):
-    number_of_leafs = 0
-    tree_string = list(decision_tree)[0]
-    tree_dictionary = decision_tree[tree_string]
-
-    # Iterate through all decision tree keys and find all leaf nodes (branching ends)
-    for key in tree_dictionary.keys():
-        if type(tree_dictionary[key]).__name__ == "dict":
-            number_of_leafs += get_number_of_leafs(tree_dictionary[key])
-        else:
-            number_of_leafs += 1
-    
+    number_of_leafs = compute_tree_layout(decision_tree)["number_of_leafs"]
+
     # print("NUMBER OF LEAFS IS: {}\n".format(number_of_leafs))
     return number_of_leafs
 
 # =============== FUNCTION TO CALCULATE DEPTH OF DECISION NODES IN DATA ==============
 def get_tree_depth(decision_tree):
-    max_depth = 0
-    tree_string = list(decision_tree)[0]
-    tree_dictionary = decision_tree[tree_string]
-
-    # Iterate through decision tree's keys for tracking decision nodes and depth count
-    for key in tree_dictionary.keys():
-        if type(tree_dictionary[key]).__name__ == "dict":
-            current_depth = get_tree_depth(tree_dictionary[key]) + 1
-        else:
-            current_depth = 1
-        
-        # If the current depth is greater than the max, set the max to the current depth
-        if current_depth > max_depth:
-            max_depth = current_depth
+    max_depth = compute_tree_layout(decision_tree)["tree_depth"]
 
     # print("MAXIMUM DECISION TREE DEPTH IS: {}\n".format(max_depth))
     return max_depth
@@ -127,16 +164,10 @@ def create_plot(t0, in_tree):
 
     # Draw subplot on plot
     axprops = dict(xticks = [], yticks = [])
-    create_plot.ax1 = plt.subplot(111, frameon = False, **axprops)
-    
-    # Generate width and depth of tree with helper functions
-    plot_tree.totalW = float(get_number_of_leafs(in_tree))
-    plot_tree.totalD = float(get_tree_depth(in_tree))
-    plot_tree.xOff = -0.5 / plot_tree.totalW
-    plot_tree.yOff = 1.0
+    ax = plt.subplot(111, frameon = False, **axprops)
     
-    # Style and plot tree nodes
-    plot_tree(in_tree, (0.5, 1.0), "")
+    # Lay out width, depth, and node coordinates in one pass, then style and plot tree nodes
+    render_tree_layout(ax, compute_tree_layout(in_tree))
 
     # Track ending time of program and determine overall program runtime
     t1 = t()
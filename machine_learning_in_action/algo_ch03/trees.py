@@ -33,12 +33,43 @@ CREDIT:             Machine Learning In Action (Peter Harrington)
 
 
 import tree_plotter as dt_plt               # Modular program for visualizing decision trees as plots
-import pickle as rick                       # Library for serializing Python objects (http://tiny.cc/picklerick)
+import numpy as np                          # Library for simple linear mathematical operations
+import sys                                  # Library for interpreter system flexibility
+import mmap                                 # Library for memory-mapping files into the address space
+import struct                               # Library for packing values into fixed binary layouts
 import operator as op                       # Library for intrinsic Pythonic mathematical operations
-from math import log                        # Package for performing logarithmic operations
+from array import array                     # Package for compact typed arrays of primitive values
+from collections import deque               # Package for double-ended queues used in tree traversals
 from time import time as t                  # Package for tracking modular and program runtime
 
 
+# ====================================================================================
+# ============================== INITIALIZING CONSTANTS ==============================
+# ====================================================================================
+
+
+TREE_FILE_MAGIC = b"DTRE"                   # Leading bytes identifying a compiled decision tree file
+TREE_FILE_VERSION = 3                       # Current version of the compiled decision tree layout (2 adds threshold branches, 3 adds booleans)
+TREE_FILE_HEADER = struct.Struct("<4sHHIII")    # Magic, version, reserved, node count, edge count, constant count
+CONSTANT_HEADER = struct.Struct("<cI")      # Type tag and payload length of a single constant table entry
+THRESHOLD_TAGS = {"<=": b"<", ">": b">"}    # Constant table tags for numeric threshold branch keys
+
+
+# ====================================================================================
+# ==================== HELPER FUNCTIONS FOR DECISION TREE BRANCHES ===================
+# ====================================================================================
+
+
+# ===================== FUNCTION TO TEST VALUE AGAINST BRANCH KEY ====================
+def branch_matches(key, value):
+    # Numeric splits store ("<=", threshold) and (">", threshold) keys; nominal splits store raw values
+    if type(key).__name__ == "tuple":
+        if key[0] == "<=":
+            return value <= key[1]
+        return value > key[1]
+    return value == key
+
+
 # ====================================================================================
 # ================================= CLASS DEFINITION =================================
 # ====================================================================================
@@ -57,7 +88,9 @@ class ID3_Decision_Tree_Algorithm(object):
                         [0, 1, "no"]]
         self.labels = ["no surfacing", "flippers"]
         """
-        pass
+        self.entropy_cache = dict()                 # Memoised subset entropies keyed by (node, feature, value)
+        self.entropy_cache_hits = 0                 # Number of entropy lookups answered from the cache
+        self.entropy_cache_misses = 0               # Number of entropy lookups that had to be calculated
 
     # ================== METHOD TO CREATE SMALL DATASET FOR TESTING ==================
     def create_dataset(self):
@@ -79,7 +112,7 @@ class ID3_Decision_Tree_Algorithm(object):
 
         # Recursively loop through tree keys to create class label at leaf node of best fit
         for key in tree_dictionary.keys():
-            if test_vector[feature_index] == key:
+            if branch_matches(key, test_vector[feature_index]):
                 if type(tree_dictionary[key]).__name__ == "dict":
                     class_label = self.classify(tree_dictionary[key], feature_labels, test_vector)
                 else:
@@ -102,17 +135,79 @@ class ID3_Decision_Tree_Algorithm(object):
                 label_counts[current_label] = 0
             label_counts[current_label] += 1
         
-        # Initialize Shannon entropy, the measure of information in a dataset
-        Shannon_entropy = 0.0
-
         # Calculates Shannon entropy based on product of information types and probabilities
-        for key in label_counts:
-            info_probability = float(label_counts[key] / num_of_entries)
-            Shannon_entropy -= info_probability * log(info_probability, 2)
+        Shannon_entropy = self.calculate_entropy_from_class_counts(list(label_counts.values()))
 
         # print("SHANNON ENTROPY OF SAMPLE DATASET IS: {}\n".format(Shannon_entropy))
         return Shannon_entropy
 
+    # ================= METHOD TO CALCULATE ENTROPY FROM CLASS COUNTS ================
+    def calculate_entropy_from_class_counts(self, class_counts):
+        class_counts = np.asarray(class_counts, dtype = float)
+        num_of_entries = class_counts.sum(axis = -1, keepdims = True)
+
+        # Vectorised -sum(p * log2(p)) along the class axis, treating empty classes (and subsets) as zero
+        with np.errstate(divide = "ignore", invalid = "ignore"):
+            info_probability = class_counts / num_of_entries
+            information = np.where(class_counts > 0, info_probability * np.log2(info_probability), 0.0)
+        Shannon_entropy = -information.sum(axis = -1)
+
+        # Returns a float for a single count vector and an array for a matrix of count vectors
+        if Shannon_entropy.ndim == 0:
+            return float(Shannon_entropy)
+        return Shannon_entropy
+
+    # ================== METHOD TO COUNT CLASSES OF DATASET SUBSETS ==================
+    def calculate_subset_class_counts(self, dataset, axis, class_index):
+        unique_values = []
+        value_index = dict()
+        value_ids = []
+        class_ids = []
+
+        # Single pass over the rows assigning every sample to its (feature value, class) cell
+        for feature_vector in dataset:
+            value = feature_vector[axis]
+            if value not in value_index:
+                value_index[value] = len(unique_values)
+                unique_values.append(value)
+            value_ids.append(value_index[value])
+            class_ids.append(class_index[feature_vector[-1]])
+
+        class_counts = np.zeros((len(unique_values), len(class_index)))
+        np.add.at(class_counts, (value_ids, class_ids), 1)
+        return unique_values, class_counts
+
+    # =================== METHOD TO LOOK UP MEMOISED SUBSET ENTROPY ==================
+    def calculate_cached_entropy(self, key, class_counts):
+        # Builds outside a tracked node (key of None) bypass the cache entirely
+        if key is None:
+            return self.calculate_entropy_from_class_counts(class_counts)
+
+        if key in self.entropy_cache:
+            self.entropy_cache_hits += 1
+        else:
+            self.entropy_cache_misses += 1
+            self.entropy_cache[key] = self.calculate_entropy_from_class_counts(class_counts)
+        return self.entropy_cache[key]
+
+    # =================== METHOD TO REPORT ENTROPY CACHE STATISTICS ==================
+    def get_entropy_cache_statistics(self):
+        lookups = self.entropy_cache_hits + self.entropy_cache_misses
+        statistics = {"hits": self.entropy_cache_hits,
+                      "misses": self.entropy_cache_misses,
+                      "hit_rate": self.entropy_cache_hits / float(lookups) if lookups else 0.0,
+                      "cached_entropies": len(self.entropy_cache)}
+
+        # print("ENTROPY CACHE STATISTICS ARE: {}\n".format(statistics))
+        return statistics
+
+    # ================== METHOD TO RESET ENTROPY CACHE AND COUNTERS ==================
+    def clear_entropy_cache(self):
+        self.entropy_cache = dict()
+        self.entropy_cache_hits = 0
+        self.entropy_cache_misses = 0
+        return
+
     # ================ METHOD TO SPLIT DATASET BASED ON UNIQUE FEATURE ===============
     def split_dataset(self, dataset, axis, value):
         split_data = []
@@ -127,24 +222,115 @@ class ID3_Decision_Tree_Algorithm(object):
         # print("SPLITTED DATA SUBSETS ARE: {}\n".format(split_data))
         return split_data
 
+    # ================= METHOD TO SPLIT DATASET ON NUMERIC THRESHOLD =================
+    def split_dataset_by_threshold(self, dataset, axis, threshold):
+        lower_split = []
+        upper_split = []
+
+        # Numeric columns are kept in both subsets so deeper nodes can split on them again
+        for feature_vector in dataset:
+            if feature_vector[axis] <= threshold:
+                lower_split.append(feature_vector)
+            else:
+                upper_split.append(feature_vector)
+
+        return lower_split, upper_split
+
+    # =============== METHOD TO FIND BEST THRESHOLD OF NUMERIC FEATURE ===============
+    def calculate_best_threshold(self, dataset, axis, class_index):
+        num_of_entries = len(dataset)
+        values = np.array([feature_vector[axis] for feature_vector in dataset], dtype = float)
+        class_ids = np.array([class_index[feature_vector[-1]] for feature_vector in dataset])
+
+        # Sorts the column once and accumulates class counts below every candidate boundary
+        order = np.argsort(values, kind = "mergesort")
+        sorted_values = values[order]
+        sorted_classes = np.zeros((num_of_entries, len(class_index)))
+        sorted_classes[np.arange(num_of_entries), class_ids[order]] = 1.0
+        lower_counts = np.cumsum(sorted_classes, axis = 0)[:-1]
+        upper_counts = sorted_classes.sum(axis = 0) - lower_counts
+
+        # Only boundaries between distinct values are valid thresholds
+        valid_boundaries = sorted_values[:-1] != sorted_values[1:]
+        if not valid_boundaries.any():
+            return None, float("inf"), (None, None)
+
+        # Weighs entropies of both sides of every boundary at once and keeps the smallest
+        num_lower = np.arange(1, num_of_entries)
+        lower_entropy = self.calculate_entropy_from_class_counts(lower_counts)
+        upper_entropy = self.calculate_entropy_from_class_counts(upper_counts)
+        new_entropy = (num_lower * lower_entropy + (num_of_entries - num_lower) * upper_entropy) / num_of_entries
+        new_entropy[~valid_boundaries] = np.inf
+
+        best_position = int(np.argmin(new_entropy))
+        best_threshold = float(sorted_values[best_position] + sorted_values[best_position + 1]) / 2.0
+        best_entropy = float(new_entropy[best_position])
+
+        # print("BEST THRESHOLD FOR FEATURE {}: {}\nRESPECTIVE WEIGHTED ENTROPY: {}\n".format(axis, best_threshold, best_entropy))
+        return best_threshold, best_entropy, (float(lower_entropy[best_position]), float(upper_entropy[best_position]))
+
+    # ================ METHOD TO CHOOSE BEST NOMINAL OR NUMERIC SPLIT ================
+    def choose_best_split(self, dataset, numeric_axes, labels = None, node_key = None):
+        class_index = dict((label, index) for index, label in enumerate(set([sample[-1] for sample in dataset])))
+        base_counts = np.bincount([class_index[sample[-1]] for sample in dataset], minlength = len(class_index))
+        base_entropy = self.calculate_cached_entropy(node_key, base_counts)
+        best_information_gain = 0.0
+        best_feature = None
+        best_threshold = None
+
+        for feature in range(len(dataset[0]) - 1):
+            # Numeric features are scored by their best binary threshold from a single sorted sweep
+            if feature in numeric_axes:
+                threshold, new_entropy, side_entropies = self.calculate_best_threshold(dataset, feature, class_index)
+                if threshold is None:
+                    continue
+
+                # Seeds the cache so both children find their base entropy already computed (counted as misses)
+                if node_key is not None:
+                    for side, side_entropy in zip(("<=", ">"), side_entropies):
+                        if (node_key, labels[feature], (side, threshold)) not in self.entropy_cache:
+                            self.entropy_cache_misses += 1
+                            self.entropy_cache[(node_key, labels[feature], (side, threshold))] = side_entropy
+            else:
+                threshold = None
+                unique_values, class_counts = self.calculate_subset_class_counts(dataset, feature, class_index)
+                subset_entropies = [self.calculate_cached_entropy(None if node_key is None else (node_key, labels[feature], value), class_counts[row]) for row, value in enumerate(unique_values)]
+
+                # Nominal features are scored with one branch per unique value, as in choose_best_feature_to_split_on()
+                info_probability = class_counts.sum(axis = 1) / float(len(dataset))
+                new_entropy = float(np.dot(info_probability, subset_entropies))
+
+            # Only splits that gain information are kept, which guarantees numeric recursion terminates
+            information_gain = base_entropy - new_entropy
+            if information_gain > best_information_gain:
+                best_information_gain = information_gain
+                best_feature = feature
+                best_threshold = threshold
+
+        # print("BEST SPLIT IS FEATURE {} AT THRESHOLD {}\nRESPECTIVE BEST INFORMATION GAIN: {}\n".format(best_feature, best_threshold, best_information_gain))
+        return best_feature, best_threshold
+
     # ============ METHOD TO CHOOSE BEST FEATURE ON WHICH TO SPLIT DATASET ===========
-    def choose_best_feature_to_split_on(self, dataset):
+    def choose_best_feature_to_split_on(self, dataset, labels = None, node_key = None):
         num_of_features = len(dataset[0]) - 1
-        base_entropy = self.calculate_Shannon_entropy(dataset)
+        class_index = dict((label, index) for index, label in enumerate(set([sample[-1] for sample in dataset])))
+        base_counts = np.bincount([class_index[sample[-1]] for sample in dataset], minlength = len(class_index))
+        base_entropy = self.calculate_cached_entropy(node_key, base_counts)
         best_information_gain = 0.0
         best_feature = 1
 
         # Create unique set of data labels to identify best feature to split on
         for feature in range(num_of_features):
-            feature_list = [sample[feature] for sample in dataset]
-            unique_values = set(feature_list)
-            new_entropy = 0.0
-
-            # Calculate entropy for each feature in dataset
-            for value in unique_values:
-                subset = self.split_dataset(dataset, feature, value)
-                info_probability = len(subset) / float(len(dataset))
-                new_entropy += info_probability * self.calculate_Shannon_entropy(subset)
+            unique_values, class_counts = self.calculate_subset_class_counts(dataset, feature, class_index)
+
+            # Calculate entropy for each feature value from its class-count vector (memoised per node when tracked)
+            if node_key is None:
+                subset_entropies = self.calculate_entropy_from_class_counts(class_counts)
+            else:
+                subset_entropies = [self.calculate_cached_entropy((node_key, labels[feature], value), class_counts[row]) for row, value in enumerate(unique_values)]
+
+            info_probability = class_counts.sum(axis = 1) / float(len(dataset))
+            new_entropy = float(np.dot(info_probability, subset_entropies))
             
             # Calculate relative information gain for particular feature
             information_gain = base_entropy - new_entropy
@@ -174,9 +360,13 @@ class ID3_Decision_Tree_Algorithm(object):
         return sorted_histogram[0][0]
 
     # ================== METHOD TO CREATE DECISION TREE FROM DATASET =================
-    def create_tree(self, dataset, labels):
+    def create_tree(self, dataset, labels, numeric_labels = (), node_key = ()):
         class_list = [sample[-1] for sample in dataset]
 
+        # Subset entropies are memoised per build; the root node starts from an empty cache and fresh counters
+        if node_key == ():
+            self.clear_entropy_cache()
+
         # Stops iteration through decision tree when all classes are equal
         if class_list.count(class_list[0]) == len(class_list):
             return class_list[0]
@@ -185,8 +375,12 @@ class ID3_Decision_Tree_Algorithm(object):
         if len(dataset[0]) == 1:
             return self.majority_histogram(class_list)
 
+        # Grows binary threshold splits when any labels are declared numeric (continuous)
+        if numeric_labels:
+            return self.create_tree_with_thresholds(dataset, labels, numeric_labels, node_key)
+
         # Define best feature, best feature, and create decision tree object
-        best_feature = self.choose_best_feature_to_split_on(dataset)
+        best_feature = self.choose_best_feature_to_split_on(dataset, labels, node_key)
         best_feature_label = labels[best_feature]
         decision_tree = {best_feature_label: {}}
 
@@ -198,22 +392,282 @@ class ID3_Decision_Tree_Algorithm(object):
         # Recursively iterate through decision trees to sort data by sublabels of dataset
         for value in unique_values:
             sublabels = labels[:]
-            decision_tree[best_feature_label][value] = self.create_tree(self.split_dataset(dataset, best_feature, value), sublabels)
+            decision_tree[best_feature_label][value] = self.create_tree(self.split_dataset(dataset, best_feature, value), sublabels, numeric_labels, (node_key, best_feature_label, value))
 
         # print("DECISION TREE: {}\n".format(decision_tree))
         return decision_tree
 
+    # ========= METHOD TO CREATE DECISION TREE WITH NUMERIC THRESHOLD SPLITS =========
+    def create_tree_with_thresholds(self, dataset, labels, numeric_labels, node_key = None):
+        class_list = [sample[-1] for sample in dataset]
+        numeric_axes = set([axis for axis, label in enumerate(labels) if label in numeric_labels])
+        best_feature, best_threshold = self.choose_best_split(dataset, numeric_axes, labels, node_key)
+
+        # Returns majority histogram when no remaining feature gains any information
+        if best_feature is None:
+            return self.majority_histogram(class_list)
+
+        best_feature_label = labels[best_feature]
+        decision_tree = {best_feature_label: {}}
+
+        # Numeric features branch into two subsets around the threshold and stay available below
+        if best_threshold is not None:
+            lower_split, upper_split = self.split_dataset_by_threshold(dataset, best_feature, best_threshold)
+            decision_tree[best_feature_label][("<=", best_threshold)] = self.create_tree(lower_split, labels[:], numeric_labels, (node_key, best_feature_label, ("<=", best_threshold)))
+            decision_tree[best_feature_label][(">", best_threshold)] = self.create_tree(upper_split, labels[:], numeric_labels, (node_key, best_feature_label, (">", best_threshold)))
+            return decision_tree
+
+        # Nominal features branch on every unique value and are consumed, as in create_tree()
+        del(labels[best_feature])
+        unique_values = set([sample[best_feature] for sample in dataset])
+
+        for value in unique_values:
+            sublabels = labels[:]
+            decision_tree[best_feature_label][value] = self.create_tree(self.split_dataset(dataset, best_feature, value), sublabels, numeric_labels, (node_key, best_feature_label, value))
+
+        # print("DECISION TREE: {}\n".format(decision_tree))
+        return decision_tree
+
+    # ================ METHOD TO COUNT SAMPLES REACHING EACH TREE NODE ===============
+    def count_node_samples(self, decision_tree, feature_labels, dataset):
+        node_samples = dict()
+
+        # Routes every sample from the root, counting it at each decision node it passes through
+        for test_vector in dataset:
+            subtree = decision_tree
+
+            while type(subtree).__name__ == "dict":
+                node_samples[id(subtree)] = node_samples.get(id(subtree), 0) + 1
+                tree_string = list(subtree)[0]
+                tree_dictionary = subtree[tree_string]
+                feature_index = feature_labels.index(tree_string)
+
+                for key in tree_dictionary.keys():
+                    if branch_matches(key, test_vector[feature_index]):
+                        subtree = tree_dictionary[key]
+                        break
+                else:
+                    break
+
+        # print("SAMPLE COUNTS PER DECISION NODE ARE: {}\n".format(node_samples))
+        return node_samples
+
+    # =============== METHOD TO COMPILE DECISION TREE INTO FLAT ARRAYS ===============
+    def compile_tree(self, decision_tree):
+        constants = []
+        constant_index = dict()
+        node_symbol = array("i")
+        node_first_edge = array("i")
+        node_num_edges = array("i")
+        edge_value = array("i")
+        edge_child = array("i")
+
+        # Interns feature names, branch values, and class labels into a shared constant table
+        def intern_constant(value):
+            key = (type(value), value)
+            if key not in constant_index:
+                constant_index[key] = len(constants)
+                constants.append(value)
+            return constant_index[key]
+
+        # Lays out nodes breadth-first so that the children of every node occupy a contiguous edge range
+        node_symbol.append(0)
+        node_first_edge.append(-1)
+        node_num_edges.append(0)
+        queue = deque([(decision_tree, 0)])
+
+        while queue:
+            subtree, node_id = queue.popleft()
+
+            # Leaf nodes store their class label and no outgoing edges
+            if type(subtree).__name__ != "dict":
+                node_symbol[node_id] = intern_constant(subtree)
+                continue
+
+            tree_string = list(subtree)[0]
+            tree_dictionary = subtree[tree_string]
+            node_symbol[node_id] = intern_constant(tree_string)
+            node_first_edge[node_id] = len(edge_value)
+            node_num_edges[node_id] = len(tree_dictionary)
+
+            # Allocates a child node for every branch value and queues it for layout
+            for key in tree_dictionary.keys():
+                child_id = len(node_symbol)
+                node_symbol.append(0)
+                node_first_edge.append(-1)
+                node_num_edges.append(0)
+                edge_value.append(intern_constant(key))
+                edge_child.append(child_id)
+                queue.append((tree_dictionary[key], child_id))
+
+        return Compiled_Decision_Tree(node_symbol, node_first_edge, node_num_edges, edge_value, edge_child, constants)
+
     # ===================== METHOD TO STORE DECISION TREE IN FILE ====================
     def store_tree(self, decision_tree, file):
-        f = open(file, "wb")
-        rick.dump(decision_tree, f)
-        f.close()
+        compiled_tree = self.compile_tree(decision_tree)
+        arrays = [array("i", values) for values in compiled_tree.arrays()]
+
+        # Binary layout is little-endian regardless of the host that wrote the file
+        if sys.byteorder != "little":
+            for values in arrays:
+                values.byteswap()
+
+        with open(file, "wb") as f:
+            f.write(TREE_FILE_HEADER.pack(TREE_FILE_MAGIC, TREE_FILE_VERSION, 0, len(compiled_tree.node_symbol), len(compiled_tree.edge_value), len(compiled_tree.constants)))
+            for values in arrays:
+                values.tofile(f)
+
+            # Appends typed constant table after the fixed-width node and edge arrays
+            for value in compiled_tree.constants:
+                # NumPy scalars (as in trees built from NumPy data) are stored as the matching Python values
+                if isinstance(value, np.generic):
+                    value = value.item()
+
+                if isinstance(value, bool):
+                    tag, payload = b"b", struct.pack("<?", value)
+                elif isinstance(value, str):
+                    tag, payload = b"s", value.encode("utf-8")
+                elif isinstance(value, tuple) and value[0] in THRESHOLD_TAGS:
+                    tag, payload = THRESHOLD_TAGS[value[0]], struct.pack("<d", value[1])
+                elif isinstance(value, int):
+                    tag, payload = b"i", struct.pack("<q", value)
+                elif isinstance(value, float):
+                    tag, payload = b"f", struct.pack("<d", value)
+                else:
+                    raise TypeError("Cannot store decision tree value {!r} of type {}".format(value, type(value).__name__))
+                f.write(CONSTANT_HEADER.pack(tag, len(payload)))
+                f.write(payload)
         return
 
     # ===================== METHOD TO GRAB DECISION TREE IN FILE =====================
     def grab_tree(self, file):
-        f = open(file, "rb")
-        return rick.load(f)
+        with open(file, "rb") as f:
+            buffer = f.read()
+        return self.read_tree_buffer(buffer).to_dict()
+
+    # ================ METHOD TO GRAB COMPILED DECISION TREE VIA MMAP ================
+    def grab_compiled_tree(self, file):
+        # Maps file read-only so node and edge arrays are viewed in place rather than copied
+        with open(file, "rb") as f:
+            buffer = mmap.mmap(f.fileno(), 0, access = mmap.ACCESS_READ)
+        return self.read_tree_buffer(buffer)
+
+    # ================= METHOD TO READ AND VALIDATE TREE FILE HEADER =================
+    def read_tree_buffer(self, buffer):
+        if len(buffer) < TREE_FILE_HEADER.size:
+            raise ValueError("Decision tree file is truncated")
+
+        magic, version, _, num_nodes, num_edges, num_constants = TREE_FILE_HEADER.unpack_from(buffer, 0)
+        if magic != TREE_FILE_MAGIC:
+            raise ValueError("Not a compiled decision tree file")
+        if version > TREE_FILE_VERSION:
+            raise ValueError("Unsupported decision tree file version {}".format(version))
+
+        offset = TREE_FILE_HEADER.size
+        if len(buffer) < offset + 4 * (3 * num_nodes + 2 * num_edges):
+            raise ValueError("Decision tree file is truncated")
+
+        # Views each int32 array directly in the buffer (copied only when host byte order differs)
+        view = memoryview(buffer)
+        arrays = []
+        for length in (num_nodes, num_nodes, num_nodes, num_edges, num_edges):
+            if sys.byteorder == "little":
+                values = view[offset:offset + 4 * length].cast("i")
+            else:
+                values = array("i", bytes(view[offset:offset + 4 * length]))
+                values.byteswap()
+            arrays.append(values)
+            offset += 4 * length
+
+        # Decodes the constant table holding feature names, branch values, and class labels
+        constants = []
+        for _ in range(num_constants):
+            if len(buffer) < offset + CONSTANT_HEADER.size:
+                raise ValueError("Decision tree file is truncated")
+            tag, length = CONSTANT_HEADER.unpack_from(buffer, offset)
+            offset += CONSTANT_HEADER.size
+            if len(buffer) < offset + length:
+                raise ValueError("Decision tree file is truncated")
+            payload = bytes(view[offset:offset + length])
+            offset += length
+
+            if tag == b"s":
+                constants.append(payload.decode("utf-8"))
+            elif tag == b"b":
+                constants.append(struct.unpack("<?", payload)[0])
+            elif tag == b"i":
+                constants.append(struct.unpack("<q", payload)[0])
+            elif tag == b"f":
+                constants.append(struct.unpack("<d", payload)[0])
+            elif tag == THRESHOLD_TAGS["<="]:
+                constants.append(("<=", struct.unpack("<d", payload)[0]))
+            elif tag == THRESHOLD_TAGS[">"]:
+                constants.append((">", struct.unpack("<d", payload)[0]))
+            else:
+                raise ValueError("Unknown constant type {!r} in decision tree file".format(tag))
+
+        return Compiled_Decision_Tree(*arrays, constants, buffer = buffer)
+
+
+class Compiled_Decision_Tree(object):
+
+    # ======================== CLASS INITIALIZERS/DECLARATIONS =======================
+    def __init__(self, node_symbol, node_first_edge, node_num_edges, edge_value, edge_child, constants, buffer = None):
+        self.node_symbol = node_symbol              # Constant index of feature name (decision node) or class label (leaf)
+        self.node_first_edge = node_first_edge      # Index of first outgoing edge, or -1 for leaf nodes
+        self.node_num_edges = node_num_edges        # Number of contiguous outgoing edges per node
+        self.edge_value = edge_value                # Constant index of branch value tested by each edge
+        self.edge_child = edge_child                # Node index reached by following each edge
+        self.constants = constants                  # Shared table of feature names, branch values, and labels
+        self.buffer = buffer                        # Backing file buffer (kept alive while arrays view it)
+
+    # =================== METHOD TO RETURN FLAT ARRAYS OF THE TREE ===================
+    def arrays(self):
+        return self.node_symbol, self.node_first_edge, self.node_num_edges, self.edge_value, self.edge_child
+
+    # ================= METHOD TO CLASSIFY DATA AGAINST COMPILED TREE ================
+    def classify(self, feature_labels, test_vector):
+        node_id = 0
+
+        # Walks from the root following the edge whose branch value matches the test vector
+        while self.node_first_edge[node_id] != -1:
+            feature_index = feature_labels.index(self.constants[self.node_symbol[node_id]])
+            first_edge = self.node_first_edge[node_id]
+
+            for edge in range(first_edge, first_edge + self.node_num_edges[node_id]):
+                if branch_matches(self.constants[self.edge_value[edge]], test_vector[feature_index]):
+                    node_id = self.edge_child[edge]
+                    break
+            else:
+                raise KeyError("No branch for value {!r} of feature '{}'".format(test_vector[feature_index], feature_labels[feature_index]))
+
+        return self.constants[self.node_symbol[node_id]]
+
+    # ==================== METHOD TO REBUILD NESTED DECISION TREE ====================
+    def to_dict(self):
+        if self.node_first_edge[0] == -1:
+            return self.constants[self.node_symbol[0]]
+
+        # Rebuilds nested dictionaries iteratively, attaching each child to its parent branch
+        decision_tree = {self.constants[self.node_symbol[0]]: {}}
+        stack = [(0, decision_tree)]
+
+        while stack:
+            node_id, subtree = stack.pop()
+            tree_dictionary = subtree[self.constants[self.node_symbol[node_id]]]
+            first_edge = self.node_first_edge[node_id]
+
+            for edge in range(first_edge, first_edge + self.node_num_edges[node_id]):
+                child_id = self.edge_child[edge]
+                key = self.constants[self.edge_value[edge]]
+
+                if self.node_first_edge[child_id] == -1:
+                    tree_dictionary[key] = self.constants[self.node_symbol[child_id]]
+                else:
+                    tree_dictionary[key] = {self.constants[self.node_symbol[child_id]]: {}}
+                    stack.append((child_id, tree_dictionary[key]))
+
+        return decision_tree
 
  
 # ====================================================================================
@@ -234,8 +688,18 @@ def main():
     lenses_labels = ["age", "prescript", "astigmatic", "tear_rate"]
     lenses_tree = dt.create_tree(lenses, lenses_labels)
     print("\nDECISION TREE FOR THE LENSES DATASET IS: {}\n".format(lenses_tree))
+    print("ENTROPY CACHE STATISTICS FOR THE LENSES TREE ARE: {}\n".format(dt.get_entropy_cache_statistics()))
     dt_plt.create_plot(t0, lenses_tree)
 
+    # Export the lenses tree as text, collapsing subtrees reached by fewer than four samples
+    """
+    import tree_exporter as dt_exp
+    lenses_labels = ["age", "prescript", "astigmatic", "tear_rate"]
+    node_samples = dt.count_node_samples(lenses_tree, lenses_labels, lenses)
+    dt_exp.export_tree_svg(lenses_tree, "lenses_tree.svg", node_samples = node_samples, min_samples = 4)
+    dt_exp.export_tree_dot(lenses_tree, "lenses_tree.dot", max_depth = 2)
+    """
+
     # Run testing methods on decision tree algorithm
     """
     dataset, labels = dt.create_dataset()
@@ -243,6 +707,8 @@ def main():
     dt.store_tree(tree, "classifier_storage.txt")
     grabbed_tree = dt.grab_tree("classifier_storage.txt")
     print("GRABBED DECISION TREE IS: {}\n".format(grabbed_tree))
+    compiled_tree = dt.grab_compiled_tree("classifier_storage.txt")
+    print("COMPILED TREE CLASSIFIES [1, 1] AS: {}\n".format(compiled_tree.classify(labels, [1, 1])))
     """
 
     # Classify new test vector against decision tree
@@ -261,6 +727,13 @@ def main():
     print("COMPLETE DECISION TREE: {}\n".format(decision_tree))
     """
 
+    # Create decision tree with binary threshold splits on numeric (continuous) features
+    """
+    dataset, labels = dt.create_dataset()
+    decision_tree = dt.create_tree(dataset, labels, numeric_labels = {"no surfacing", "flippers"})
+    print("COMPLETE THRESHOLD DECISION TREE: {}\n".format(decision_tree))
+    """
+
     # Track ending time of program and determine overall program runtime
     t1 = t()
     delta = (t1 - t0) * 1000
@@ -39,13 +39,47 @@ CREDIT:             Machine Learning In Action (Peter Harrington)
 # ====================================================================================
 
 
-import re                                   # Library for regular expression support
+import mmap                                 # Library for memory-mapping files into the address space
+import struct                               # Library for packing values into fixed binary layouts
+import zlib                                 # Library for fast deterministic (unsalted) string checksums
 import numpy as np                          # Library for simple linear mathematical operations
-import operator as op                       # Library for intrinsic Pythonic mathematical operations
-import feedparser as fp                     # Library for universal parsing of web information feeds
+import scipy.sparse as sp                   # Module for compressed sparse row (CSR) matrices
+import corpus_reader as corpus              # Modular program for streaming and tokenizing mail corpora
+import feed_reader as feeds                 # Modular program for cached, concurrent RSS/Atom feed ingestion
+from multiprocessing import Pool            # Package for spreading work across worker processes
 from time import time as t                  # Package for tracking modular and program runtime
 
 
+# ====================================================================================
+# ============================== INITIALIZING CONSTANTS ==============================
+# ====================================================================================
+
+
+NAÏVE_BAYES_VARIANTS = ("multinomial", "bernoulli", "complement")  # Event models sharing the sparse count backend
+MODEL_FILE_MAGIC = b"NBAY"                  # Leading bytes identifying a compact Bayes model file
+MODEL_FILE_VERSION = 2                      # Current version of the compact Bayes model layout (2 stores the class label dtype)
+MODEL_FILE_HEADER = struct.Struct("<4sHHIII16s")   # Magic, version, reserved, class count, term count, term text length, class label dtype
+SPAM_CLASS_LABELS = {"spam": 1, "ham": 0}   # Class labels of the spam corpus folders (other folders are skipped)
+SHARED_FOLD_DATA = dict()                   # Read-only document-term matrix and class labels held by each worker process
+
+
+# ====================================================================================
+# ================== HELPER FUNCTIONS FOR PARALLEL CROSS-VALIDATION ==================
+# ====================================================================================
+
+
+# ================== FUNCTION TO SHARE FOLD DATA WITH WORKER PROCESS =================
+def share_fold_data(document_term_matrix, class_labels):
+    # Runs once per worker, so the CSR matrix is sent to each worker once rather than once per fold
+    SHARED_FOLD_DATA.update(document_term_matrix = document_term_matrix, class_labels = class_labels)
+    return
+
+# ================== FUNCTION TO SCORE SHARED FOLD IN WORKER PROCESS =================
+def evaluate_shared_fold(training_indices, test_indices, variant = None, alpha = 1.0):
+    nb = Naïve_Bayes_Classifier_Algorithm()
+    return nb.evaluate_fold(SHARED_FOLD_DATA["document_term_matrix"], SHARED_FOLD_DATA["class_labels"], training_indices, test_indices, variant, alpha)
+
+
 # ====================================================================================
 # ================================= CLASS DEFINITION =================================
 # ====================================================================================
@@ -110,6 +144,80 @@ class Naïve_Bayes_Classifier_Algorithm(object):
         else:
             return 0
 
+    # ============== METHOD TO COUNT WORDS PER CLASS FROM SPARSE MATRIX ==============
+    def count_class_terms(self, document_term_matrix, class_labels):
+        classes, class_ids = np.unique(np.asarray(class_labels), return_inverse = True)
+        number_of_documents = len(class_ids)
+
+        # Sparse class-indicator matrix (classes x documents) sums every class's rows in one product
+        class_indicator = sp.csr_matrix((np.ones(number_of_documents), (class_ids, np.arange(number_of_documents))), shape = (len(classes), number_of_documents))
+        class_term_counts = np.asarray((class_indicator @ document_term_matrix).todense())
+        class_document_counts = np.bincount(class_ids, minlength = len(classes))
+
+        return classes, class_document_counts, class_term_counts
+
+    # ================ METHOD TO TRAIN BAYES MODEL FROM SPARSE MATRIX ================
+    def sparse_naïve_bayes_trainer(self, document_term_matrix, class_labels):
+        classes, class_document_counts, class_term_counts = self.count_class_terms(document_term_matrix, class_labels)
+
+        # Same smoothing as naïve_bayes_trainer(): word counts start at one and class denominators at two
+        class_log_probabilities = np.log((class_term_counts + 1.0) / (class_term_counts.sum(axis = 1, keepdims = True) + 2.0))
+        class_log_priors = np.log(class_document_counts / float(len(class_labels)))
+
+        # print("CLASSES ARE: {}\nCLASS LOG PRIORS ARE: {}\n".format(classes, class_log_priors))
+        return classes, class_log_probabilities, class_log_priors
+
+    # ================= METHOD TO CLASSIFY SPARSE DOCUMENTS IN BATCH =================
+    def classify_naïve_bayes_batch(self, document_term_matrix, classes, class_log_probabilities, class_log_priors):
+        # Scores every document against every class with one sparse-dense product plus log priors
+        class_scores = document_term_matrix @ class_log_probabilities.T + class_log_priors
+
+        # Ties resolve to the first (smallest) class label, matching classify_naïve_bayes()
+        return classes[np.argmax(np.asarray(class_scores), axis = 1)]
+
+    # =================== METHOD TO BINARIZE SPARSE DOCUMENT COUNTS ==================
+    def binarize_documents(self, document_term_matrix):
+        # Keeps the sparsity pattern and replaces every stored count with one (word present)
+        binary_matrix = document_term_matrix.copy()
+        binary_matrix.data = np.ones_like(binary_matrix.data)
+        return binary_matrix
+
+    # =========== METHOD TO TRAIN SELECTED BAYES VARIANT FROM SPARSE MATRIX ==========
+    def train_naïve_bayes_variant(self, document_term_matrix, class_labels, variant = "multinomial", alpha = 1.0):
+        number_of_words = document_term_matrix.shape[1]
+
+        # Every variant is reduced to linear class weights and biases, so classify_naïve_bayes_batch() scores them all
+        if variant == "multinomial":
+            # Word counts per class with additive (Lidstone) smoothing
+            classes, class_document_counts, class_term_counts = self.count_class_terms(document_term_matrix, class_labels)
+            class_weights = np.log((class_term_counts + alpha) / (class_term_counts.sum(axis = 1, keepdims = True) + alpha * number_of_words))
+            class_biases = np.log(class_document_counts / float(len(class_labels)))
+        elif variant == "bernoulli":
+            # Document frequencies per class; absent words contribute log(1 - p) through the bias
+            classes, class_document_counts, class_term_counts = self.count_class_terms(self.binarize_documents(document_term_matrix), class_labels)
+            p_present = (class_term_counts + alpha) / (class_document_counts[:, None] + 2.0 * alpha)
+            class_weights = np.log(p_present) - np.log1p(-p_present)
+            class_biases = np.log(class_document_counts / float(len(class_labels))) + np.log1p(-p_present).sum(axis = 1)
+        elif variant == "complement":
+            # Word counts of every other class; a class scores well where its complement is unlikely
+            classes, class_document_counts, class_term_counts = self.count_class_terms(document_term_matrix, class_labels)
+            complement_term_counts = class_term_counts.sum(axis = 0) - class_term_counts
+            class_weights = -np.log((complement_term_counts + alpha) / (complement_term_counts.sum(axis = 1, keepdims = True) + alpha * number_of_words))
+            class_biases = np.zeros(len(classes))
+        else:
+            # Raises error if variant is not one of NAÏVE_BAYES_VARIANTS
+            raise NameError("\nNAÏVE BAYES VARIANT NOT RECOGNIZED: {}\n".format(variant))
+
+        # print("CLASSES ARE: {}\nCLASS WEIGHTS ARE: \n{}\nCLASS BIASES ARE: {}\n".format(classes, class_weights, class_biases))
+        return classes, class_weights, class_biases
+
+    # =========== METHOD TO CLASSIFY DOCUMENTS WITH SELECTED BAYES VARIANT ===========
+    def classify_naïve_bayes_variant(self, document_term_matrix, classes, class_weights, class_biases, variant = "multinomial"):
+        # Bernoulli weights apply to word presence rather than word counts
+        if variant == "bernoulli":
+            document_term_matrix = self.binarize_documents(document_term_matrix)
+        return self.classify_naïve_bayes_batch(document_term_matrix, classes, class_weights, class_biases)
+
     # ================== METHOD TO TEST BAYES MODEL AGAINST NEW DATA =================
     def test_naïve_bayes(self):
         list_of_posts, list_of_classes = self.load_data_set()
@@ -159,92 +267,286 @@ class Naïve_Bayes_Classifier_Algorithm(object):
         # print("RETURN VECTOR IS: {}\n".format(return_vector))
         return return_vector
 
+    # =================== METHOD TO CREATE WORD INDEX FROM DATASET ===================
+    def create_vocab_index(self, dataset):
+        vocab_index = dict()
+
+        # Assigns column numbers in first-seen order, so list(vocab_index) recovers the word of each column
+        for document in dataset:
+            for word in document:
+                if word not in vocab_index:
+                    vocab_index[word] = len(vocab_index)
+
+        # print("VOCABULARY INDEX IS: {}\n".format(vocab_index))
+        return vocab_index
+
+    # ==================== METHOD TO HASH WORD INTO FEATURE COLUMN ===================
+    def hash_word_to_column(self, word, num_hash_features):
+        # CRC32 is stable across runs, unlike Python's salted hash() for strings
+        return zlib.crc32(word.encode("utf-8")) % num_hash_features
+
+    # ================== METHOD TO VECTORIZE CORPUS INTO SPARSE ROWS =================
+    def vectorize_documents(self, vocab_index, documents, num_hash_features = None):
+        column_indices = []
+        row_pointers = [0]
+
+        # Single pass over all tokens: dictionary (or hash) lookups replace list membership tests
+        for document in documents:
+            if num_hash_features is None:
+                column_indices.extend([vocab_index[word] for word in document if word in vocab_index])
+            else:
+                column_indices.extend([self.hash_word_to_column(word, num_hash_features) for word in document])
+            row_pointers.append(len(column_indices))
+
+        # Builds CSR rows directly; repeated words within a document are summed into counts
+        num_columns = len(vocab_index) if num_hash_features is None else num_hash_features
+        document_term_matrix = sp.csr_matrix((np.ones(len(column_indices)), np.array(column_indices, dtype = np.int64), np.array(row_pointers, dtype = np.int64)), shape = (len(row_pointers) - 1, num_columns))
+        document_term_matrix.sum_duplicates()
+
+        # print("DOCUMENT-TERM MATRIX IS: \n{}\n".format(document_term_matrix.toarray()))
+        return document_term_matrix
+
+    # ============== METHOD TO PRUNE VOCABULARY OF DOCUMENT-TERM MATRIX ==============
+    def prune_vocabulary(self, document_term_matrix, vocab_index, min_frequency = 1, max_document_frequency = 1.0, stop_words = None):
+        # Corpus frequency and document frequency of every column, computed without touching the documents again
+        term_frequencies = np.asarray(document_term_matrix.sum(axis = 0)).ravel()
+        document_frequencies = np.bincount(document_term_matrix.indices, minlength = document_term_matrix.shape[1])
+
+        # Drops rare words, words present in too large a share of documents, and stop words
+        is_kept = (term_frequencies >= min_frequency) & (document_frequencies <= max_document_frequency * document_term_matrix.shape[0])
+        if stop_words:
+            for word in stop_words:
+                if word in vocab_index:
+                    is_kept[vocab_index[word]] = False
+
+        # Surviving columns keep their relative order and are renumbered from zero
+        kept_columns = np.flatnonzero(is_kept)
+        words = list(vocab_index)
+        pruned_vocab_index = dict((words[column], new_column) for new_column, column in enumerate(kept_columns))
+
+        print("PRUNED VOCABULARY FROM {} TO {} WORDS\n".format(len(vocab_index), len(pruned_vocab_index)))
+        return document_term_matrix[:, kept_columns], pruned_vocab_index
+
+    # ================== METHOD TO STORE COMPACT BAYES MODEL IN FILE =================
+    def store_compact_model(self, file, vocab_index, classes, class_log_probabilities, class_log_priors):
+        # Terms are sorted by their UTF-8 bytes so that lookups can binary-search the stored text
+        encoded_terms = sorted((word.encode("utf-8"), column) for word, column in vocab_index.items())
+        term_text = b"".join(encoded_word for encoded_word, _ in encoded_terms)
+        term_offsets = np.zeros(len(encoded_terms) + 1, dtype = "<u4")
+        np.cumsum([len(encoded_word) for encoded_word, _ in encoded_terms], out = term_offsets[1:])
+        sorted_columns = np.array([column for _, column in encoded_terms], dtype = np.int64)
+
+        # Class labels are stored as a little-endian array whose dtype is recorded in the header, so every label type round-trips
+        classes = np.asarray(classes)
+        if classes.dtype.kind == "O":
+            classes = classes.astype(str)
+        label_dtype = classes.dtype.newbyteorder("<")
+        class_table = classes.astype(label_dtype).tobytes()
+
+        # Sections are padded to four bytes so the numeric arrays can be viewed in place
+        with open(file, "wb") as f:
+            f.write(MODEL_FILE_HEADER.pack(MODEL_FILE_MAGIC, MODEL_FILE_VERSION, 0, len(classes), len(encoded_terms), len(term_text), label_dtype.str.encode("ascii")))
+            f.write(class_table + b"\0" * (-len(class_table) % 4))
+            f.write(term_offsets.tobytes())
+            f.write(term_text + b"\0" * (-len(term_text) % 4))
+            f.write(np.asarray(class_log_priors, dtype = "<f4").tobytes())
+            f.write(np.asarray(class_log_probabilities, dtype = "<f4")[:, sorted_columns].tobytes())
+        return
+
+    # ================== METHOD TO GRAB COMPACT BAYES MODEL VIA MMAP =================
+    def grab_compact_model(self, file):
+        # Maps file read-only so the term table and float32 arrays are paged in on demand rather than loaded
+        with open(file, "rb") as f:
+            buffer = mmap.mmap(f.fileno(), 0, access = mmap.ACCESS_READ)
+        return self.read_compact_model_buffer(buffer)
+
+    # ================ METHOD TO READ AND VALIDATE COMPACT MODEL FILE ================
+    def read_compact_model_buffer(self, buffer):
+        if len(buffer) < MODEL_FILE_HEADER.size:
+            raise ValueError("Bayes model file is truncated")
+
+        magic, version, _, num_classes, num_terms, term_text_length, label_dtype = MODEL_FILE_HEADER.unpack_from(buffer, 0)
+        if magic != MODEL_FILE_MAGIC:
+            raise ValueError("Not a compact Bayes model file")
+        if version != MODEL_FILE_VERSION:
+            raise ValueError("Unsupported Bayes model file version {}".format(version))
+
+        try:
+            label_dtype = np.dtype(label_dtype.rstrip(b"\0").decode("ascii"))
+        except (TypeError, ValueError):
+            raise ValueError("Unknown class label dtype {!r} in Bayes model file".format(label_dtype))
+
+        # Copies the class label table out of the buffer with its stored dtype
+        offset = MODEL_FILE_HEADER.size
+        if len(buffer) < offset + label_dtype.itemsize * num_classes:
+            raise ValueError("Bayes model file is truncated")
+        classes = np.frombuffer(buffer, dtype = label_dtype, count = num_classes, offset = offset).astype(label_dtype.newbyteorder("="))
+        offset += label_dtype.itemsize * num_classes
+        offset += -offset % 4
+
+        padded_text_length = term_text_length + (-term_text_length % 4)
+        if len(buffer) < offset + 4 * (num_terms + 1) + padded_text_length + 4 * num_classes * (num_terms + 1):
+            raise ValueError("Bayes model file is truncated")
+
+        # Views every section directly in the buffer
+        term_offsets = np.frombuffer(buffer, dtype = "<u4", count = num_terms + 1, offset = offset)
+        offset += 4 * (num_terms + 1)
+        term_text = memoryview(buffer)[offset:offset + term_text_length]
+        offset += padded_text_length
+        class_log_priors = np.frombuffer(buffer, dtype = "<f4", count = num_classes, offset = offset)
+        offset += 4 * num_classes
+        class_log_probabilities = np.frombuffer(buffer, dtype = "<f4", count = num_classes * num_terms, offset = offset).reshape(num_classes, num_terms)
+
+        return Compact_Naïve_Bayes_Model(classes, term_offsets, term_text, class_log_probabilities, class_log_priors, buffer = buffer)
+
     # ================ METHOD TO PARSE TEXT FROM STRING USING REGEXES ================
     def text_parser(self, long_string):
-        list_of_tokens = re.split(r"\W+", long_string)
-        return [token.lower() for token in list_of_tokens if len(token) > 2]
+        # Precompiled pattern yields the same tokens as splitting on \W+ and dropping short tokens
+        return corpus.tokenize_text(long_string)
 
     # ===================== METHOD TO CHECK FOR SPAM-MATCHING DATA ===================
-    # TODO: Method is dysfunctional; must repair!
-    # EXPECTED: Error is minimal but inconsistently non-zero.
-    # ACTUAL: Error is consistently zero, despite probability distribution.
-    def check_for_spam(self):
+    def check_for_spam(self, corpus_source = "email.zip"):
         document_list = []
         class_list = []
-        full_text = []
 
-        # Iterates through each email bank and add each parsed email text to all lists (document, full-text, class)
-        for iterator in range(1, 26):
-            # Adds parsed email text from spam emails
-            word_list = self.text_parser(open("email/spam/{}.txt".format(iterator), encoding="ISO-8859-1").read())
+        # Streams every email from the archive (or an unzipped email/ directory) and labels it by its spam/ham folder
+        for label, _, word_list in corpus.iterate_token_lists(corpus_source):
+            if label not in SPAM_CLASS_LABELS:
+                continue
             document_list.append(word_list)
-            full_text.extend(word_list)
-            class_list.append(1)
-            
-            # Adds parsed email text from ham emails
-            word_list = self.text_parser(open("email/ham/{}.txt".format(iterator), encoding="ISO-8859-1").read())
-            document_list.append(word_list)
-            full_text.extend(word_list)
-            class_list.append(0)
+            class_list.append(SPAM_CLASS_LABELS[label])
         
-        # Creates local vocabulary list from email tokens
-        vocab_list = self.create_vocab_list(document_list)
-        training_set = range(50)
+        # Creates local vocabulary index from email tokens
+        vocab_index = self.create_vocab_index(document_list)
+        training_set = list(range(len(document_list)))
         test_set = []
 
-        # Creates test set of ten random emails from uniform distribution
+        # Creates test set of ten random emails from uniform distribution (held out of the training set)
         for _ in range(10):
             random_index = int(np.random.uniform(0, len(training_set)))
             test_set.append(training_set[random_index])
-            del(list(training_set)[random_index])
+            del(training_set[random_index])
         
-        training_matrix = []
-        training_classes = []
-
-        # Creates training dataset and class labels from document list
-        for document_index in training_set:
-            training_matrix.append(self.convert_bag_of_words_to_vector(vocab_list, document_list[document_index]))
-            training_classes.append(class_list[document_index])
-
-        # Creates vectors for initial conditional probabilities and spam probability from training data
-        p0_vector, p1_vector, p_spam = self.naïve_bayes_trainer(np.array(training_matrix), np.array(training_classes))
-        # print("P0 VECTOR IS: {}\n".format(p0_vector))
-        # print("P1 VECTOR IS: {}\n".format(p1_vector))
-        # print("P SPAM IS: {}\n".format(p_spam))
-        error_count = 0.0
-
-        # Produces vector from test word data, then tests word vector against Bayes classifier and tracks error
-        for document_index in test_set:
-            word_vector = self.convert_bag_of_words_to_vector(vocab_list, document_list[document_index])
-            # print("WORD VECTOR IS: {}\n".format(word_vector))
-            # print(self.classify_naïve_bayes(np.array(word_vector), p0_vector, p1_vector, p_spam))
-            # print(class_list[document_index])
-
-            if self.classify_naïve_bayes(np.array(word_vector), p0_vector, p1_vector, p_spam) != class_list[document_index]:
-                error_count += 1.0
-                print("\nCLASSIFICATION ERROR: {}\n".format(document_list[document_index]))
-
-        # print("ERROR COUNT IS: {}\n".format(error_count))
+        # Creates sparse training matrix and class labels from document list
+        training_matrix = self.vectorize_documents(vocab_index, [document_list[document_index] for document_index in training_set])
+        training_classes = [class_list[document_index] for document_index in training_set]
+
+        # Creates per-class log probabilities and log priors from training data
+        classes, class_log_probabilities, class_log_priors = self.sparse_naïve_bayes_trainer(training_matrix, training_classes)
+        # print("CLASS LOG PROBABILITIES ARE: {}\n".format(class_log_probabilities))
+        # print("CLASS LOG PRIORS ARE: {}\n".format(class_log_priors))
+
+        # Scores all test documents at once, then tracks error against their true classes
+        test_matrix = self.vectorize_documents(vocab_index, [document_list[document_index] for document_index in test_set])
+        predicted_classes = self.classify_naïve_bayes_batch(test_matrix, classes, class_log_probabilities, class_log_priors)
+        classification_errors = predicted_classes != np.array([class_list[document_index] for document_index in test_set])
+
+        for document_index in np.array(test_set)[classification_errors]:
+            print("\nCLASSIFICATION ERROR: {}\n".format(document_list[document_index]))
+
         # print("TEST SET IS: {}\n".format(test_set))
-        print("\nTHE ERROR RATE IS: {}\n".format(float(error_count) / len(test_set)))
+        print("\nTHE ERROR RATE IS: {}\n".format(float(classification_errors.sum()) / len(test_set)))
         return
 
+    # ==================== METHOD TO GENERATE K-FOLD INDEX SPLITS ====================
+    def generate_k_fold_indices(self, number_of_documents, k = 10, seed = None):
+        # Every fold needs at least one test document and every training set at least one document
+        if not 2 <= k <= number_of_documents:
+            raise ValueError("Number of folds {} must be between 2 and the number of documents ({})".format(k, number_of_documents))
+
+        # One shuffled permutation is cut into k near-equal folds, so every document is tested exactly once
+        permutation = np.random.RandomState(seed).permutation(number_of_documents)
+        test_folds = np.array_split(permutation, k)
+        fold_ids = np.empty(number_of_documents, dtype = np.int64)
+        for fold, test_indices in enumerate(test_folds):
+            fold_ids[test_indices] = fold
+
+        # Training indices are the complement of each fold, found with a boolean mask instead of list deletion
+        k_fold_indices = [(np.flatnonzero(fold_ids != fold), test_indices) for fold, test_indices in enumerate(test_folds)]
+        return k_fold_indices
+
+    # ===================== METHOD TO TRAIN AND SCORE SINGLE FOLD ====================
+    def evaluate_fold(self, document_term_matrix, class_labels, training_indices, test_indices, variant = None, alpha = 1.0):
+        TIME_I = t()
+
+        # Row slicing of the shared CSR matrix replaces re-vectorizing documents for every split
+        if variant is None:
+            classes, class_log_probabilities, class_log_priors = self.sparse_naïve_bayes_trainer(document_term_matrix[training_indices], class_labels[training_indices])
+            predicted_classes = self.classify_naïve_bayes_batch(document_term_matrix[test_indices], classes, class_log_probabilities, class_log_priors)
+        else:
+            classes, class_weights, class_biases = self.train_naïve_bayes_variant(document_term_matrix[training_indices], class_labels[training_indices], variant, alpha)
+            predicted_classes = self.classify_naïve_bayes_variant(document_term_matrix[test_indices], classes, class_weights, class_biases, variant)
+        error_rate = float((predicted_classes != class_labels[test_indices]).mean())
+
+        return error_rate, t() - TIME_I
+
+    # ============= METHOD TO CROSS-VALIDATE BAYES MODEL ON SPARSE MATRIX ============
+    def cross_validate_naïve_bayes(self, document_term_matrix, class_labels, k = 10, seed = None, processes = None, variant = None, alpha = 1.0):
+        class_labels = np.asarray(class_labels)
+        k_fold_indices = self.generate_k_fold_indices(document_term_matrix.shape[0], k, seed)
+        fold_arguments = [(training_indices, test_indices, variant, alpha) for training_indices, test_indices in k_fold_indices]
+
+        # Folds are independent, so they can be trained and scored in worker processes that each receive the matrix once
+        if processes:
+            with Pool(processes, initializer = share_fold_data, initargs = (document_term_matrix, class_labels)) as pool:
+                fold_results = pool.starmap(evaluate_shared_fold, fold_arguments)
+        else:
+            fold_results = [self.evaluate_fold(document_term_matrix, class_labels, *arguments) for arguments in fold_arguments]
+
+        fold_errors = np.array([error_rate for error_rate, _ in fold_results])
+        fold_times = np.array([fold_time for _, fold_time in fold_results])
+
+        # print("FOLD ERROR RATES ARE: {}\nFOLD TIMES ARE: {}\n".format(fold_errors, fold_times))
+        print("{}-FOLD MEAN ERROR RATE IS: {:.4f} (VARIANCE: {:.6f})\n".format(k, fold_errors.mean(), fold_errors.var()))
+        return fold_errors, fold_times
+
+    # ================= METHOD TO SELECT MOST ACCURATE BAYES VARIANT =================
+    def select_naïve_bayes_variant(self, document_term_matrix, class_labels, variants = NAÏVE_BAYES_VARIANTS, alphas = (0.1, 0.5, 1.0), k = 5, seed = 0, processes = None):
+        mean_errors = dict()
+
+        # The same matrix and the same seeded folds are reused for every variant and smoothing value
+        for variant in variants:
+            for alpha in alphas:
+                print("VARIANT: {} (ALPHA = {})".format(variant.upper(), alpha))
+                fold_errors, _ = self.cross_validate_naïve_bayes(document_term_matrix, class_labels, k, seed, processes, variant, alpha)
+                mean_errors[(variant, alpha)] = fold_errors.mean()
+
+        best_variant, best_alpha = min(mean_errors, key = mean_errors.get)
+        print("MOST ACCURATE VARIANT IS: {} (ALPHA = {})\n".format(best_variant.upper(), best_alpha))
+        return best_variant, best_alpha, mean_errors
+
+    # ============== METHOD TO CROSS-VALIDATE BAYES MODEL ON SPAM CORPUS =============
+    def cross_validate_spam(self, corpus_source = "email.zip", k = 10, seed = None, processes = None):
+        document_list = []
+        class_list = []
+
+        # Tokenizes the corpus once, labelling each email by its spam/ham folder (emails in any other folder are skipped)
+        for label, _, word_list in corpus.iterate_token_lists(corpus_source):
+            if label not in SPAM_CLASS_LABELS:
+                continue
+            document_list.append(word_list)
+            class_list.append(SPAM_CLASS_LABELS[label])
+
+        # Builds the document-term matrix once; every fold slices rows out of it
+        vocab_index = self.create_vocab_index(document_list)
+        document_term_matrix = self.vectorize_documents(vocab_index, document_list)
+
+        return self.cross_validate_naïve_bayes(document_term_matrix, class_list, k, seed, processes)
+
     # =============== METHOD TO CREATE SORTED DICTOGRAM FROM VOCAB DATA ==============
     def calculate_probability_distribution(self, vocab_list, full_text):
-        dictogram = {}
-
-        for token in vocab_list:
-            dictogram[token] = full_text.count(token)
+        # Counts every token of the corpus in one pass, keeping only vocabulary words
+        term_frequencies = corpus.count_term_frequencies([full_text])
+        vocab_set = set(vocab_list)
+        dictogram = dict((token, count) for token, count in term_frequencies.items() if token in vocab_set)
 
-        sorted_dictogram = sorted(dictogram.items(), key = op.itemgetter(1), reverse = True)
+        # Selects the thirty most frequent tokens with a heap rather than sorting the whole dictogram
+        sorted_dictogram = corpus.get_top_terms(dictogram, 30)
         
-        print("SORTED PROBABILITY HISTOGRAM-DICTIONARY: {}\n".format(sorted_dictogram[:30]))
-        return sorted_dictogram[:30]
+        print("SORTED PROBABILITY HISTOGRAM-DICTIONARY: {}\n".format(sorted_dictogram))
+        return sorted_dictogram
 
     # ========= METHOD TO TEST LOCAL WORD FREQUENCIES FROM RANDOMIZED EMAILS =========
-    # TODO: Method is dysfunctional; must repair!
-    # EXPECTED: Error is minimal but inconsistently non-zero.
-    # ACTUAL: Error is consistently zero, despite probability distribution.
     def test_local_words(self, feed_attr1, feed_attr0):
         document_list = []
         class_list = []
@@ -273,66 +575,211 @@ class Naïve_Bayes_Classifier_Algorithm(object):
                 vocab_list.remove(word_pair[0])
     
         # Creates training set from input feeds
-        training_set = range(2 * minimum_feed_length)
+        training_set = list(range(2 * minimum_feed_length))
         test_set = []
 
-        # Creates test set of ten random emails from uniform distribution
+        # Creates test set of twenty random entries from uniform distribution (held out of the training set)
         for _ in range(20):
             random_index = int(np.random.uniform(0, len(training_set)))
             test_set.append(training_set[random_index])
-            del(list(training_set)[random_index])
-
-        training_matrix = []
-        training_classes = []
+            del(training_set[random_index])
 
-        # Creates training matrix from document word data and class vectors
-        for document_index in training_set:
-            training_matrix.append(self.convert_bag_of_words_to_vector(vocab_list, document_list[document_index]))
-            training_classes.append(class_list[document_index])
+        # Creates sparse training matrix from document word data and class vectors
+        vocab_index = dict((word, column) for column, word in enumerate(vocab_list))
+        training_matrix = self.vectorize_documents(vocab_index, [document_list[document_index] for document_index in training_set])
+        training_classes = [class_list[document_index] for document_index in training_set]
 
-        # Creates vectors for initial conditional probabilities and spam probability from training data
-        p0_vector, p1_vector, p_spam = self.naïve_bayes_trainer(np.array(training_matrix), np.array(training_classes))
-        error_count = 0.0
+        # Creates vectors for initial conditional probabilities from training data
+        classes, class_log_probabilities, class_log_priors = self.sparse_naïve_bayes_trainer(training_matrix, training_classes)
+        p0_vector = class_log_probabilities[list(classes).index(0)]
+        p1_vector = class_log_probabilities[list(classes).index(1)]
 
-        # Produces vector from test word data, then tests word vector against Bayes classifier and tracks error
-        for document_index in test_set:
-            word_vector = self.convert_bag_of_words_to_vector(vocab_list, document_list[document_index])
-
-            if self.classify_naïve_bayes(np.array(word_vector), p0_vector, p1_vector, p_spam) != class_list[document_index]:
-                error_count += 1.0
+        # Scores all test documents at once and tracks error against their true classes
+        test_matrix = self.vectorize_documents(vocab_index, [document_list[document_index] for document_index in test_set])
+        predicted_classes = self.classify_naïve_bayes_batch(test_matrix, classes, class_log_probabilities, class_log_priors)
+        error_count = float((predicted_classes != np.array([class_list[document_index] for document_index in test_set])).sum())
 
         # Returns local vocabulary list, local error rate, and initial conditional vector probabilities
         print("THE ERROR RATE IS: {}\n".format(float(error_count) / len(test_set)))
         # print("LOCAL VOCABULARY LIST IS: {}\nPROBABILITY VECTOR FOR NORMAL WORDS IS: {}\nPROBABILITY VECTOR FOR TARGET WORDS IS: {}\n".format(vocab_list, p0_vector, p1_vector))
         return vocab_list, p0_vector, p1_vector
 
+    # ================ METHOD TO SELECT TOP-K SCORES WITH ARGPARTITION ===============
+    def select_top_scores(self, scores, k):
+        # Partial partition finds the k largest in linear time; only those k are then sorted
+        k = min(k, len(scores))
+        if k <= 0:
+            return np.empty(0, dtype = np.int64), scores[:0]
+        top_ids = np.argpartition(-scores, k - 1)[:k]
+        top_ids = top_ids[np.argsort(-scores[top_ids], kind = "stable")]
+        return top_ids, scores[top_ids]
+
+    # ================== METHOD TO GET DISCRIMINATIVE TERMS OF CLASS =================
+    def get_discriminative_terms(self, class_log_probabilities, class_row, k = 30, by_log_odds = False, min_log_probability = None):
+        class_log_probabilities = np.asarray(class_log_probabilities)
+        scores = class_log_probabilities[class_row]
+
+        # Log-odds compare the class against the pooled (averaged) probability of all other classes
+        if by_log_odds:
+            other_rows = np.delete(class_log_probabilities, class_row, axis = 0)
+            scores = scores - (np.logaddexp.reduce(other_rows, axis = 0) - np.log(len(other_rows)))
+
+        # Terms too rare within the class are masked out with one vectorized comparison
+        if min_log_probability is not None:
+            scores = np.where(class_log_probabilities[class_row] > min_log_probability, scores, -np.inf)
+
+        term_ids, term_scores = self.select_top_scores(scores, k)
+        is_kept = np.isfinite(term_scores)
+
+        # print("TERM IDS ARE: {}\nTERM SCORES ARE: {}\n".format(term_ids[is_kept], term_scores[is_kept]))
+        return term_ids[is_kept], term_scores[is_kept]
+
     # ========= METHOD TO GET TOP WORDS BY OCCURRENCE FROM RANDOMIZED EMAILS =========
-    # TODO: Method is dysfunctional; must repair!
-    # EXPECTED: Minimal error results in some (not all) tokens printed from emails as top words.
-    # ACTUAL: All tokens printed from emails as top words due to consistently zero error. 
-    def get_top_words(self, feed_attr1, feed_attr0):
+    def get_top_words(self, feed_attr1, feed_attr0, k = 30, by_log_odds = False, feed_name1 = "NY", feed_name0 = "SF"):
         vocab_list, p0_vector, p1_vector = self.test_local_words(feed_attr1, feed_attr0)
-        top_words_NY = []
-        top_words_SF = []
+        vocab_array = np.array(vocab_list)
+        class_log_probabilities = np.vstack((p0_vector, p1_vector))
+
+        # Top terms per class (row 0: feed_attr0, row 1: feed_attr1) among those with log probability above -6.0
+        top_ids0, _ = self.get_discriminative_terms(class_log_probabilities, 0, k, by_log_odds, -6.0)
+        top_ids1, _ = self.get_discriminative_terms(class_log_probabilities, 1, k, by_log_odds, -6.0)
+
+        print("**".join([feed_name1] * 14) + " **")
+        print("\n".join(vocab_array[top_ids1]))
 
-        for iterator in range(len(p0_vector)):
-            if p0_vector[iterator] > -6.0:
-                top_words_SF.append((vocab_list[iterator], p0_vector[iterator]))
-            if p1_vector[iterator] > -6.0:
-                top_words_NY.append((vocab_list[iterator], p1_vector[iterator]))
+        print("**".join([feed_name0] * 14) + " **")
+        print("\n".join(vocab_array[top_ids0]))
 
-        sorted_words_NY = sorted(top_words_NY, key = lambda word_pair: word_pair[1], reverse = True)
-        print("NY**NY**NY**NY**NY**NY**NY**NY**NY**NY**NY**NY**NY**NY **")
-        for pair in sorted_words_NY:
-            print(pair[0])
+        return vocab_array[top_ids1], vocab_array[top_ids0]
 
-        sorted_words_SF = sorted(top_words_SF, key = lambda word_pair: word_pair[1], reverse = True)
-        print("SF**SF**SF**SF**SF**SF**SF**SF**SF**SF**SF**SF**SF**SF **")
-        for pair in sorted_words_SF:
-            print(pair[0])
 
+class Online_Naïve_Bayes_Model(object):
+
+    # ======================== CLASS INITIALIZERS/DECLARATIONS =======================
+    def __init__(self, initial_capacity = 1024):
+        self.bayes = Naïve_Bayes_Classifier_Algorithm()     # Shared vectorizer and batch scorer
+        self.vocab_index = dict()                           # Word-to-column index that grows as new words arrive
+        self.classes = []                                   # Class labels in sorted order, as np.unique() returns them
+        self.class_index = dict()                           # Class-label-to-row index
+        self.class_term_counts = np.zeros((0, initial_capacity))    # Per-class token counts (columns over-allocated)
+        self.class_document_counts = np.zeros(0)            # Per-class number of documents seen
+        self.class_log_probabilities = None                 # Cached log probabilities (None when stale)
+        self.class_log_priors = None                        # Cached log priors (None when stale)
+
+    # ================== METHOD TO GROW VOCABULARY AND CLASS TABLES ==================
+    def grow_tables(self, documents, class_labels):
+        # Registers unseen words and classes; existing columns and rows keep their positions
+        for document in documents:
+            for word in document:
+                if word not in self.vocab_index:
+                    self.vocab_index[word] = len(self.vocab_index)
+
+        # Classes stay sorted like those of sparse_naïve_bayes_trainer(), so score ties break the same way as retraining
+        previous_classes = self.classes
+        unseen_classes = set(class_labels).difference(self.class_index)
+        if unseen_classes:
+            self.classes = sorted(previous_classes + list(unseen_classes))
+            self.class_index = dict((label, row) for row, label in enumerate(self.classes))
+
+        # Over-allocates columns geometrically so vocabulary growth costs amortised constant time per word
+        num_rows, capacity = self.class_term_counts.shape
+        if len(self.vocab_index) > capacity:
+            capacity = max(2 * capacity, len(self.vocab_index))
+        if unseen_classes or capacity > self.class_term_counts.shape[1]:
+            previous_rows = [self.class_index[label] for label in previous_classes]
+            grown_counts = np.zeros((len(self.classes), capacity))
+            grown_counts[previous_rows, :self.class_term_counts.shape[1]] = self.class_term_counts
+            grown_document_counts = np.zeros(len(self.classes))
+            grown_document_counts[previous_rows] = self.class_document_counts
+            self.class_term_counts = grown_counts
+            self.class_document_counts = grown_document_counts
         return
 
+    # ==================== METHOD TO UPDATE COUNTS FROM MINI-BATCH ===================
+    def partial_fit(self, documents, class_labels):
+        self.grow_tables(documents, class_labels)
+        batch_matrix = self.bayes.vectorize_documents(self.vocab_index, documents)
+        class_ids = np.array([self.class_index[label] for label in class_labels], dtype = np.int64)
+
+        # Adds only the batch's non-zero entries, so an update costs time proportional to the new documents
+        nonzero_rows = np.repeat(class_ids, np.diff(batch_matrix.indptr))
+        np.add.at(self.class_term_counts, (nonzero_rows, batch_matrix.indices), batch_matrix.data)
+        np.add.at(self.class_document_counts, class_ids, 1)
+
+        # Marks cached probabilities as stale; they are rebuilt on the next query
+        self.class_log_probabilities = None
+        self.class_log_priors = None
+        return self
+
+    # ================== METHOD TO LAZILY COMPUTE LOG PROBABILITIES ==================
+    def get_log_probabilities(self):
+        if self.class_log_probabilities is None:
+            class_term_counts = self.class_term_counts[:, :len(self.vocab_index)]
+
+            # Same smoothing as sparse_naïve_bayes_trainer(), so results match retraining from scratch
+            self.class_log_probabilities = np.log((class_term_counts + 1.0) / (class_term_counts.sum(axis = 1, keepdims = True) + 2.0))
+            self.class_log_priors = np.log(self.class_document_counts / self.class_document_counts.sum())
+
+        return self.class_log_probabilities, self.class_log_priors
+
+    # =============== METHOD TO CLASSIFY DOCUMENTS WITH CURRENT COUNTS ===============
+    def predict(self, documents):
+        class_log_probabilities, class_log_priors = self.get_log_probabilities()
+        document_term_matrix = self.bayes.vectorize_documents(self.vocab_index, documents)
+        return self.bayes.classify_naïve_bayes_batch(document_term_matrix, np.array(self.classes), class_log_probabilities, class_log_priors)
+
+
+class Compact_Naïve_Bayes_Model(object):
+
+    # ======================== CLASS INITIALIZERS/DECLARATIONS =======================
+    def __init__(self, classes, term_offsets, term_text, class_log_probabilities, class_log_priors, buffer = None):
+        self.bayes = Naïve_Bayes_Classifier_Algorithm()     # Shared batch scorer
+        self.classes = classes                              # Class labels in row order
+        self.term_offsets = term_offsets                    # Start of every sorted term in term_text (plus end sentinel)
+        self.term_text = term_text                          # Concatenated UTF-8 bytes of the sorted terms
+        self.class_log_probabilities = class_log_probabilities      # Float32 (classes x terms) log probabilities
+        self.class_log_priors = class_log_priors            # Float32 log priors per class
+        self.buffer = buffer                                # Backing buffer (kept alive while arrays are views into it)
+
+    # =================== METHOD TO RETURN TERM AT SORTED POSITION ===================
+    def get_term(self, term_id):
+        return bytes(self.term_text[self.term_offsets[term_id]:self.term_offsets[term_id + 1]]).decode("utf-8")
+
+    # ================== METHOD TO LOOK UP TERM ID BY BINARY SEARCH ==================
+    def get_term_id(self, word):
+        encoded_word = word.encode("utf-8")
+        low, high = 0, len(self.term_offsets) - 1
+
+        # Searches the sorted term text in place, so no word-to-column dictionary is ever built
+        while low < high:
+            middle = (low + high) // 2
+            if bytes(self.term_text[self.term_offsets[middle]:self.term_offsets[middle + 1]]) < encoded_word:
+                low = middle + 1
+            else:
+                high = middle
+
+        if low < len(self.term_offsets) - 1 and bytes(self.term_text[self.term_offsets[low]:self.term_offsets[low + 1]]) == encoded_word:
+            return low
+        return -1
+
+    # ============== METHOD TO VECTORIZE DOCUMENTS AGAINST SORTED TERMS ==============
+    def vectorize_documents(self, documents):
+        column_indices = []
+        row_pointers = [0]
+
+        # Words missing from the pruned vocabulary are dropped, as in Naïve_Bayes_Classifier_Algorithm.vectorize_documents()
+        for document in documents:
+            column_indices.extend([term_id for term_id in map(self.get_term_id, document) if term_id >= 0])
+            row_pointers.append(len(column_indices))
+
+        document_term_matrix = sp.csr_matrix((np.ones(len(column_indices), dtype = np.float32), np.array(column_indices, dtype = np.int64), np.array(row_pointers, dtype = np.int64)), shape = (len(row_pointers) - 1, len(self.term_offsets) - 1))
+        document_term_matrix.sum_duplicates()
+        return document_term_matrix
+
+    # ================ METHOD TO CLASSIFY DOCUMENTS WITH COMPACT MODEL ===============
+    def predict(self, documents):
+        return self.bayes.classify_naïve_bayes_batch(self.vectorize_documents(documents), self.classes, self.class_log_probabilities, self.class_log_priors)
+
 
 # ====================================================================================
 # ================================= MAIN RUN FUNCTION ================================
@@ -351,28 +798,79 @@ def main():
     bayes.test_naïve_bayes()
     """
 
+    # Testing sparse vectorizer against sample posts (dictionary index and feature hashing)
+    """
+    list_of_posts, list_of_classes = bayes.load_data_set()
+    vocab_index = bayes.create_vocab_index(list_of_posts)
+    print(bayes.vectorize_documents(vocab_index, list_of_posts).toarray())
+    print(bayes.vectorize_documents(None, list_of_posts, num_hash_features = 2 ** 10))
+    """
+
     # Testing spam test method
-    # TODO: Is currently dysfunctional; error consistently returns zero despite probability distribution. Must fix!
     """ 
     bayes.check_for_spam()
     """
 
+    # Testing spam classifier with 10-fold cross-validation (folds scored in two worker processes)
+    """
+    fold_errors, fold_times = bayes.cross_validate_spam("email.zip", k = 10, seed = 0, processes = 2)
+    print("FOLD ERROR RATES ARE: {}\nFOLD TIMES ARE: {}\n".format(fold_errors, fold_times))
+    """
+
+    # Testing multinomial, Bernoulli, and complement variants on one spam document-term matrix
+    """
+    document_list, class_list = [], []
+    for label, _, word_list in corpus.iterate_token_lists("email.zip"):
+        document_list.append(word_list)
+        class_list.append(label)
+    document_term_matrix = bayes.vectorize_documents(bayes.create_vocab_index(document_list), document_list)
+    best_variant, best_alpha, mean_errors = bayes.select_naïve_bayes_variant(document_term_matrix, class_list)
+    """
+
+    # Testing vocabulary pruning and compact (sorted-term, float32, memory-mapped) model export
+    """
+    document_list, class_list = [], []
+    for label, _, word_list in corpus.iterate_token_lists("email.zip"):
+        document_list.append(word_list)
+        class_list.append(label)
+    vocab_index = bayes.create_vocab_index(document_list)
+    document_term_matrix = bayes.vectorize_documents(vocab_index, document_list)
+    document_term_matrix, vocab_index = bayes.prune_vocabulary(document_term_matrix, vocab_index, min_frequency = 2, max_document_frequency = 0.5, stop_words = corpus.STOP_WORDS)
+    classes, class_log_probabilities, class_log_priors = bayes.sparse_naïve_bayes_trainer(document_term_matrix, class_list)
+    bayes.store_compact_model("spam_model.nbay", vocab_index, classes, class_log_probabilities, class_log_priors)
+    compact_model = bayes.grab_compact_model("spam_model.nbay")
+    print(compact_model.predict(document_list[:5]))
+    """
+
+    # Testing online Bayes model fed with mini-batches of sample posts
+    """
+    list_of_posts, list_of_classes = bayes.load_data_set()
+    online_bayes = Online_Naïve_Bayes_Model()
+    online_bayes.partial_fit(list_of_posts[:3], list_of_classes[:3])
+    online_bayes.partial_fit(list_of_posts[3:], list_of_classes[3:])
+    print(online_bayes.predict([["love", "my", "dalmation"], ["stupid", "garbage"]]))
+    """
+
     # Testing RSS parsing Bayesian classifier
-    # TODO: Is currently dysfunctional; error consistently returns zero despite probability distribution. Must fix! 
     """
-    ny = fp.parse("https://newyork.craigslist.org/stp/index.rss")
-    sf = fp.parse("https://sfbay.craigslist.org/stp/index.rss")
+    ny, sf = feeds.fetch_feeds(["https://newyork.craigslist.org/stp/index.rss", "https://sfbay.craigslist.org/stp/index.rss"])
     vocab_list, p_sf, p_ny = bayes.test_local_words(ny, sf)
     """
 
-    # Testing top words getter via the Bayesian classifier
-    # TODO: Is currently dysfunctional; prints out all words as top words since error tracker does not track non-unique words. Must fix! 
-    ny = fp.parse("https://newyork.craigslist.org/stp/index.rss")
-    sf = fp.parse("https://sfbay.craigslist.org/stp/index.rss")
+    # Testing top words getter via the Bayesian classifier against live craigslist feeds (top 30 per class)
+    # Feeds are fetched concurrently and cached on disk, so re-runs reuse unchanged feeds
+    """
+    ny, sf = feeds.fetch_feeds(["https://newyork.craigslist.org/stp/index.rss", "https://sfbay.craigslist.org/stp/index.rss"])
     bayes.get_top_words(ny, sf)
+    """
+
+    # Testing RSS parsing Bayesian classifier (via the top words getter) offline against the local spam/ham feed fixtures
+    spam, ham = feeds.fetch_feeds(["feeds/spam.rss", "feeds/ham.rss"])
+    top_spam_words, top_ham_words = bayes.get_top_words(spam, ham, k = 10, by_log_odds = True, feed_name1 = "SPAM", feed_name0 = "HAM")
 
     # Side example for testing regex flexibility for returning token count
     """
+    import re
     sentence = "This book is the best book on Python or M.L. that I have ever laid my eyes upon."
     split_sentence = sentence.split()
     regex = re.compile("\\W*")
@@ -0,0 +1,178 @@
+"""
+NAME:               corpus_reader.py (data_projects/machine_learning_in_action/algo_ch04/)
+
+DESCRIPTION:        Python streaming reader and tokenizer for labelled mail corpora.
+
+                    Documents are read one at a time from a zip archive (such as email.zip)
+                    or from a directory tree, where the name of the folder holding each file
+                    is its class label (e.g. email/spam/1.txt is labelled "spam"). Text is
+                    tokenized with a precompiled pattern, optionally across worker processes,
+                    and can be mapped straight to arrays of vocabulary column ids. Term
+                    frequencies are counted in one pass per shard, merged across shards,
+                    and queried for the top-k terms with a heap.
+
+NOTE:               Original source code is Python 2, but my code is Python 3.
+
+CREDIT:             Machine Learning In Action (Peter Harrington)
+"""
+
+
+# ====================================================================================
+# ================================ IMPORT STATEMENTS =================================
+# ====================================================================================
+
+
+import os                                   # Library for basic operating system mechanics
+import re                                   # Library for regular expression support
+import heapq                                # Library for heap-based partial sorting (top-k selection)
+import zipfile                              # Library for reading members of zip archives
+import operator as op                       # Library for intrinsic Pythonic mathematical operations
+import numpy as np                          # Library for simple linear mathematical operations
+from collections import Counter             # Package for hashable-item frequency counting
+from multiprocessing import Pool            # Package for spreading work across worker processes
+from time import time as t                  # Package for tracking modular and program runtime
+
+
+# ====================================================================================
+# ============================== INITIALIZING CONSTANTS ==============================
+# ====================================================================================
+
+
+TOKEN_PATTERN = re.compile(r"\w{3,}")       # Word runs longer than two characters (same tokens as splitting on \W+)
+DEFAULT_ENCODING = "ISO-8859-1"             # Encoding of the sample spam/ham emails
+STOP_WORDS = frozenset(("the", "and", "you", "for", "your", "that", "have", "this", "from", "with",
+                        "are", "can", "will", "all", "more", "not", "but", "they", "was", "were",
+                        "been", "has", "had", "its", "our", "his", "her", "she", "him", "them",
+                        "their", "there", "then", "than", "what", "when", "who", "which", "how",
+                        "any", "some", "just", "also", "into", "out", "about", "would", "could",
+                        "should", "only", "other", "these", "those", "such", "here", "very", "get"))   # Common English words carrying no class information
+
+
+# ====================================================================================
+# ==================== HELPER FUNCTIONS FOR STREAMING MAIL CORPORA ===================
+# ====================================================================================
+
+
+# ================== FUNCTION TO TOKENIZE TEXT WITH COMPILED PATTERN =================
+def tokenize_text(text):
+    # One findall over the lowercased text replaces split, filter, and per-token lower()
+    return TOKEN_PATTERN.findall(text.lower())
+
+# ============== FUNCTION TO TOKENIZE SINGLE LABELLED DOCUMENT (WORKER) ==============
+def tokenize_document(document):
+    label, name, text = document
+    return label, name, tokenize_text(text)
+
+# ================ FUNCTION TO STREAM DOCUMENTS FROM ZIP OR DIRECTORY ================
+def iterate_corpus_documents(source, encoding = DEFAULT_ENCODING):
+    # Zip archives are read member by member without extracting them to disk
+    if zipfile.is_zipfile(source):
+        with zipfile.ZipFile(source) as archive:
+            for member in archive.infolist():
+                if member.is_dir():
+                    continue
+                label = os.path.basename(os.path.dirname(member.filename))
+                yield label, member.filename, archive.read(member).decode(encoding)
+        return
+
+    # Directory trees are walked in sorted order so runs are reproducible
+    for directory, subdirectories, filenames in os.walk(source):
+        subdirectories.sort()
+        for filename in sorted(filenames):
+            path = os.path.join(directory, filename)
+            with open(path, encoding = encoding) as f:
+                yield os.path.basename(directory), path, f.read()
+
+# ==================== FUNCTION TO STREAM TOKEN LISTS FROM CORPUS ====================
+def iterate_token_lists(source, processes = None, chunksize = 64, encoding = DEFAULT_ENCODING):
+    documents = iterate_corpus_documents(source, encoding)
+
+    # Tokenizes in this process unless worker processes are requested
+    if not processes:
+        for document in documents:
+            yield tokenize_document(document)
+        return
+
+    # Workers receive documents in chunks and results come back in corpus order
+    with Pool(processes) as pool:
+        for tokenized_document in pool.imap(tokenize_document, documents, chunksize):
+            yield tokenized_document
+
+# ================== FUNCTION TO STREAM TOKEN ID ARRAYS FROM CORPUS ==================
+def iterate_token_id_arrays(source, vocab_index, grow_vocab = True, processes = None, chunksize = 64, encoding = DEFAULT_ENCODING):
+    for label, name, tokens in iterate_token_lists(source, processes, chunksize, encoding):
+        # Unseen words get the next column id when growing; otherwise they are dropped
+        if grow_vocab:
+            token_ids = [vocab_index.setdefault(token, len(vocab_index)) for token in tokens]
+        else:
+            token_ids = [vocab_index[token] for token in tokens if token in vocab_index]
+        yield label, name, np.array(token_ids, dtype = np.int32)
+
+# ================== FUNCTION TO COUNT TERM FREQUENCIES IN ONE PASS ==================
+def count_term_frequencies(token_lists):
+    term_frequencies = Counter()
+
+    # Every token is counted exactly once, whatever the size of the vocabulary
+    for tokens in token_lists:
+        term_frequencies.update(tokens)
+    return term_frequencies
+
+# ================== FUNCTION TO MERGE TERM FREQUENCIES FROM SHARDS ==================
+def merge_term_frequencies(shard_frequencies):
+    term_frequencies = Counter()
+
+    # Counter.update() adds counts for mappings, so shards combine without re-reading tokens
+    for shard in shard_frequencies:
+        term_frequencies.update(shard)
+    return term_frequencies
+
+# ================== FUNCTION TO COUNT TERM FREQUENCIES IN PARALLEL ==================
+def count_term_frequencies_in_parallel(token_lists, processes = 2, num_shards = None):
+    token_lists = list(token_lists)
+    num_shards = num_shards or processes
+    shard_size = max(1, -(-len(token_lists) // num_shards))
+    shards = [token_lists[start:start + shard_size] for start in range(0, len(token_lists), shard_size)]
+
+    # Each worker counts its own shard; partial counts are merged in this process
+    with Pool(processes) as pool:
+        shard_frequencies = pool.map(count_term_frequencies, shards)
+    return merge_term_frequencies(shard_frequencies)
+
+# ====================== FUNCTION TO SELECT TOP TERMS WITH HEAP ======================
+def get_top_terms(term_frequencies, k = 30):
+    # Keeps a k-sized heap instead of sorting every term (O(V log k) rather than O(V log V))
+    return heapq.nlargest(k, term_frequencies.items(), key = op.itemgetter(1))
+
+# ==================== FUNCTION TO BENCHMARK TOKENIZER THROUGHPUT ====================
+def benchmark_tokenizer(source, processes = None, repeats = 1, chunksize = 64, encoding = DEFAULT_ENCODING):
+    number_of_documents = 0
+    number_of_tokens = 0
+    TIME_I = t()
+
+    # Streams the whole corpus end to end, including reading and token-id mapping
+    for _ in range(repeats):
+        vocab_index = dict()
+        for _, _, token_ids in iterate_token_id_arrays(source, vocab_index, True, processes, chunksize, encoding):
+            number_of_documents += 1
+            number_of_tokens += len(token_ids)
+
+    delta = t() - TIME_I
+    tokens_per_second = number_of_tokens / delta if delta > 0 else float("inf")
+
+    print("TOKENIZED {} DOCUMENTS ({} TOKENS) IN {:.4g} SECONDS: {:.4g} TOKENS PER SECOND\n".format(number_of_documents, number_of_tokens, delta, tokens_per_second))
+    return tokens_per_second
+
+
+# ====================================================================================
+# ================================= MAIN RUN FUNCTION ================================
+# ====================================================================================
+
+
+def main():
+    # Benchmark the tokenizer pipeline on the sample email archive, in-process and with workers
+    benchmark_tokenizer("email.zip", repeats = 20)
+    benchmark_tokenizer("email.zip", processes = 2, repeats = 20)
+    return
+
+if __name__ == "__main__":
+    main()
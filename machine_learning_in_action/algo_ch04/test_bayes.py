@@ -0,0 +1,173 @@
+"""
+NAME:               test_bayes.py (data_projects/machine_learning_in_action/algo_ch04/)
+
+DESCRIPTION:        Pytest checks for the naïve Bayes classifier algorithm in bayes.py.
+
+NOTE:               Run with 'python -m pytest' from this directory or the repository root.
+"""
+
+
+# ====================================================================================
+# ================================ IMPORT STATEMENTS =================================
+# ====================================================================================
+
+
+import math                                 # Library for scalar logarithms of hand-computed scores
+import pytest                               # Library for writing and running test functions
+import numpy as np                          # Library for simple linear mathematical operations
+import bayes                                # Modular program under test (naïve Bayes classifiers)
+
+
+# ====================================================================================
+# ============================ SPARSE BAYES MODEL CHECKS =============================
+# ====================================================================================
+
+
+# ================ FUNCTION TO CHECK SPARSE TRAINER AGAINST DENSE ONE ================
+def test_sparse_trainer_matches_dense_trainer():
+    nb = bayes.Naïve_Bayes_Classifier_Algorithm()
+    list_of_posts, list_of_classes = nb.load_data_set()
+    document_term_matrix = nb.vectorize_documents(nb.create_vocab_index(list_of_posts), list_of_posts)
+    dense_matrix = document_term_matrix.toarray()
+
+    p0_vector, p1_vector, p_abusive = nb.naïve_bayes_trainer(list(dense_matrix), list_of_classes)
+    classes, class_log_probabilities, class_log_priors = nb.sparse_naïve_bayes_trainer(document_term_matrix, list_of_classes)
+
+    assert list(classes) == [0, 1]
+    np.testing.assert_allclose(class_log_probabilities, np.vstack((p0_vector, p1_vector)))
+    np.testing.assert_allclose(np.exp(class_log_priors), [1 - p_abusive, p_abusive])
+
+    # Batch scoring agrees with scoring one dense vector at a time
+    predicted_classes = nb.classify_naïve_bayes_batch(document_term_matrix, classes, class_log_probabilities, class_log_priors)
+    assert list(predicted_classes) == [nb.classify_naïve_bayes(row, p0_vector, p1_vector, p_abusive) for row in dense_matrix]
+
+
+# ====================================================================================
+# ============================ BAYES VARIANT MODEL CHECKS ============================
+# ====================================================================================
+
+
+# =========== FUNCTION TO CHECK BERNOULLI SCORES AGAINST HAND-COMPUTED SUMS ==========
+def test_bernoulli_variant_matches_hand_computed_scores():
+    nb = bayes.Naïve_Bayes_Classifier_Algorithm()
+    documents = [["a", "a", "b"], ["b", "c"], ["a", "c", "c"], ["c"]]
+    class_labels = [1, 0, 1, 0]
+    test_documents = [["a", "a", "a"], ["b", "c", "c"], ["a", "b", "c"]]
+    alpha = 0.5
+    vocab_index = nb.create_vocab_index(documents)
+    classes, class_weights, class_biases = nb.train_naïve_bayes_variant(nb.vectorize_documents(vocab_index, documents), class_labels, "bernoulli", alpha)
+    test_matrix = nb.vectorize_documents(vocab_index, test_documents)
+
+    # Scores are log prior + sum over the vocabulary of x * log(p) + (1 - x) * log(1 - p), with x the presence of each word
+    linear_scores = (nb.binarize_documents(test_matrix) @ class_weights.T) + class_biases
+    for class_row, class_label in enumerate(classes):
+        class_documents = [set(document) for document, label in zip(documents, class_labels) if label == class_label]
+        for document_row, document in enumerate(test_documents):
+            expected_score = math.log(len(class_documents) / len(documents))
+            for word in vocab_index:
+                p = (sum(word in class_document for class_document in class_documents) + alpha) / (len(class_documents) + 2 * alpha)
+                x = float(word in document)
+                expected_score += x * math.log(p) + (1 - x) * math.log(1 - p)
+            assert linear_scores[document_row, class_row] == pytest.approx(expected_score)
+
+    expected_classes = classes[np.argmax(linear_scores, axis = 1)]
+    assert list(nb.classify_naïve_bayes_variant(test_matrix, classes, class_weights, class_biases, "bernoulli")) == list(expected_classes)
+
+# =========== FUNCTION TO CHECK COMPLEMENT SCORES AGAINST COMPLEMENT COUNTS ==========
+def test_complement_variant_matches_complement_counts():
+    nb = bayes.Naïve_Bayes_Classifier_Algorithm()
+    documents = [["a", "a", "b"], ["b", "c"], ["a", "c", "c"], ["c"], ["d", "a"]]
+    class_labels = ["x", "y", "x", "y", "z"]
+    test_documents = [["a", "a", "d"], ["b", "c", "c"], ["d"]]
+    alpha = 1.0
+    vocab_index = nb.create_vocab_index(documents)
+    classes, class_weights, class_biases = nb.train_naïve_bayes_variant(nb.vectorize_documents(vocab_index, documents), class_labels, "complement", alpha)
+    test_matrix = nb.vectorize_documents(vocab_index, test_documents)
+
+    # A class weight is -log((count of the word outside the class + alpha) / (all words outside the class + alpha * vocabulary size))
+    assert np.all(class_biases == 0)
+    linear_scores = test_matrix @ class_weights.T
+    for class_row, class_label in enumerate(classes):
+        complement_words = [word for document, label in zip(documents, class_labels) if label != class_label for word in document]
+        expected_weights = dict((word, -math.log((complement_words.count(word) + alpha) / (len(complement_words) + alpha * len(vocab_index)))) for word in vocab_index)
+        for word, column in vocab_index.items():
+            assert class_weights[class_row, column] == pytest.approx(expected_weights[word])
+        for document_row, document in enumerate(test_documents):
+            assert linear_scores[document_row, class_row] == pytest.approx(sum(expected_weights[word] for word in document))
+
+    expected_classes = classes[np.argmax(linear_scores, axis = 1)]
+    assert list(nb.classify_naïve_bayes_variant(test_matrix, classes, class_weights, class_biases, "complement")) == list(expected_classes)
+
+
+# ====================================================================================
+# ============================ ONLINE BAYES MODEL CHECKS =============================
+# ====================================================================================
+
+
+# ============== FUNCTION TO CHECK ONLINE MODEL AGAINST FULL RETRAINING ==============
+def test_online_model_matches_retraining():
+    nb = bayes.Naïve_Bayes_Classifier_Algorithm()
+    documents = [["cheap", "pills"], ["team", "meeting"], ["cheap", "offer"], ["lunch", "meeting"]]
+    class_labels = ["spam", "ham", "spam", "ham"]
+    test_documents = [["cheap", "meeting"], ["pills"], ["unseen"]]
+
+    # Spam arrives first, so first-appearance order would disagree with the sorted order of a full retrain
+    online_bayes = bayes.Online_Naïve_Bayes_Model(initial_capacity = 2)
+    online_bayes.partial_fit(documents[:1], class_labels[:1])
+    online_bayes.partial_fit(documents[1:], class_labels[1:])
+
+    vocab_index = nb.create_vocab_index(documents)
+    classes, class_log_probabilities, class_log_priors = nb.sparse_naïve_bayes_trainer(nb.vectorize_documents(vocab_index, documents), class_labels)
+
+    assert online_bayes.classes == list(classes)
+    # The last document only holds an unseen word, so its class scores tie and resolve to the first class
+    assert list(online_bayes.predict(test_documents)) == list(nb.classify_naïve_bayes_batch(nb.vectorize_documents(vocab_index, test_documents), classes, class_log_probabilities, class_log_priors))
+
+
+# ====================================================================================
+# ============================ COMPACT BAYES MODEL CHECKS ============================
+# ====================================================================================
+
+
+# ============ FUNCTION TO CHECK COMPACT MODEL ROUND-TRIP OF LABEL TYPES =============
+@pytest.mark.parametrize("class_labels", [[0, 1, 0, 1], [False, True, False, True], ["ham", "spam", "ham", "spam"],
+                                          np.array([3, 7, 3, 7], dtype = np.int16), [0.5, 1.5, 0.5, 1.5]])
+def test_compact_model_round_trips_class_labels(tmp_path, class_labels):
+    nb = bayes.Naïve_Bayes_Classifier_Algorithm()
+    documents = [["cheap", "pills"], ["team", "meeting"], ["cheap", "offer"], ["lunch", "meeting"]]
+    vocab_index = nb.create_vocab_index(documents)
+    classes, class_log_probabilities, class_log_priors = nb.sparse_naïve_bayes_trainer(nb.vectorize_documents(vocab_index, documents), class_labels)
+    path = str(tmp_path / "model.nbay")
+
+    nb.store_compact_model(path, vocab_index, classes, class_log_probabilities, class_log_priors)
+    compact_model = nb.grab_compact_model(path)
+
+    # Labels come back with their original dtype, not converted to strings
+    assert compact_model.classes.dtype == classes.dtype
+    assert list(compact_model.classes) == list(classes)
+    assert list(compact_model.predict(documents)) == list(nb.classify_naïve_bayes_batch(nb.vectorize_documents(vocab_index, documents), classes, class_log_probabilities, class_log_priors))
+
+
+# ====================================================================================
+# ============================== CROSS-VALIDATION CHECKS =============================
+# ====================================================================================
+
+
+# =============== FUNCTION TO CHECK K-FOLD SPLITS REJECT TOO MANY FOLDS ==============
+@pytest.mark.parametrize("k", [1, 4])
+def test_k_fold_indices_reject_invalid_fold_counts(k):
+    nb = bayes.Naïve_Bayes_Classifier_Algorithm()
+    with pytest.raises(ValueError):
+        nb.generate_k_fold_indices(3, k)
+
+# ============ FUNCTION TO CHECK PARALLEL CROSS-VALIDATION MATCHES SERIAL ============
+def test_parallel_cross_validation_matches_serial():
+    nb = bayes.Naïve_Bayes_Classifier_Algorithm()
+    list_of_posts, list_of_classes = nb.load_data_set()
+    document_term_matrix = nb.vectorize_documents(nb.create_vocab_index(list_of_posts), list_of_posts)
+
+    # Every document is tested exactly once when k equals the number of documents
+    serial_errors, _ = nb.cross_validate_naïve_bayes(document_term_matrix, list_of_classes, k = len(list_of_posts), seed = 0)
+    parallel_errors, _ = nb.cross_validate_naïve_bayes(document_term_matrix, list_of_classes, k = len(list_of_posts), seed = 0, processes = 2)
+    assert len(serial_errors) == len(list_of_posts)
+    np.testing.assert_array_equal(parallel_errors, serial_errors)
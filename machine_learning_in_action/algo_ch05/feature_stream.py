@@ -0,0 +1,187 @@
+"""
+NAME:               feature_stream.py (data_projects/machine_learning_in_action/algo_ch05/)
+
+DESCRIPTION:        Python chunked reader for feature files too large to hold in memory.
+
+                    Every row of a feature file holds the features followed by the class
+                    label, either as tab-separated text (like horse_colic_training01.txt)
+                    or as a binary file of float32 rows behind a small header. Binary files
+                    are memory-mapped, so a chunk is just a slice of the mapping; text files
+                    are indexed once by the byte offsets of their chunks, so any chunk can be
+                    read on its own. Chunks can therefore be visited in a shuffled order on
+                    every epoch while only one chunk is ever held in memory.
+
+NOTE:               Original source code is in Python 2, but my code is in Python 3.
+
+CREDIT:             Machine Learning In Action (Peter Harrington)
+"""
+
+
+# ====================================================================================
+# ================================ IMPORT STATEMENTS =================================
+# ====================================================================================
+
+
+import os                                   # Library for basic operating system mechanics
+import struct                               # Library for packing values into fixed binary layouts
+import numpy as np                          # Library for simple linear mathematical operations
+from time import time as t                  # Package for tracking modular and program runtime
+
+
+# ====================================================================================
+# ============================== INITIALIZING CONSTANTS ==============================
+# ====================================================================================
+
+
+FEATURE_FILE_MAGIC = b"LRFB"                # Leading bytes identifying a binary feature file
+FEATURE_FILE_VERSION = 1                    # Current version of the binary feature file layout
+FEATURE_FILE_HEADER = struct.Struct("<4sHHQI12x")   # Magic, version, reserved, row count, column count (padded to 32 bytes)
+FEATURE_FILE_DTYPE = np.dtype("<f4")        # Stored type of every feature and label value
+INDEX_BLOCK_SIZE = 1 << 20                  # Bytes read at a time while indexing text files
+WHITESPACE_BYTES = np.frombuffer(b" \t\r\n\x0b\x0c", dtype = np.uint8)   # Bytes that make up blank lines of text files
+TEXT_ENCODING = "ISO-8859-1"                # Decodes any byte of text files, so stray non-ASCII comments never fail
+
+
+# ====================================================================================
+# =================== HELPER FUNCTIONS FOR STREAMING FEATURE FILES ===================
+# ====================================================================================
+
+
+# ================= FUNCTION TO CHECK FOR BINARY FEATURE FILE HEADER =================
+def is_binary_feature_file(path):
+    with open(path, "rb") as f:
+        return f.read(len(FEATURE_FILE_MAGIC)) == FEATURE_FILE_MAGIC
+
+# ==================== FUNCTION TO MEMORY-MAP BINARY FEATURE FILE ====================
+def open_binary_feature_file(path):
+    with open(path, "rb") as f:
+        header = f.read(FEATURE_FILE_HEADER.size)
+    if len(header) < FEATURE_FILE_HEADER.size:
+        raise ValueError("Feature file is truncated")
+
+    magic, version, _, num_rows, num_cols = FEATURE_FILE_HEADER.unpack(header)
+    if magic != FEATURE_FILE_MAGIC:
+        raise ValueError("Not a binary feature file")
+    if version > FEATURE_FILE_VERSION:
+        raise ValueError("Unsupported feature file version {}".format(version))
+
+    # Files without rows cannot be memory-mapped, so they are served as an empty array
+    if num_rows == 0:
+        return np.empty((0, num_cols), dtype = FEATURE_FILE_DTYPE)
+
+    # Rows are paged in by the operating system only when a chunk slices them
+    return np.memmap(path, dtype = FEATURE_FILE_DTYPE, mode = "r", offset = FEATURE_FILE_HEADER.size, shape = (num_rows, num_cols))
+
+# =============== FUNCTION TO INDEX CHUNK OFFSETS OF TAB-SEPARATED FILE ==============
+def index_tsv_chunks(path, CHUNK_ROWS):
+    chunk_offsets = [0]
+    number_of_rows = 0
+    pending_characters = 0
+    block_start = 0
+
+    # Counts non-blank lines block by block, recording the byte offset after every CHUNK_ROWS-th one
+    with open(path, "rb") as f:
+        while True:
+            block = f.read(INDEX_BLOCK_SIZE)
+            if not block:
+                break
+            data = np.frombuffer(block, dtype = np.uint8)
+            line_ends = np.flatnonzero(data == ord("\n"))
+
+            # Running count of non-whitespace bytes gives every line's printable length (the first line may start in an earlier block)
+            printable_characters = np.cumsum(~np.isin(data, WHITESPACE_BYTES))
+            line_characters = np.diff(printable_characters[line_ends], prepend = 0)
+            if len(line_ends):
+                line_characters[0] += pending_characters
+                pending_characters = int(printable_characters[-1] - printable_characters[line_ends[-1]])
+            else:
+                pending_characters += int(printable_characters[-1])
+
+            # Blank lines are not rows, so they never end a chunk
+            is_row = line_characters > 0
+            row_numbers = number_of_rows + np.cumsum(is_row)
+            chunk_offsets.extend((line_ends[is_row & (row_numbers % CHUNK_ROWS == 0)] + block_start + 1).tolist())
+            number_of_rows += int(is_row.sum())
+            block_start += len(block)
+
+    # A last line without a trailing newline is still a row; trailing blank lines alone never form a chunk
+    if pending_characters > 0:
+        number_of_rows += 1
+    if number_of_rows > (len(chunk_offsets) - 1) * CHUNK_ROWS:
+        chunk_offsets.append(block_start)
+    return list(zip(chunk_offsets[:-1], chunk_offsets[1:]))
+
+# ======================= FUNCTION TO LIST FEATURE FILE CHUNKS =======================
+def list_feature_chunks(path, CHUNK_ROWS = 100000):
+    # Binary chunks are row ranges; text chunks are byte ranges holding CHUNK_ROWS lines each
+    if is_binary_feature_file(path):
+        num_rows = open_binary_feature_file(path).shape[0]
+        return [(start, min(start + CHUNK_ROWS, num_rows)) for start in range(0, num_rows, CHUNK_ROWS)]
+    return index_tsv_chunks(path, CHUNK_ROWS)
+
+# ================= FUNCTION TO STREAM FEATURE CHUNKS IN GIVEN ORDER =================
+def iterate_feature_chunks(path, chunks, chunk_order = None, dtype = np.float64):
+    chunk_order = range(len(chunks)) if chunk_order is None else chunk_order
+
+    # Yields (features, labels) per chunk; only the current chunk is ever converted into memory
+    if is_binary_feature_file(path):
+        data = open_binary_feature_file(path)
+        for chunk_index in chunk_order:
+            start, stop = chunks[chunk_index]
+            chunk = np.array(data[start:stop], dtype = dtype)
+            yield chunk[:, :-1], chunk[:, -1]
+        return
+
+    with open(path, "rb") as f:
+        for chunk_index in chunk_order:
+            start, stop = chunks[chunk_index]
+            f.seek(start)
+            lines = [line for line in f.read(stop - start).decode(TEXT_ENCODING).splitlines() if line.strip() and not line.lstrip().startswith("#")]
+
+            # Chunks holding only comment lines have no rows to yield
+            if not lines:
+                continue
+            chunk = np.loadtxt(lines, delimiter = "\t", dtype = dtype, ndmin = 2)
+            yield chunk[:, :-1], chunk[:, -1]
+
+# =============== FUNCTION TO CONVERT TAB-SEPARATED FILE TO BINARY FILE ==============
+def convert_tsv_to_binary(tsv_path, binary_path, CHUNK_ROWS = 100000):
+    num_rows = 0
+    num_cols = 0
+
+    # Header is rewritten with the final row count once every chunk has been appended
+    with open(binary_path, "wb") as f:
+        f.write(FEATURE_FILE_HEADER.pack(FEATURE_FILE_MAGIC, FEATURE_FILE_VERSION, 0, 0, 0))
+        for dataset, labels in iterate_feature_chunks(tsv_path, index_tsv_chunks(tsv_path, CHUNK_ROWS)):
+            rows = np.column_stack((dataset, labels)).astype(FEATURE_FILE_DTYPE)
+            f.write(rows.tobytes())
+            num_rows += rows.shape[0]
+            num_cols = rows.shape[1]
+        f.seek(0)
+        f.write(FEATURE_FILE_HEADER.pack(FEATURE_FILE_MAGIC, FEATURE_FILE_VERSION, 0, num_rows, num_cols))
+    return num_rows, num_cols
+
+
+# ====================================================================================
+# ================================ MAIN RUN FUNCTION =================================
+# ====================================================================================
+
+
+def main():
+    # Track starting time of program
+    TIME_I = t()
+
+    # Converts the horse colic training data to a binary feature file and streams it back in chunks of 50 rows
+    convert_tsv_to_binary("./horse_colic_training01.txt", "./horse_colic_training01.lrfb")
+    for path in ("./horse_colic_training01.txt", "./horse_colic_training01.lrfb"):
+        chunks = list_feature_chunks(path, 50)
+        print("{}: {} CHUNKS WITH {} ROWS\n".format(path, len(chunks), sum(len(labels) for _, labels in iterate_feature_chunks(path, chunks))))
+    os.remove("./horse_colic_training01.lrfb")
+
+    # Track ending time of program and determine overall program runtime
+    delta = (t() - TIME_I) * 1000
+    print("Real program runtime is {0:.4g} milliseconds.\n".format(delta))
+    return
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+NAME:               imputation_pipeline.py (data_projects/machine_learning_in_action/algo_ch05/)
+
+DESCRIPTION:        Python vectorized preprocessing of feature files with missing values.
+
+                    The horse colic datasets mark missing measurements with 0. The pipeline
+                    parses a tab-separated file in one call, marks the missing entries, fills
+                    them with the per-column mean or median of the observed training values,
+                    and standardizes every column. Parameters are fitted on the training set
+                    only and then applied unchanged to the test set. Preprocessed arrays are
+                    cached on disk, keyed by the input files and options, so repeated
+                    experiments skip parsing and imputation altogether.
+
+NOTE:               Original source code is in Python 2, but my code is in Python 3.
+
+CREDIT:             Machine Learning In Action (Peter Harrington)
+"""
+
+
+# ====================================================================================
+# ================================ IMPORT STATEMENTS =================================
+# ====================================================================================
+
+
+import os                                   # Library for basic operating system mechanics
+import hashlib                              # Library for hashing input files and options into cache filenames
+import numpy as np                          # Library for simple linear mathematical operations
+from time import time as t                  # Package for tracking modular and program runtime
+
+
+# ====================================================================================
+# ============================== INITIALIZING CONSTANTS ==============================
+# ====================================================================================
+
+
+CACHE_DIRECTORY = ".pipeline_cache"         # Default directory for cached preprocessed arrays
+MISSING_VALUE = 0.0                         # Placeholder used for missing measurements in the horse colic files
+
+
+# ====================================================================================
+# ================== HELPER FUNCTIONS FOR PREPROCESSING FEATURE DATA =================
+# ====================================================================================
+
+
+# ============= FUNCTION TO PARSE TAB-SEPARATED FEATURE FILE INTO ARRAYS =============
+def parse_feature_file(FILENAME):
+    # One call parses every field; the last column is the class label
+    data = np.loadtxt(FILENAME, delimiter = "\t", ndmin = 2)
+    return np.ascontiguousarray(data[:, :-1]), np.ascontiguousarray(data[:, -1])
+
+# ============= FUNCTION TO FIT IMPUTATION AND STANDARDIZATION PARAMETERS ============
+def fit_imputation_pipeline(dataset, strategy = "mean", standardize = True, missing_value = MISSING_VALUE):
+    # Missing entries become NaN so that column statistics skip them
+    observed_dataset = np.where(dataset == missing_value, np.nan, dataset)
+
+    if strategy == "mean":
+        fill_values = np.nanmean(observed_dataset, axis = 0)
+    elif strategy == "median":
+        fill_values = np.nanmedian(observed_dataset, axis = 0)
+    else:
+        # Raises error if strategy is neither mean nor median
+        raise NameError("\nIMPUTATION STRATEGY NOT RECOGNIZED: {}\n".format(strategy))
+
+    # Columns with no observed values at all are filled with the missing value itself
+    fill_values = np.where(np.isnan(fill_values), missing_value, fill_values)
+    imputed_dataset = np.where(np.isnan(observed_dataset), fill_values, observed_dataset)
+
+    # Constant columns keep a scale of one so standardizing never divides by zero
+    means = imputed_dataset.mean(axis = 0) if standardize else np.zeros(dataset.shape[1])
+    scales = imputed_dataset.std(axis = 0) if standardize else np.ones(dataset.shape[1])
+    scales[scales == 0] = 1.0
+
+    pipeline = {"missing_value": np.array(missing_value),
+                "fill_values": fill_values,
+                "means": means,
+                "scales": scales}
+    return pipeline
+
+# =================== FUNCTION TO APPLY FITTED PIPELINE TO DATASET ===================
+def apply_imputation_pipeline(dataset, pipeline):
+    # Imputation and standardization are two whole-array operations
+    imputed_dataset = np.where(dataset == pipeline["missing_value"], pipeline["fill_values"], dataset)
+    return (imputed_dataset - pipeline["means"]) / pipeline["scales"]
+
+# ================ FUNCTION TO LOCATE CACHE FILE OF PREPROCESSED DATA ================
+def get_cache_path(filenames, options, cache_directory = CACHE_DIRECTORY):
+    # Any change to an input file (modification time or size) or to the options yields a new cache file
+    key = []
+    for FILENAME in filenames:
+        status = os.stat(FILENAME)
+        key.append("{}:{}:{}".format(os.path.abspath(FILENAME), status.st_mtime_ns, status.st_size))
+    key.append(repr(sorted(options.items())))
+    return os.path.join(cache_directory, hashlib.sha1("|".join(key).encode("utf-8")).hexdigest() + ".npz")
+
+# =============== FUNCTION TO LOAD PREPROCESSED TRAINING AND TEST DATA ===============
+def load_preprocessed_data(training_file, test_file, strategy = "mean", standardize = True, missing_value = MISSING_VALUE, cache_directory = CACHE_DIRECTORY):
+    cache_path = get_cache_path((training_file, test_file), {"strategy": strategy, "standardize": standardize, "missing_value": missing_value}, cache_directory)
+
+    # Cached arrays are returned as they are, skipping parsing and imputation
+    if os.path.isfile(cache_path):
+        with np.load(cache_path) as cached:
+            pipeline = dict((name[len("pipeline_"):], cached[name]) for name in cached.files if name.startswith("pipeline_"))
+            return cached["training_set"], cached["training_labels"], cached["test_set"], cached["test_labels"], pipeline
+
+    # Parameters are fitted on the training set alone and then applied to both sets
+    training_set, training_labels = parse_feature_file(training_file)
+    test_set, test_labels = parse_feature_file(test_file)
+    pipeline = fit_imputation_pipeline(training_set, strategy, standardize, missing_value)
+    training_set = apply_imputation_pipeline(training_set, pipeline)
+    test_set = apply_imputation_pipeline(test_set, pipeline)
+
+    # Writes to a temporary file first so that an interrupted run never leaves a partial cache
+    os.makedirs(cache_directory, exist_ok = True)
+    temporary_path = "{}.{}.tmp".format(cache_path, os.getpid())
+    with open(temporary_path, "wb") as f:
+        np.savez(f, training_set = training_set, training_labels = training_labels, test_set = test_set, test_labels = test_labels,
+                 **dict(("pipeline_" + name, value) for name, value in pipeline.items()))
+    os.replace(temporary_path, cache_path)
+
+    return training_set, training_labels, test_set, test_labels, pipeline
+
+
+# ====================================================================================
+# ================================ MAIN RUN FUNCTION =================================
+# ====================================================================================
+
+
+def main(TRAINING_FILENAME = "./horse_colic_training01.txt", TEST_FILENAME = "./horse_colic_test01.txt"):
+    # Preprocess the horse colic data twice; the second call is served from the cache
+    for _ in range(2):
+        TIME_I = t()
+        training_set, training_labels, test_set, test_labels, pipeline = load_preprocessed_data(TRAINING_FILENAME, TEST_FILENAME, strategy = "median")
+        print("PREPROCESSED {} TRAINING AND {} TEST ROWS IN {:.4g} MILLISECONDS\n".format(len(training_labels), len(test_labels), (t() - TIME_I) * 1000))
+
+    """ print("FILL VALUES ARE: \n{}\n".format(pipeline["fill_values"])) """
+    return
+
+if __name__ == "__main__":
+    main()
@@ -30,11 +30,44 @@ CREDIT:             Machine Learning In Action (Peter Harrington)
 # ====================================================================================
 
 
+import os                                   # Library for basic operating system mechanics
 import numpy as np                          # Library for simple linear mathematical operations
+import feature_stream as fs                 # Modular program for chunked reading of large feature files
+import imputation_pipeline as imp           # Modular program for cached imputation and standardization of feature files
+import scipy.sparse as sp                   # Module for compressed sparse row (CSR) matrices
 import matplotlib.pyplot as plt             # Module for MATLAB-like data visualization capability
+from scipy.optimize import minimize         # Package for quasi-Newton (L-BFGS) minimization
+from concurrent.futures import ThreadPoolExecutor   # Package for scoring chunks on several cores (NumPy releases the GIL)
+from multiprocessing import Pool            # Package for spreading work across worker processes
 from time import time as t                  # Package for tracking modular and program runtime
 
 
+# ====================================================================================
+# ============================== INITIALIZING CONSTANTS ==============================
+# ====================================================================================
+
+
+OPTIMIZERS = ("sgd", "momentum", "adam")    # Update rules available to the mini-batch optimizer
+SHARED_HORSE_DATA = dict()                  # Read-only horse colic arrays held by each worker process
+
+
+# ====================================================================================
+# ==================== HELPER FUNCTIONS FOR PARALLEL HORSE TRIALS ====================
+# ====================================================================================
+
+
+# ================ FUNCTION TO SHARE HORSE ARRAYS WITH WORKER PROCESS ================
+def share_horse_data(training_set, training_labels, test_set, test_labels):
+    # Runs once per worker; forked workers inherit the parent's arrays without copying them
+    SHARED_HORSE_DATA.update(training_set = training_set, training_labels = training_labels, test_set = test_set, test_labels = test_labels)
+    return
+
+# =============== FUNCTION TO RUN SEEDED HORSE TRIAL IN WORKER PROCESS ===============
+def run_shared_horse_trial(seed):
+    logRegres = Logistic_Regression_Optimization_Algorithm(t())
+    return logRegres.run_horse_trial(SHARED_HORSE_DATA["training_set"], SHARED_HORSE_DATA["training_labels"], SHARED_HORSE_DATA["test_set"], SHARED_HORSE_DATA["test_labels"], seed)
+
+
 # ====================================================================================
 # ================================= CLASS DEFINITION =================================
 # ====================================================================================
@@ -45,6 +78,7 @@ class Logistic_Regression_Optimization_Algorithm(object):
     # ======================== CLASS INITIALIZERS/DECLARATIONS =======================
     def __init__(self, TIME_I):
         self.TIME_I = TIME_I                # Initial time measure for runtime tracker
+        self.convergence_report = None      # Iterations, runtime, and loss history of the most recent optimizer run
 
     # ======================== METHOD TO LOAD DATASET FROM FILE ======================
     def load_dataset(self):
@@ -72,14 +106,260 @@ class Logistic_Regression_Optimization_Algorithm(object):
         """ print("SIGMOID DISTRIBUTION VALUE IS: \n{}\n".format(sig)) """
         return sig
 
+    # ============= METHOD TO CALCULATE NUMERICALLY STABLE SIGMOID VALUES ============
+    def stable_sigmoid_distribution(self, x):
+        # Evaluates 1 / (1 + exp(-x)) as exp(-log(1 + exp(-x))), which never overflows for large |x|
+        sig = np.exp(-np.logaddexp(0, -x))
+
+        """ print("STABLE SIGMOID DISTRIBUTION VALUE IS: \n{}\n".format(sig)) """
+        return sig
+
+    # ============ METHOD TO CALCULATE MEAN LOG-LOSS OF REGRESSION WEIGHTS ===========
+    def calculate_log_loss(self, dataset, labels, regr_weights, L2_PENALTY = 0.0):
+        z = dataset @ regr_weights
+
+        # Log-loss written in terms of z avoids taking the log of a sigmoid that has rounded to 0 or 1
+        return np.mean(np.logaddexp(0, z) - labels * z) + 0.5 * L2_PENALTY * np.dot(regr_weights, regr_weights)
+
+    # ========== METHOD TO CALCULATE LOG-LOSS GRADIENT OF REGRESSION WEIGHTS =========
+    def calculate_log_loss_gradient(self, dataset, labels, regr_weights, L2_PENALTY = 0.0):
+        # Same direction as the gradient ascent updates above, with the sign flipped for descent
+        error = self.stable_sigmoid_distribution(dataset @ regr_weights) - labels
+        return dataset.T @ error / len(labels) + L2_PENALTY * regr_weights
+
+    # ============== METHOD TO APPLY SINGLE OPTIMIZER UPDATE TO WEIGHTS ==============
+    def apply_optimizer_step(self, regr_weights, gradient, optimizer_state, ALPHA, optimizer = "sgd", BETA1 = 0.9, BETA2 = 0.999, EPSILON = 1e-8):
+        # Updates weights in place; momentum and Adam keep their running averages in optimizer_state
+        if optimizer == "sgd":
+            regr_weights -= ALPHA * gradient
+        elif optimizer == "momentum":
+            velocity = optimizer_state.setdefault("velocity", np.zeros_like(regr_weights))
+            velocity *= BETA1
+            velocity += gradient
+            regr_weights -= ALPHA * velocity
+        elif optimizer == "adam":
+            first_moment = optimizer_state.setdefault("first_moment", np.zeros_like(regr_weights))
+            second_moment = optimizer_state.setdefault("second_moment", np.zeros_like(regr_weights))
+            optimizer_state["step"] = optimizer_state.get("step", 0) + 1
+            first_moment += (1 - BETA1) * (gradient - first_moment)
+            second_moment += (1 - BETA2) * (gradient * gradient - second_moment)
+
+            # Bias correction folded into the step size
+            step_size = ALPHA * np.sqrt(1 - BETA2 ** optimizer_state["step"]) / (1 - BETA1 ** optimizer_state["step"])
+            regr_weights -= step_size * first_moment / (np.sqrt(second_moment) + EPSILON)
+        else:
+            # Raises error if optimizer is not one of OPTIMIZERS
+            raise NameError("\nOPTIMIZER NOT RECOGNIZED: {}\n".format(optimizer))
+        return regr_weights
+
+    # ============ METHOD TO BUILD STARTING WEIGHTS FOR COLD OR WARM START ===========
+    def initialize_weights(self, initial_weights, shape, dtype = np.float64, fill_value = 1.0):
+        if initial_weights is None:
+            return np.full(shape, fill_value, dtype = dtype)
+
+        # Warm starts copy the given weights, so the optimizers' in-place updates never touch the caller's array
+        regr_weights = np.array(initial_weights, dtype = dtype)
+        if regr_weights.size != np.prod(shape):
+            raise ValueError("Initial weights have {} values but the optimizer needs {}".format(regr_weights.size, np.prod(shape)))
+        return regr_weights.reshape(shape)
+
+    # ============== METHOD TO STORE TRAINING CHECKPOINT TO COMPACT FILE =============
+    def store_checkpoint(self, CHECKPOINT_FILE, regr_weights, optimizer_state, epoch, random_state, loss_history, optimizer, ALPHA = None):
+        # Mersenne Twister state is stored field by field so the restored stream continues exactly where it stopped
+        _, rng_keys, rng_position, rng_has_gauss, rng_cached_gaussian = random_state.get_state()
+        os.makedirs(os.path.dirname(CHECKPOINT_FILE) or ".", exist_ok = True)
+
+        # Update rule and step size are recorded so that a resumed run cannot silently switch to different ones
+        settings = {"optimizer": np.array(optimizer)}
+        if ALPHA is not None:
+            settings["alpha"] = np.array(ALPHA, dtype = np.float64)
+
+        # Writes to a temporary file first so that an interruption mid-write never corrupts the previous checkpoint
+        temporary_path = "{}.{}.tmp".format(CHECKPOINT_FILE, os.getpid())
+        with open(temporary_path, "wb") as f:
+            np.savez(f, regr_weights = regr_weights, epoch = np.array(epoch), loss_history = np.array(loss_history),
+                     rng_keys = rng_keys, rng_position = np.array(rng_position), rng_has_gauss = np.array(rng_has_gauss), rng_cached_gaussian = np.array(rng_cached_gaussian),
+                     **settings, **dict(("optimizer_" + name, np.asarray(value)) for name, value in optimizer_state.items()))
+        os.replace(temporary_path, CHECKPOINT_FILE)
+        return
+
+    # ================ METHOD TO RESTORE TRAINING CHECKPOINT FROM FILE ===============
+    def load_checkpoint(self, CHECKPOINT_FILE, regr_weights = None, optimizer = None, ALPHA = None):
+        with np.load(CHECKPOINT_FILE) as checkpoint:
+            # Resuming with another update rule or step size would mix two different runs
+            stored_optimizer = str(checkpoint["optimizer"]) if "optimizer" in checkpoint.files else None
+            stored_alpha = float(checkpoint["alpha"]) if "alpha" in checkpoint.files else None
+            if optimizer is not None and stored_optimizer != optimizer:
+                raise ValueError("Checkpoint was written by optimizer {} but the run uses {}".format(stored_optimizer, optimizer))
+            if ALPHA is not None and stored_alpha != float(ALPHA):
+                raise ValueError("Checkpoint was written with step size {} but the run uses {}".format(stored_alpha, ALPHA))
+
+            random_state = np.random.RandomState()
+            random_state.set_state(("MT19937", checkpoint["rng_keys"], int(checkpoint["rng_position"]), int(checkpoint["rng_has_gauss"]), float(checkpoint["rng_cached_gaussian"])))
+            optimizer_state = dict((name[len("optimizer_"):], checkpoint[name]) for name in checkpoint.files if name.startswith("optimizer_"))
+            if "step" in optimizer_state:
+                optimizer_state["step"] = int(optimizer_state["step"])
+
+            # Restored weights are copied into the optimizer's own array when one is given
+            stored_weights = checkpoint["regr_weights"]
+            if regr_weights is not None:
+                if stored_weights.shape != regr_weights.shape:
+                    raise ValueError("Checkpoint weights have shape {} but the optimizer needs {}".format(stored_weights.shape, regr_weights.shape))
+                regr_weights[...] = stored_weights
+                stored_weights = regr_weights
+
+            return {"regr_weights": stored_weights,
+                    "optimizer_state": optimizer_state,
+                    "epoch": int(checkpoint["epoch"]),
+                    "random_state": random_state,
+                    "loss_history": checkpoint["loss_history"].tolist()}
+
+    # ============= METHOD TO RUN MINI-BATCH EPOCHS UNTIL LOSS CONVERGES =============
+    def run_mini_batch_optimization(self, dataset, labels, regr_weights, gradient_function, loss_function, BATCH_SIZE = 32, NUM_ITER = 100, ALPHA = 0.1, optimizer = "sgd", TOLERANCE = 1e-6, seed = None, CHECKPOINT_FILE = None, CHECKPOINT_INTERVAL = 1, resume = False):
+        NUM_ROWS = dataset.shape[0]
+        random_state = np.random.RandomState(seed)
+        optimizer_state = dict()
+        loss_history = [loss_function(dataset, labels, regr_weights)]
+        first_epoch = 0
+        converged = False
+        TIME_I = t()
+
+        # Resumed runs pick up the weights, optimizer averages, epoch, and random stream of the last checkpoint
+        if resume and CHECKPOINT_FILE is not None and os.path.isfile(CHECKPOINT_FILE):
+            checkpoint = self.load_checkpoint(CHECKPOINT_FILE, regr_weights, optimizer, ALPHA)
+            optimizer_state, first_epoch, random_state, loss_history = checkpoint["optimizer_state"], checkpoint["epoch"], checkpoint["random_state"], checkpoint["loss_history"]
+
+        # Every epoch shuffles once and then slices contiguous mini-batches out of the permutation
+        for epoch in range(first_epoch, NUM_ITER):
+            data_index = random_state.permutation(NUM_ROWS)
+
+            for start in range(0, NUM_ROWS, BATCH_SIZE):
+                batch_index = data_index[start:start + BATCH_SIZE]
+                gradient = gradient_function(dataset[batch_index], labels[batch_index], regr_weights)
+                self.apply_optimizer_step(regr_weights, gradient, optimizer_state, ALPHA, optimizer)
+
+            # Stops early once a full epoch no longer changes the training loss by more than the tolerance
+            loss_history.append(loss_function(dataset, labels, regr_weights))
+            converged = abs(loss_history[-2] - loss_history[-1]) < TOLERANCE
+
+            # Checkpoints every CHECKPOINT_INTERVAL epochs and always on the final one
+            if CHECKPOINT_FILE is not None and (converged or epoch + 1 == NUM_ITER or (epoch + 1) % CHECKPOINT_INTERVAL == 0):
+                self.store_checkpoint(CHECKPOINT_FILE, regr_weights, optimizer_state, epoch + 1, random_state, loss_history, optimizer, ALPHA)
+            if converged:
+                break
+
+        self.convergence_report = {"iterations": len(loss_history) - 1,
+                                   "runtime": t() - TIME_I,
+                                   "loss": loss_history[-1],
+                                   "converged": converged,
+                                   "loss_history": np.array(loss_history)}
+
+        """ print("OPTIMIZER STOPPED AFTER {} EPOCHS WITH LOSS {:.6g} (CONVERGED: {})\n".format(len(loss_history) - 1, loss_history[-1], converged)) """
+        return regr_weights
+
+    # ============= METHOD TO APPLY SPARSE SGD UPDATE WITH LAZY L2 DECAY =============
+    def apply_lazy_sparse_step(self, scaled_weights, weight_scale, column_indices, gradient_values, STEP_SIZE, L2_PENALTY = 0.0):
+        # A decay factor of zero or below would divide by zero or flip the sign of every weight
+        if STEP_SIZE * L2_PENALTY >= 1:
+            raise ValueError("Step size {} times L2 penalty {} must be below 1".format(STEP_SIZE, L2_PENALTY))
+
+        # Weights are stored as weight_scale * scaled_weights: L2 decay of every weight is one scalar multiply
+        weight_scale *= 1 - STEP_SIZE * L2_PENALTY
+
+        # Only the columns present in the sample(s) are touched (repeated columns are accumulated)
+        np.add.at(scaled_weights, column_indices, -STEP_SIZE * gradient_values / weight_scale)
+
+        # Folds a vanishing scale back into the stored weights before it underflows
+        if weight_scale < 1e-9:
+            scaled_weights *= weight_scale
+            weight_scale = 1.0
+        return weight_scale
+
+    # ============ METHOD TO RUN SPARSE SGD MINI-BATCH EPOCHS WITH LAZY L2 ===========
+    def run_sparse_sgd_optimization(self, dataset, labels, regr_weights, BATCH_SIZE = 32, NUM_ITER = 100, ALPHA = 0.1, TOLERANCE = 1e-6, L2_PENALTY = 0.0, seed = None, CHECKPOINT_FILE = None, CHECKPOINT_INTERVAL = 1, resume = False):
+        NUM_ROWS = dataset.shape[0]
+        random_state = np.random.RandomState(seed)
+        weight_scale = 1.0
+        loss_history = [self.calculate_log_loss(dataset, labels, regr_weights, L2_PENALTY)]
+        first_epoch = 0
+        converged = False
+        TIME_I = t()
+
+        if resume and CHECKPOINT_FILE is not None and os.path.isfile(CHECKPOINT_FILE):
+            checkpoint = self.load_checkpoint(CHECKPOINT_FILE, regr_weights, "sgd", ALPHA)
+            first_epoch, random_state, loss_history = checkpoint["epoch"], checkpoint["random_state"], checkpoint["loss_history"]
+
+        # Same epochs as run_mini_batch_optimization(), but each step costs time proportional to the batch's non-zeros
+        for epoch in range(first_epoch, NUM_ITER):
+            data_index = random_state.permutation(NUM_ROWS)
+
+            for start in range(0, NUM_ROWS, BATCH_SIZE):
+                batch = dataset[data_index[start:start + BATCH_SIZE]]
+                error = self.stable_sigmoid_distribution(weight_scale * (batch @ regr_weights)) - labels[data_index[start:start + BATCH_SIZE]]
+                gradient_values = batch.data * np.repeat(error, np.diff(batch.indptr)) / batch.shape[0]
+                weight_scale = self.apply_lazy_sparse_step(regr_weights, weight_scale, batch.indices, gradient_values, ALPHA, L2_PENALTY)
+
+            loss_history.append(self.calculate_log_loss(dataset, labels, weight_scale * regr_weights, L2_PENALTY))
+            converged = abs(loss_history[-2] - loss_history[-1]) < TOLERANCE
+
+            # The shared multiplier is folded into the weights before checkpointing, so a checkpoint holds plain weights
+            if CHECKPOINT_FILE is not None and (converged or epoch + 1 == NUM_ITER or (epoch + 1) % CHECKPOINT_INTERVAL == 0):
+                regr_weights *= weight_scale
+                weight_scale = 1.0
+                self.store_checkpoint(CHECKPOINT_FILE, regr_weights, dict(), epoch + 1, random_state, loss_history, "sgd", ALPHA)
+            if converged:
+                break
+
+        self.convergence_report = {"iterations": len(loss_history) - 1,
+                                   "runtime": t() - TIME_I,
+                                   "loss": loss_history[-1],
+                                   "converged": converged,
+                                   "loss_history": np.array(loss_history)}
+
+        regr_weights *= weight_scale
+        return regr_weights
+
+    # ============= METHOD TO CALCULATE SOFTMAX PROBABILITIES FROM SCORES ============
+    def softmax_distribution(self, scores):
+        # Subtracting each row's maximum keeps exp() from overflowing without changing the result
+        exp_scores = np.exp(scores - np.max(scores, axis = 1, keepdims = True))
+        return exp_scores / np.sum(exp_scores, axis = 1, keepdims = True)
+
+    # ===================== METHOD TO ONE-HOT ENCODE CLASS LABELS ====================
+    def one_hot_encode_labels(self, class_labels, dtype = np.float64):
+        classes, class_ids = np.unique(np.asarray(class_labels), return_inverse = True)
+        one_hot_labels = np.zeros((len(class_ids), len(classes)), dtype = dtype)
+        one_hot_labels[np.arange(len(class_ids)), class_ids] = 1
+        return classes, one_hot_labels
+
+    # =========== METHOD TO CALCULATE MEAN CROSS-ENTROPY OF SOFTMAX WEIGHTS ==========
+    def calculate_softmax_loss(self, dataset, one_hot_labels, regr_weights, L2_PENALTY = 0.0):
+        scores = dataset @ regr_weights
+        maximum_scores = np.max(scores, axis = 1, keepdims = True)
+
+        # Log-sum-exp minus the score of the true class, shifted by the row maximum for stability
+        log_normalizers = np.log(np.sum(np.exp(scores - maximum_scores), axis = 1)) + maximum_scores[:, 0]
+        return np.mean(log_normalizers - np.sum(one_hot_labels * scores, axis = 1)) + 0.5 * L2_PENALTY * np.sum(regr_weights * regr_weights)
+
+    # ========= METHOD TO CALCULATE CROSS-ENTROPY GRADIENT OF SOFTMAX WEIGHTS ========
+    def calculate_softmax_gradient(self, dataset, one_hot_labels, regr_weights, L2_PENALTY = 0.0):
+        # One product gives the gradient of every class column at once
+        error = self.softmax_distribution(dataset @ regr_weights) - one_hot_labels
+        return dataset.T @ error / len(one_hot_labels) + L2_PENALTY * regr_weights
+
     # ==================== METHOD TO MAXIMIZE REGRESSION WEIGHTS =====================
     # ============= USING GRADIENT ASCENT OPTIMIZATION (BATCH PROCESSING) ============
-    def batch_processing_gradient_ascent_optimization(self, input_dataset, class_labels, NUM_ITER = 500):
-        dataset = np.mat(input_dataset)                 # Input dataset is array of features (columns) and training samples (rows)
-        labels = np.mat(class_labels).transpose()       # Class label vector is linear transposition of input dataset
+    def batch_processing_gradient_ascent_optimization(self, input_dataset, class_labels, NUM_ITER = 500, initial_weights = None):
+        # Sparse inputs stay in CSR form; their * products below cost time proportional to the non-zeros
+        if sp.issparse(input_dataset):
+            dataset = sp.csr_matrix(input_dataset, dtype = np.float64)
+            labels = np.asarray(class_labels, dtype = np.float64).reshape(-1, 1)
+        else:
+            dataset = np.asmatrix(input_dataset)            # Input dataset is array of features (columns) and training samples (rows)
+            labels = np.asmatrix(class_labels).transpose()  # Class label vector is linear transposition of input dataset
         NUM_ROWS, NUM_COLS = np.shape(dataset)
         ALPHA = 0.001
-        regr_weights = np.ones((NUM_COLS, 1))            # Creates array of regression weights with same size as dataset columns
+        regr_weights = self.initialize_weights(initial_weights, (NUM_COLS, 1))   # Creates array of regression weights with same size as dataset columns
 
         """ print("\nTESTING BATCH PROCESSING GRADIENT ASCENT OPTIMIZER FOR {} ITERATIONS...".format(NUM_ITER)) """
 
@@ -102,18 +382,30 @@ class Logistic_Regression_Optimization_Algorithm(object):
 
     # ================= SIMPLE METHOD TO MAXIMIZE REGRESSION WEIGHTS =================
     # ================ USING GRADIENT ASCENT OPTIMIZATION (STOCHASTIC) ===============
-    def simple_stochastic_gradient_ascent_optimization(self, input_dataset, class_labels):
+    def simple_stochastic_gradient_ascent_optimization(self, input_dataset, class_labels, initial_weights = None):
         NUM_ROWS, NUM_COLS = np.shape(input_dataset)
         ALPHA = 0.01
-        regr_weights = np.ones(NUM_COLS)                # Creates array of regression weights with same size as dataset columns
+        regr_weights = self.initialize_weights(initial_weights, NUM_COLS)     # Creates array of regression weights with same size as dataset columns
 
         """ print("\nTESTING SIMPLE STOCHASTIC GRADIENT ASCENT OPTIMIZER FOR ONE (1) ITERATION...") """
 
-        # Iterates over sigmoid distribution to optimize training data regression weights
-        for iterator in range(NUM_ROWS):
-            sig = self.sigmoid_distribution(sum(input_dataset[iterator] * regr_weights))
-            error = class_labels[iterator] - sig
-            regr_weights += ALPHA * error * input_dataset[iterator]
+        # Sparse rows are read straight from the CSR arrays and update only their own columns
+        if sp.issparse(input_dataset):
+            dataset = sp.csr_matrix(input_dataset, dtype = np.float64)
+            dataset.sum_duplicates()
+            for iterator in range(NUM_ROWS):
+                row_slice = slice(dataset.indptr[iterator], dataset.indptr[iterator + 1])
+                column_indices = dataset.indices[row_slice]
+                row_values = dataset.data[row_slice]
+                sig = self.stable_sigmoid_distribution(np.dot(row_values, regr_weights[column_indices]))
+                error = class_labels[iterator] - sig
+                regr_weights[column_indices] += ALPHA * error * row_values
+        else:
+            # Iterates over sigmoid distribution to optimize training data regression weights
+            for iterator in range(NUM_ROWS):
+                sig = self.sigmoid_distribution(sum(input_dataset[iterator] * regr_weights))
+                error = class_labels[iterator] - sig
+                regr_weights += ALPHA * error * input_dataset[iterator]
 
         """
         # Runs runtime tracker for particular method
@@ -128,24 +420,71 @@ class Logistic_Regression_Optimization_Algorithm(object):
 
     # ================ ADVANCED METHOD TO MAXIMIZE REGRESSION WEIGHTS ================
     # ================ USING GRADIENT ASCENT OPTIMIZATION (STOCHASTIC) ===============
-    def advanced_stochastic_gradient_ascent_optimization(self, input_dataset, class_labels, NUM_ITER = 150):
-        NUM_ROWS, NUM_COLS = np.shape(input_dataset)
-        regr_weights = np.ones(NUM_COLS)                # Creates array of regression weights with same size as dataset columns
+    def advanced_stochastic_gradient_ascent_optimization(self, input_dataset, class_labels, NUM_ITER = 150, without_replacement = True, seed = None, L2_PENALTY = 0.0, initial_weights = None, CHECKPOINT_FILE = None, CHECKPOINT_INTERVAL = 1, resume = False):
+        is_sparse = sp.issparse(input_dataset)
+        dataset = sp.csr_matrix(input_dataset, dtype = np.float64) if is_sparse else np.asarray(input_dataset, dtype = np.float64)
+        labels = np.asarray(class_labels, dtype = np.float64)
+        NUM_ROWS, NUM_COLS = dataset.shape
+        regr_weights = self.initialize_weights(initial_weights, NUM_COLS)     # Creates array of regression weights with same size as dataset columns
+        random_state = np.random.RandomState(seed)      # Seeded random stream so that runs can be reproduced
+        step_offsets = np.arange(NUM_ROWS)
+        weight_scale = 1.0                              # Shared multiplier of the weights (sparse inputs only)
+        first_epoch = 0
+
+        # Resumed runs continue from the checkpointed epoch, so the decaying learning rates line up with an uninterrupted run
+        if resume and CHECKPOINT_FILE is not None and os.path.isfile(CHECKPOINT_FILE):
+            checkpoint = self.load_checkpoint(CHECKPOINT_FILE, regr_weights, "stochastic_ascent")
+            first_epoch, random_state = checkpoint["epoch"], checkpoint["random_state"]
 
         """ print("\nTESTING ADVANCED STOCHASTIC GRADIENT ASCENT OPTIMIZER FOR {} ITERATIONS...".format(NUM_ITER)) """
 
         # Iterates over inputted number of iterations to maximize stochastic gradient optimizer
-        for iterator_outer in range(NUM_ITER):
-            data_index = range(NUM_ROWS)
+        for iterator_outer in range(first_epoch, NUM_ITER):
+            # Checkpoints the previous epoch's weights every CHECKPOINT_INTERVAL epochs (sparse multiplier folded in first)
+            if CHECKPOINT_FILE is not None and iterator_outer > first_epoch and iterator_outer % CHECKPOINT_INTERVAL == 0:
+                regr_weights *= weight_scale
+                weight_scale = 1.0
+                self.store_checkpoint(CHECKPOINT_FILE, regr_weights, dict(), iterator_outer, random_state, [], "stochastic_ascent")
+
+            # Visits every sample exactly once per epoch in a fresh random order (or draws uniformly with replacement)
+            if without_replacement:
+                data_index = random_state.permutation(NUM_ROWS)
+            else:
+                data_index = random_state.randint(0, NUM_ROWS, size = NUM_ROWS)
+
+            # Learning rates of the whole epoch decay with the epoch and the step number, computed at once
+            ALPHAS = 4 / (1.0 + iterator_outer + step_offsets) + 0.01
+
+            # The epoch's first (largest) step must keep the L2 decay factor 1 - ALPHA * L2_PENALTY positive
+            if ALPHAS[0] * L2_PENALTY >= 1:
+                raise ValueError("Step size {} times L2 penalty {} must be below 1".format(ALPHAS[0], L2_PENALTY))
+
+            # Sparse rows are read straight from the CSR arrays and update only their own columns (L2 applied lazily)
+            if is_sparse:
+                for ALPHA, random_index in zip(ALPHAS, data_index):
+                    row_slice = slice(dataset.indptr[random_index], dataset.indptr[random_index + 1])
+                    column_indices = dataset.indices[row_slice]
+                    row_values = dataset.data[row_slice]
+                    sig = self.stable_sigmoid_distribution(weight_scale * np.dot(row_values, regr_weights[column_indices]))
+                    error = labels[random_index] - sig
+                    weight_scale = self.apply_lazy_sparse_step(regr_weights, weight_scale, column_indices, -error * row_values, ALPHA, L2_PENALTY)
+                continue
 
             # Iterates over sigmoid distribution to optimize training data regression weights
-            for iterator_inner in range(NUM_ROWS):
-                ALPHA = 4 / (1.0 + iterator_outer + iterator_inner) + 0.01
-                random_index = int(np.random.uniform(0, len(data_index)))
-                sig = self.sigmoid_distribution(sum(input_dataset[random_index] * regr_weights))
-                error = class_labels[random_index] - sig
-                regr_weights += ALPHA * error * input_dataset[random_index]
-                del(list(input_dataset)[random_index])
+            for ALPHA, random_index in zip(ALPHAS, data_index):
+                sig = self.sigmoid_distribution(np.dot(dataset[random_index], regr_weights))
+                error = labels[random_index] - sig
+                if L2_PENALTY:
+                    regr_weights *= 1 - ALPHA * L2_PENALTY
+                regr_weights += ALPHA * error * dataset[random_index]
+
+        # Sparse weights were kept as weight_scale * regr_weights
+        if is_sparse:
+            regr_weights *= weight_scale
+
+        # Final epoch is always checkpointed, so a later call with a larger NUM_ITER can extend the run
+        if CHECKPOINT_FILE is not None and NUM_ITER > first_epoch:
+            self.store_checkpoint(CHECKPOINT_FILE, regr_weights, dict(), NUM_ITER, random_state, [], "stochastic_ascent")
 
         """
         # Runs runtime tracker for particular method
@@ -158,6 +497,199 @@ class Logistic_Regression_Optimization_Algorithm(object):
         """
         return regr_weights
 
+    # =============== METHOD TO MINIMIZE LOG-LOSS OF REGRESSION WEIGHTS ==============
+    # ========== USING MINI-BATCH GRADIENT DESCENT (SGD, MOMENTUM, OR ADAM) ==========
+    def mini_batch_gradient_descent_optimization(self, input_dataset, class_labels, BATCH_SIZE = 32, NUM_ITER = 100, ALPHA = 0.1, optimizer = "sgd", TOLERANCE = 1e-6, L2_PENALTY = 0.0, dtype = np.float64, seed = None, initial_weights = None, CHECKPOINT_FILE = None, CHECKPOINT_INTERVAL = 1, resume = False):
+        # CSR rows make mini-batch gathers cheap for sparse inputs, as contiguous rows do for dense ones
+        if sp.issparse(input_dataset):
+            dataset = sp.csr_matrix(input_dataset, dtype = dtype)
+        else:
+            dataset = np.ascontiguousarray(input_dataset, dtype = dtype)
+        labels = np.ascontiguousarray(class_labels, dtype = dtype)
+        regr_weights = self.initialize_weights(initial_weights, dataset.shape[1], dtype)   # Same starting point as the gradient ascent optimizers unless warm-started
+
+        """ print("\nTESTING MINI-BATCH GRADIENT DESCENT OPTIMIZER ({}) FOR UP TO {} EPOCHS...".format(optimizer.upper(), NUM_ITER)) """
+
+        # Plain SGD on sparse inputs touches only non-zero columns; momentum and Adam keep dense per-weight state
+        if sp.issparse(dataset) and optimizer == "sgd":
+            regr_weights = self.run_sparse_sgd_optimization(dataset, labels, regr_weights, BATCH_SIZE, NUM_ITER, ALPHA, TOLERANCE, L2_PENALTY, seed, CHECKPOINT_FILE, CHECKPOINT_INTERVAL, resume)
+        else:
+            loss_function = lambda data, labels, weights: self.calculate_log_loss(data, labels, weights, L2_PENALTY)
+            gradient_function = lambda data, labels, weights: self.calculate_log_loss_gradient(data, labels, weights, L2_PENALTY)
+            regr_weights = self.run_mini_batch_optimization(dataset, labels, regr_weights, gradient_function, loss_function, BATCH_SIZE, NUM_ITER, ALPHA, optimizer, TOLERANCE, seed, CHECKPOINT_FILE, CHECKPOINT_INTERVAL, resume)
+
+        """
+        # Runs runtime tracker for particular method
+        self.track_runtime()
+        """
+
+        """ print("\nRELATIVE REGRESSION WEIGHTS FROM OPTIMIZATION ARE: \n{}\n".format(regr_weights)) """
+        return regr_weights
+
+    # ============== METHOD TO MINIMIZE CROSS-ENTROPY OF SOFTMAX WEIGHTS =============
+    # ============ USING MINI-BATCH GRADIENT DESCENT (ALL CLASSES JOINTLY) ===========
+    def softmax_regression_optimization(self, input_dataset, class_labels, BATCH_SIZE = 32, NUM_ITER = 100, ALPHA = 0.1, optimizer = "sgd", TOLERANCE = 1e-6, L2_PENALTY = 0.0, dtype = np.float64, seed = None, initial_weights = None, CHECKPOINT_FILE = None, CHECKPOINT_INTERVAL = 1, resume = False):
+        # Sparse inputs stay in CSR form; batch gathers and the @ products of the loss and gradient accept them as they are
+        if sp.issparse(input_dataset):
+            dataset = sp.csr_matrix(input_dataset, dtype = dtype)
+        else:
+            dataset = np.ascontiguousarray(input_dataset, dtype = dtype)
+        classes, one_hot_labels = self.one_hot_encode_labels(class_labels, dtype)
+        regr_weights = self.initialize_weights(initial_weights, (dataset.shape[1], len(classes)), dtype, 0.0)   # One weight column per class
+
+        """ print("\nTESTING SOFTMAX REGRESSION ({}) ON {} CLASSES FOR UP TO {} EPOCHS...".format(optimizer.upper(), len(classes), NUM_ITER)) """
+
+        # Shares the mini-batch epoch loop and optimizer updates with the binary model
+        loss_function = lambda data, labels, weights: self.calculate_softmax_loss(data, labels, weights, L2_PENALTY)
+        gradient_function = lambda data, labels, weights: self.calculate_softmax_gradient(data, labels, weights, L2_PENALTY)
+        regr_weights = self.run_mini_batch_optimization(dataset, one_hot_labels, regr_weights, gradient_function, loss_function, BATCH_SIZE, NUM_ITER, ALPHA, optimizer, TOLERANCE, seed, CHECKPOINT_FILE, CHECKPOINT_INTERVAL, resume)
+
+        """ print("\nCLASSES ARE: {}\nSOFTMAX REGRESSION WEIGHTS ARE: \n{}\n".format(classes, regr_weights)) """
+        return classes, regr_weights
+
+    # ========= METHOD TO MINIMIZE REGULARIZED LOG-LOSS OF REGRESSION WEIGHTS ========
+    # ========= USING NEWTON'S METHOD (ITERATIVELY REWEIGHTED LEAST SQUARES) =========
+    def newton_irls_optimization(self, input_dataset, class_labels, L2_PENALTY = 1e-3, NUM_ITER = 25, TOLERANCE = 1e-8, initial_weights = None):
+        dataset = np.ascontiguousarray(input_dataset, dtype = np.float64)
+        labels = np.ascontiguousarray(class_labels, dtype = np.float64)
+        NUM_ROWS, NUM_COLS = np.shape(dataset)
+        regr_weights = self.initialize_weights(initial_weights, NUM_COLS, fill_value = 0.0)   # Newton steps are best-behaved from the origin (or from a nearby solution)
+        loss_history = [self.calculate_log_loss(dataset, labels, regr_weights, L2_PENALTY)]
+        converged = False
+        TIME_I = t()
+
+        """ print("\nTESTING NEWTON (IRLS) OPTIMIZER FOR UP TO {} ITERATIONS...".format(NUM_ITER)) """
+
+        # Each iteration solves one weighted least-squares system of size NUM_COLS x NUM_COLS
+        for _ in range(NUM_ITER):
+            sig = self.stable_sigmoid_distribution(dataset @ regr_weights)
+            gradient = dataset.T @ (sig - labels) / NUM_ROWS + L2_PENALTY * regr_weights
+            hessian = (dataset.T * (sig * (1 - sig))) @ dataset / NUM_ROWS + L2_PENALTY * np.eye(NUM_COLS)
+            newton_step = np.linalg.lstsq(hessian, gradient, rcond = None)[0]
+
+            # A full Newton step below the tolerance means the weights are already at the optimum
+            if np.max(np.abs(newton_step)) < TOLERANCE:
+                converged = True
+                break
+
+            # Halves the step until the loss does not increase, guarding against overshooting on near-separable data
+            step_size = 1.0
+            loss = self.calculate_log_loss(dataset, labels, regr_weights - newton_step, L2_PENALTY)
+            while loss > loss_history[-1] and step_size > 1e-4:
+                step_size /= 2
+                loss = self.calculate_log_loss(dataset, labels, regr_weights - step_size * newton_step, L2_PENALTY)
+
+            # A failed line search leaves the weights unchanged and stops without converging
+            if loss > loss_history[-1]:
+                break
+
+            # Records the loss of the step actually taken
+            regr_weights -= step_size * newton_step
+            loss_history.append(loss)
+
+            if np.max(np.abs(step_size * newton_step)) < TOLERANCE or 0 <= loss_history[-2] - loss_history[-1] < TOLERANCE * TOLERANCE:
+                converged = True
+                break
+
+        self.convergence_report = {"iterations": len(loss_history) - 1,
+                                   "runtime": t() - TIME_I,
+                                   "loss": loss_history[-1],
+                                   "converged": converged,
+                                   "loss_history": np.array(loss_history)}
+
+        """ print("NEWTON OPTIMIZER STOPPED AFTER {} ITERATIONS IN {:.4g} SECONDS (CONVERGED: {})\n".format(len(loss_history) - 1, self.convergence_report["runtime"], converged)) """
+        return regr_weights
+
+    # ========= METHOD TO MINIMIZE REGULARIZED LOG-LOSS OF REGRESSION WEIGHTS ========
+    # ============= USING LIMITED-MEMORY BFGS (QUASI-NEWTON) OPTIMIZATION ============
+    def lbfgs_optimization(self, input_dataset, class_labels, L2_PENALTY = 1e-3, NUM_ITER = 500, TOLERANCE = 1e-6, MEMORY = 10, initial_weights = None):
+        dataset = np.ascontiguousarray(input_dataset, dtype = np.float64)
+        labels = np.ascontiguousarray(class_labels, dtype = np.float64)
+        regr_weights = self.initialize_weights(initial_weights, dataset.shape[1], fill_value = 0.0)
+        loss_history = [self.calculate_log_loss(dataset, labels, regr_weights, L2_PENALTY)]
+        TIME_I = t()
+
+        """ print("\nTESTING L-BFGS OPTIMIZER FOR UP TO {} ITERATIONS...".format(NUM_ITER)) """
+
+        # Loss and gradient share one matrix-vector product per evaluation
+        def loss_and_gradient(weights):
+            z = dataset @ weights
+            loss = np.mean(np.logaddexp(0, z) - labels * z) + 0.5 * L2_PENALTY * np.dot(weights, weights)
+            gradient = dataset.T @ (self.stable_sigmoid_distribution(z) - labels) / len(labels) + L2_PENALTY * weights
+            return loss, gradient
+
+        # Only the last MEMORY gradient pairs are kept, so memory stays linear in the number of features
+        result = minimize(loss_and_gradient, regr_weights, jac = True, method = "L-BFGS-B",
+                          callback = lambda weights: loss_history.append(loss_and_gradient(weights)[0]),
+                          options = {"maxiter": NUM_ITER, "maxcor": MEMORY, "gtol": TOLERANCE, "ftol": TOLERANCE * TOLERANCE})
+
+        self.convergence_report = {"iterations": int(result.nit),
+                                   "runtime": t() - TIME_I,
+                                   "loss": float(result.fun),
+                                   "converged": bool(result.success),
+                                   "loss_history": np.array(loss_history)}
+
+        """ print("L-BFGS OPTIMIZER STOPPED AFTER {} ITERATIONS IN {:.4g} SECONDS (CONVERGED: {})\n".format(result.nit, self.convergence_report["runtime"], result.success)) """
+        return result.x
+
+    # =============== METHOD TO MINIMIZE LOG-LOSS OF REGRESSION WEIGHTS ==============
+    # ============== OVER FEATURE FILE STREAMED IN CHUNKS (OUT-OF-CORE) ==============
+    def streaming_gradient_descent_optimization(self, FILENAME, CHUNK_ROWS = 100000, BATCH_SIZE = 256, NUM_ITER = 5, ALPHA = 0.01, optimizer = "adam", L2_PENALTY = 0.0, seed = None, initial_weights = None, CHECKPOINT_FILE = None, CHECKPOINT_INTERVAL = 1, resume = False):
+        chunks = fs.list_feature_chunks(FILENAME, CHUNK_ROWS)          # Chunk boundaries are found once and reused by every epoch
+        if not chunks:
+            raise ValueError("Feature file {} has no rows".format(FILENAME))
+        random_state = np.random.RandomState(seed)
+        optimizer_state = dict()
+        regr_weights = None
+        loss_history = []
+        first_epoch = 0
+        TIME_I = t()
+
+        # Resumed runs skip the epochs already streamed and continue the same chunk and row orders
+        if resume and CHECKPOINT_FILE is not None and os.path.isfile(CHECKPOINT_FILE):
+            checkpoint = self.load_checkpoint(CHECKPOINT_FILE, None, optimizer, ALPHA)
+            regr_weights, optimizer_state, first_epoch, random_state, loss_history = checkpoint["regr_weights"], checkpoint["optimizer_state"], checkpoint["epoch"], checkpoint["random_state"], checkpoint["loss_history"]
+
+        """ print("\nTESTING STREAMING OPTIMIZER ({}) OVER {} CHUNKS FOR {} EPOCHS...".format(optimizer.upper(), len(chunks), NUM_ITER)) """
+
+        # Each epoch visits the chunks in a new random order, holding only one chunk in memory at a time
+        for epoch in range(first_epoch, NUM_ITER):
+            epoch_loss = 0.0
+            number_of_rows = 0
+
+            for dataset, labels in fs.iterate_feature_chunks(FILENAME, chunks, random_state.permutation(len(chunks))):
+                if regr_weights is None:
+                    regr_weights = self.initialize_weights(initial_weights, dataset.shape[1])   # Same starting point as the gradient ascent optimizers unless warm-started
+
+                # Loss is measured on each chunk before training on it (progressive validation)
+                epoch_loss += self.calculate_log_loss(dataset, labels, regr_weights, L2_PENALTY) * len(labels)
+                number_of_rows += len(labels)
+
+                # Rows are shuffled within the chunk and consumed as mini-batches
+                data_index = random_state.permutation(len(labels))
+                for start in range(0, len(labels), BATCH_SIZE):
+                    batch_index = data_index[start:start + BATCH_SIZE]
+                    gradient = self.calculate_log_loss_gradient(dataset[batch_index], labels[batch_index], regr_weights, L2_PENALTY)
+                    self.apply_optimizer_step(regr_weights, gradient, optimizer_state, ALPHA, optimizer)
+
+            # Files whose chunks hold nothing but comment lines have no rows either
+            if number_of_rows == 0:
+                raise ValueError("Feature file {} has no rows".format(FILENAME))
+            loss_history.append(epoch_loss / number_of_rows)
+
+            # Checkpoints every CHECKPOINT_INTERVAL epochs and always on the final one
+            if CHECKPOINT_FILE is not None and regr_weights is not None and (epoch + 1 == NUM_ITER or (epoch + 1) % CHECKPOINT_INTERVAL == 0):
+                self.store_checkpoint(CHECKPOINT_FILE, regr_weights, optimizer_state, epoch + 1, random_state, loss_history, optimizer, ALPHA)
+
+        self.convergence_report = {"iterations": NUM_ITER,
+                                   "runtime": t() - TIME_I,
+                                   "loss": loss_history[-1] if loss_history else None,
+                                   "converged": None,
+                                   "loss_history": np.array(loss_history)}
+
+        """ print("STREAMING OPTIMIZER LOSS PER EPOCH IS: \n{}\n".format(loss_history)) """
+        return regr_weights
+
     # ====== METHOD TO PLOT LOGISTIC REGRESSION LINE OF BEST FIT ACROSS DATASET ======
     def plot_line_of_best_fit(self, dataset, labels, weights):
         regr_weights = np.array(weights)
@@ -215,48 +747,66 @@ class Logistic_Regression_Optimization_Algorithm(object):
             return 1.0
         return 0.0
 
-    # ======= METHOD TO APPLY SIGMOID CLASSIFIER AND GRADIENT ASCENT OPTIMIZER =======
-    # ================== AGAINST SAMPLE HORSE COLIC DISEASE DATASETS =================
-    def test_classifier_against_horse_data(self, current_test_iteration):
-        TRAINING_DATA = open("./horse_colic_training01.txt")
-        TEST_DATA = open("./horse_colic_test01.txt")
-        training_set = []
-        training_labels = []
-
-        # Iterate through horse training data and produce training set and training class label vector
-        for line in TRAINING_DATA.readlines():
-            current_line = line.strip().split("\t")
-            array_of_lines = []
-
-            # Produces array of lines from iterating through current line of training data
-            for iterator in range(21):
-                array_of_lines.append(float(current_line[iterator]))
-            
-            # Produces training set from line array and training label vector from 21st data entry of each current line of training data
-            training_set.append(array_of_lines)
-            training_labels.append(float(current_line[21]))
+    # ================== METHOD TO SCORE SINGLE CHUNK OF DATA MATRIX =================
+    def score_chunk(self, dataset, regr_weights, probabilities, start, stop):
+        # Chunks are converted on their own, so memory-mapped or list inputs are never copied whole
+        chunk = dataset[start:stop] if sp.issparse(dataset) else np.asarray(dataset[start:stop], dtype = np.float64)
+        scores = chunk @ regr_weights
 
-        # Create training regression weights using the advanced stochastic gradient ascent optimizer against the training set and training labels for 500 iterations
-        training_weights = self.advanced_stochastic_gradient_ascent_optimization(np.array(training_set), training_labels)
-        error_count = 0.0
-        number_of_test_vectors = 0.0
+        # Weight vectors give one sigmoid probability per row; (features x classes) weight matrices give softmax rows
+        if regr_weights.ndim == 1:
+            probabilities[start:stop] = self.stable_sigmoid_distribution(scores)
+        else:
+            probabilities[start:stop] = self.softmax_distribution(scores)
+        return
+
+    # ============ METHOD TO CALCULATE CLASS PROBABILITIES FOR DATA MATRIX ===========
+    def predict_proba(self, input_dataset, regr_weights, CHUNK_SIZE = 65536, workers = None):
+        dataset = input_dataset if hasattr(input_dataset, "shape") else np.asarray(input_dataset, dtype = np.float64)
+        if sp.issparse(dataset):
+            dataset = sp.csr_matrix(dataset)            # Row slicing of chunks needs CSR
+        regr_weights = np.asarray(regr_weights, dtype = np.float64)
+        if regr_weights.ndim == 2 and regr_weights.shape[1] == 1:
+            regr_weights = regr_weights.ravel()         # Accepts the (NUM_COLS, 1) matrix of the batch optimizer too
+        NUM_ROWS = dataset.shape[0]
+        probabilities = np.empty((NUM_ROWS,) + regr_weights.shape[1:])
+        chunk_starts = range(0, NUM_ROWS, CHUNK_SIZE)
+
+        # One matrix product per chunk, written straight into the preallocated output
+        if workers and len(chunk_starts) > 1:
+            with ThreadPoolExecutor(max_workers = workers) as executor:
+                list(executor.map(lambda start: self.score_chunk(dataset, regr_weights, probabilities, start, start + CHUNK_SIZE), chunk_starts))
+        else:
+            for start in chunk_starts:
+                self.score_chunk(dataset, regr_weights, probabilities, start, start + CHUNK_SIZE)
 
-        # Iterate through horse test data and produce test set and relative multi-algorithmic error count
-        for line in TEST_DATA.readlines():
-            number_of_test_vectors += 1.0
-            current_line = line.strip().split("\t")
-            array_of_lines = []
+        """ print("PREDICTED PROBABILITIES ARE: \n{}\n".format(probabilities)) """
+        return probabilities
 
-            # Produces array of lines from iterating through current line of test data
-            for iterator in range(21):
-                array_of_lines.append(float(current_line[iterator]))
+    # ========== METHOD TO CLASSIFY DATA MATRIX AGAINST SIGMOID DISTRIBUTION =========
+    def predict(self, input_dataset, regr_weights, CHUNK_SIZE = 65536, workers = None, classes = None):
+        probabilities = self.predict_proba(input_dataset, regr_weights, CHUNK_SIZE, workers)
 
-            # Increment error count if expected test class label does not match actual test class label
-            if int(self.classify_vector_with_sigmoid(np.array(array_of_lines), training_weights)) != int(current_line[21]):
-                error_count += 1
+        # Softmax models pick the most probable class (mapped back through classes when given)
+        if probabilities.ndim == 2:
+            class_ids = np.argmax(probabilities, axis = 1)
+            return class_ids if classes is None else np.asarray(classes)[class_ids]
 
-        # Calculate error rate across entire horse test data classification
-        error_rate = error_count / number_of_test_vectors
+        # Same rule as classify_vector_with_sigmoid(): class 1.0 above a probability of 0.5, otherwise 0.0
+        return (probabilities > 0.5).astype(np.float64)
+
+    # ======= METHOD TO APPLY SIGMOID CLASSIFIER AND GRADIENT ASCENT OPTIMIZER =======
+    # ================== AGAINST SAMPLE HORSE COLIC DISEASE DATASETS =================
+    def test_classifier_against_horse_data(self, current_test_iteration, preprocess = False):
+        # Parses (and optionally imputes and standardizes) the horse training and test data as whole arrays
+        training_set, training_labels, test_set, test_labels = self.load_horse_datasets(preprocess)
+
+        # Create training regression weights using the advanced stochastic gradient ascent optimizer against the training set and training labels for 500 iterations
+        training_weights = self.advanced_stochastic_gradient_ascent_optimization(training_set, training_labels)
+
+        # Classifies the whole test set at once and calculates error rate across entire horse test data classification
+        predicted_labels = self.predict(test_set, training_weights)
+        error_rate = float(np.mean(predicted_labels != test_labels))
 
         """
         # Runs runtime tracker for particular method
@@ -286,6 +836,57 @@ class Logistic_Regression_Optimization_Algorithm(object):
         self.track_runtime()
         return
 
+    # ================ METHOD TO PARSE HORSE COLIC DATASET INTO ARRAYS ===============
+    def load_horse_data(self, FILENAME):
+        # Parses the tab-separated file in one call: 21 feature columns followed by the class label
+        dataset, labels = imp.parse_feature_file(FILENAME)
+
+        """ print("HORSE DATASET SHAPE IS: {}\n".format(dataset.shape)) """
+        return dataset, labels
+
+    # =============== METHOD TO LOAD PREPROCESSED HORSE COLIC DATASETS ===============
+    def load_horse_datasets(self, preprocess = False, strategy = "mean"):
+        # Raw arrays, or arrays with missing zeros imputed and columns standardized (cached on disk after the first run)
+        if preprocess:
+            training_set, training_labels, test_set, test_labels, _ = imp.load_preprocessed_data("./horse_colic_training01.txt", "./horse_colic_test01.txt", strategy)
+        else:
+            training_set, training_labels = self.load_horse_data("./horse_colic_training01.txt")
+            test_set, test_labels = self.load_horse_data("./horse_colic_test01.txt")
+        return training_set, training_labels, test_set, test_labels
+
+    # ============== METHOD TO TRAIN AND TEST SINGLE SEEDED HORSE TRIAL ==============
+    def run_horse_trial(self, training_set, training_labels, test_set, test_labels, seed):
+        TIME_I = t()
+
+        # Same optimizer as test_classifier_against_horse_data(), with its own seeded random stream
+        training_weights = self.advanced_stochastic_gradient_ascent_optimization(training_set, training_labels, seed = seed)
+        error_rate = float(np.mean(self.predict(test_set, training_weights) != test_labels))
+
+        return error_rate, t() - TIME_I
+
+    # ========== METHOD TO RUN k SEEDED HORSE TRIALS ACROSS WORKER PROCESSES =========
+    def parallel_series_of_test_classifications(self, k_num_series, processes = None, seed = 0, preprocess = False):
+        # Parses both files once; the arrays are made read-only before being shared with every trial
+        training_set, training_labels, test_set, test_labels = self.load_horse_datasets(preprocess)
+        for array in (training_set, training_labels, test_set, test_labels):
+            array.setflags(write = False)
+
+        # Independent child seeds give every trial its own reproducible random stream
+        trial_seeds = [int(child.generate_state(1)[0]) for child in np.random.SeedSequence(seed).spawn(k_num_series)]
+
+        if processes:
+            with Pool(processes, initializer = share_horse_data, initargs = (training_set, training_labels, test_set, test_labels)) as pool:
+                trial_results = pool.map(run_shared_horse_trial, trial_seeds)
+        else:
+            trial_results = [self.run_horse_trial(training_set, training_labels, test_set, test_labels, trial_seed) for trial_seed in trial_seeds]
+
+        trial_errors = np.array([error_rate for error_rate, _ in trial_results])
+        trial_times = np.array([trial_time for _, trial_time in trial_results])
+
+        """ print("TRIAL ERROR RATES ARE: {}\nTRIAL TIMES ARE: {}\n".format(trial_errors, trial_times)) """
+        print("\n\nAFTER k={} TRIALS, THE ERROR RATE OF THE CLASSIFIER IS: {:.4f} +/- {:.4f} (MEAN TRIAL TIME: {:.4g} SECONDS)\n".format(k_num_series, trial_errors.mean(), trial_errors.std(), trial_times.mean()))
+        return trial_errors, trial_times
+
     # ================ METHOD TO BENCHMARK RUNTIME OF SPECIFIC METHOD ================
     def track_runtime(self):
         # Track ending time of program and determine overall program runtime
@@ -338,6 +939,77 @@ def main():
     logRegres.plot_line_of_best_fit(dataset, labels, weights)
     """
 
+    # Test plot_line_of_best_fit() with mini-batch gradient descent (Adam) on sample data
+    """
+    dataset, labels = logRegres.load_dataset()
+    weights = logRegres.mini_batch_gradient_descent_optimization(dataset, labels, BATCH_SIZE = 16, NUM_ITER = 500, ALPHA = 0.05, optimizer = "adam")
+    print("CONVERGED AFTER {} EPOCHS (LOSS: {:.4f})\n".format(logRegres.convergence_report["iterations"], logRegres.convergence_report["loss"]))
+    logRegres.plot_line_of_best_fit(dataset, labels, weights)
+    """
+
+    # Test Newton (IRLS) and L-BFGS solvers on sample data, reporting iterations and time to converge
+    """
+    dataset, labels = logRegres.load_dataset()
+    for solver in (logRegres.newton_irls_optimization, logRegres.lbfgs_optimization):
+        weights = solver(dataset, labels, L2_PENALTY = 1e-3)
+        print("{} CONVERGED AFTER {} ITERATIONS IN {:.4g} SECONDS (LOSS: {:.4f})\n".format(solver.__name__.upper(), logRegres.convergence_report["iterations"], logRegres.convergence_report["runtime"], logRegres.convergence_report["loss"]))
+    logRegres.plot_line_of_best_fit(dataset, labels, weights)
+    """
+
+    # Test predict_proba() and predict() on a large random matrix, scored in chunks on four threads
+    """
+    dataset, labels = logRegres.load_dataset()
+    weights = logRegres.newton_irls_optimization(dataset, labels)
+    large_dataset = np.random.randn(2000000, 3)
+    large_dataset[:, 0] = 1.0
+    print(logRegres.predict(large_dataset, weights, CHUNK_SIZE = 100000, workers = 4).mean())
+    """
+
+    # Test parallel_series_of_test_classifications() with seeded trials spread across four worker processes
+    """
+    trial_errors, trial_times = logRegres.parallel_series_of_test_classifications(10, processes = 4)
+    """
+
+    # Test streaming_gradient_descent_optimization() over the horse training file read in chunks of 50 rows
+    """
+    fs.convert_tsv_to_binary("./horse_colic_training01.txt", "./horse_colic_training01.lrfb")
+    weights = logRegres.streaming_gradient_descent_optimization("./horse_colic_training01.lrfb", CHUNK_ROWS = 50, BATCH_SIZE = 16, NUM_ITER = 20)
+    test_set, test_labels = logRegres.load_horse_data("./horse_colic_test01.txt")
+    print("STREAMED MODEL ERROR RATE IS: {}\n".format(np.mean(logRegres.predict(test_set, weights) != test_labels)))
+    """
+
+    # Test softmax_regression_optimization() on the three-class dating data of chapter 2 (standardized, with intercept column)
+    """
+    dating_data = np.loadtxt("../algo_ch02/dating_test_set2.txt", delimiter = "\t")
+    features = (dating_data[:, :3] - dating_data[:, :3].mean(axis = 0)) / dating_data[:, :3].std(axis = 0)
+    dataset = np.column_stack((np.ones(len(features)), features))
+    classes, weights = logRegres.softmax_regression_optimization(dataset, dating_data[:, 3], NUM_ITER = 200, ALPHA = 0.01, optimizer = "adam")
+    print("SOFTMAX TRAINING ERROR RATE IS: {}\n".format(np.mean(logRegres.predict(dataset, weights, classes = classes) != dating_data[:, 3])))
+    """
+
+    # Test sparse (CSR) training paths on a random matrix with 1% non-zeros and 100,000 columns
+    """
+    sparse_dataset = sp.random(5000, 100000, density = 0.01, format = "csr", random_state = 0)
+    sparse_labels = (sparse_dataset @ np.random.randn(100000) > 0).astype(float)
+    weights = logRegres.mini_batch_gradient_descent_optimization(sparse_dataset, sparse_labels, BATCH_SIZE = 64, NUM_ITER = 20, ALPHA = 1.0, L2_PENALTY = 1e-4)
+    print("SPARSE TRAINING ERROR RATE IS: {}\n".format(np.mean(logRegres.predict(sparse_dataset, weights) != sparse_labels)))
+    """
+
+    # Test parallel_series_of_test_classifications() on horse data with missing values imputed and columns standardized
+    """
+    trial_errors, trial_times = logRegres.parallel_series_of_test_classifications(10, preprocess = True)
+    """
+
+    # Test checkpointed Adam training that resumes after an interruption, then an L2 sweep warm-started from each previous solution
+    """
+    training_set, training_labels, test_set, test_labels = logRegres.load_horse_datasets(preprocess = True)
+    weights = logRegres.mini_batch_gradient_descent_optimization(training_set, training_labels, NUM_ITER = 200, ALPHA = 0.01, optimizer = "adam", seed = 0,
+                                                                 CHECKPOINT_FILE = "./.checkpoints/horse_adam.npz", CHECKPOINT_INTERVAL = 10, resume = True)
+    for L2_PENALTY in (1e-4, 1e-3, 1e-2, 1e-1):
+        weights = logRegres.newton_irls_optimization(training_set, training_labels, L2_PENALTY = L2_PENALTY, initial_weights = weights)
+        print("L2 PENALTY {}: {} ITERATIONS, TEST ERROR RATE {}\n".format(L2_PENALTY, logRegres.convergence_report["iterations"], np.mean(logRegres.predict(test_set, weights) != test_labels)))
+    """
+
     # Test k_series_of_test_classifications() with modular classifier methods on horse datasets
     logRegres.k_series_of_test_classifications(10)
 
@@ -0,0 +1,62 @@
+"""
+NAME:               test_feature_stream.py (data_projects/machine_learning_in_action/algo_ch05/)
+
+DESCRIPTION:        Pytest checks for the chunked feature file reader in feature_stream.py.
+
+NOTE:               Run with 'python -m pytest' from this directory or the repository root.
+"""
+
+
+# ====================================================================================
+# ================================ IMPORT STATEMENTS =================================
+# ====================================================================================
+
+
+import warnings                             # Library for turning reader warnings into test failures
+import numpy as np                          # Library for simple linear mathematical operations
+import feature_stream as fs                 # Modular program under test (chunked feature file reader)
+
+
+# ====================================================================================
+# ================================ FEATURE FILE CHECKS ===============================
+# ====================================================================================
+
+
+# ============= FUNCTION TO CHECK BLANK LINES NEVER FORM OR SPLIT CHUNKS =============
+def test_tsv_chunks_skip_blank_lines(tmp_path):
+    rows = np.arange(30, dtype = float).reshape(10, 3)
+    path = str(tmp_path / "features.tsv")
+    with open(path, "w") as f:
+        f.write("\n".join("\t".join(str(value) for value in row) + ("\n" if index % 3 else "\n \n") for index, row in enumerate(rows)))
+        f.write("\n\n\r\n")
+
+    # Ten rows in chunks of five give exactly two full chunks, and no empty chunk from the trailing blank lines
+    chunks = fs.list_feature_chunks(path, 5)
+    assert len(chunks) == 2
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        streamed_chunks = [np.column_stack(chunk) for chunk in fs.iterate_feature_chunks(path, chunks)]
+    assert [len(chunk) for chunk in streamed_chunks] == [5, 5]
+    assert np.array_equal(np.vstack(streamed_chunks), rows)
+
+# ================= FUNCTION TO CHECK EMPTY BINARY FILE HAS NO CHUNKS ================
+def test_empty_binary_file_has_no_chunks(tmp_path):
+    tsv_path = str(tmp_path / "empty.tsv")
+    binary_path = str(tmp_path / "empty.lrfb")
+    with open(tsv_path, "w") as f:
+        f.write("\n\n")
+
+    assert fs.list_feature_chunks(tsv_path, 10) == []
+    assert fs.convert_tsv_to_binary(tsv_path, binary_path) == (0, 0)
+    assert fs.list_feature_chunks(binary_path, 10) == []
+
+# ============ FUNCTION TO CHECK NON-ASCII COMMENT LINES ARE READ AND SKIPPED ========
+def test_tsv_chunks_skip_non_ascii_comment_lines(tmp_path):
+    rows = np.arange(12, dtype = float).reshape(4, 3)
+    path = str(tmp_path / "features.tsv")
+    with open(path, "wb") as f:
+        f.write("# Données équines: caractéristiques puis étiquette\n".encode("utf-8"))
+        f.write("".join("\t".join(str(value) for value in row) + "\n" for row in rows).encode("utf-8"))
+
+    streamed_chunks = [np.column_stack(chunk) for chunk in fs.iterate_feature_chunks(path, fs.list_feature_chunks(path, 2))]
+    assert np.array_equal(np.vstack(streamed_chunks), rows)
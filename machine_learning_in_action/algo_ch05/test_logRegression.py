@@ -0,0 +1,245 @@
+"""
+NAME:               test_logRegression.py (data_projects/machine_learning_in_action/algo_ch05/)
+
+DESCRIPTION:        Pytest checks for the logistic regression optimizer algorithm in logRegression.py.
+
+NOTE:               Run with 'python -m pytest' from this directory or the repository root.
+"""
+
+
+# ====================================================================================
+# ================================ IMPORT STATEMENTS =================================
+# ====================================================================================
+
+
+import os                                   # Library for basic operating system mechanics
+import pytest                               # Library for writing and running test functions
+import numpy as np                          # Library for simple linear mathematical operations
+import scipy.sparse as sp                   # Module for compressed sparse row (CSR) matrices
+import logRegression                        # Modular program under test (logistic regression optimizers)
+
+
+# ====================================================================================
+# ============================== INITIALIZING CONSTANTS ==============================
+# ====================================================================================
+
+
+DATA_DIRECTORY = os.path.dirname(os.path.abspath(__file__))     # Directory holding the horse colic files
+
+
+# ====================================================================================
+# ================================ HELPER FUNCTIONS ==================================
+# ====================================================================================
+
+
+# ============== FUNCTION TO LOAD STANDARDIZED HORSE COLIC TRAINING DATA =============
+def load_standardized_horse_data():
+    logRegres = logRegression.Logistic_Regression_Optimization_Algorithm(0)
+    dataset, labels = logRegres.load_horse_data(os.path.join(DATA_DIRECTORY, "horse_colic_training01.txt"))
+    dataset = (dataset - dataset.mean(axis = 0)) / (dataset.std(axis = 0) + 1e-9)
+    return logRegres, dataset, labels
+
+
+# ====================================================================================
+# ============================= NEWTON OPTIMIZER CHECKS ==============================
+# ====================================================================================
+
+
+# ============= FUNCTION TO CHECK NEWTON LOSS HISTORY MATCHES ITS WEIGHTS ============
+def test_newton_loss_history_matches_weights():
+    logRegres, dataset, labels = load_standardized_horse_data()
+    weights = logRegres.newton_irls_optimization(dataset, labels, L2_PENALTY = 1e-2)
+    loss_history = logRegres.convergence_report["loss_history"]
+
+    assert logRegres.convergence_report["converged"]
+    assert np.all(np.diff(loss_history) <= 0)
+    assert np.isclose(loss_history[-1], logRegres.calculate_log_loss(dataset, labels, weights, 1e-2))
+
+# ============== FUNCTION TO CHECK FAILED NEWTON LINE SEARCH STOPS CLEANLY ===========
+def test_newton_failed_line_search_keeps_weights():
+    # Any move away from the origin "increases" this loss, so every line search fails
+    class Rising_Loss_Algorithm(logRegression.Logistic_Regression_Optimization_Algorithm):
+        def calculate_log_loss(self, dataset, labels, regr_weights, L2_PENALTY = 0.0):
+            return float(np.any(regr_weights != 0))
+
+    logRegres = Rising_Loss_Algorithm(0)
+    _, dataset, labels = load_standardized_horse_data()
+    weights = logRegres.newton_irls_optimization(dataset, labels)
+
+    assert np.all(weights == 0)
+    assert not logRegres.convergence_report["converged"]
+    assert list(logRegres.convergence_report["loss_history"]) == [0.0]
+
+
+# ====================================================================================
+# ============================ STREAMING OPTIMIZER CHECKS ============================
+# ====================================================================================
+
+
+# ============== FUNCTION TO CHECK STREAMED TEXT AND BINARY FILES AGREE ==============
+def test_streaming_tsv_and_binary_give_same_weights(tmp_path):
+    logRegres, dataset, labels = load_standardized_horse_data()
+
+    # Values on a 1/64 grid are exact in float32, so the binary copy holds the same numbers as the text file
+    tsv_path = str(tmp_path / "horse.tsv")
+    binary_path = str(tmp_path / "horse.lrfb")
+    np.savetxt(tsv_path, np.column_stack((np.round(dataset * 64) / 64, labels)), delimiter = "\t")
+    logRegression.fs.convert_tsv_to_binary(tsv_path, binary_path)
+
+    tsv_weights = logRegres.streaming_gradient_descent_optimization(tsv_path, CHUNK_ROWS = 50, BATCH_SIZE = 16, NUM_ITER = 3, seed = 0)
+    binary_weights = logRegres.streaming_gradient_descent_optimization(binary_path, CHUNK_ROWS = 50, BATCH_SIZE = 16, NUM_ITER = 3, seed = 0)
+    np.testing.assert_allclose(tsv_weights, binary_weights, rtol = 1e-12)
+
+# ============ FUNCTION TO CHECK STREAMING OPTIMIZER REJECTS EMPTY FILES =============
+@pytest.mark.parametrize("contents", ["", "\n\n", "# Header comment only\n"])
+def test_streaming_rejects_file_without_rows(tmp_path, contents):
+    logRegres = logRegression.Logistic_Regression_Optimization_Algorithm(0)
+    tsv_path = str(tmp_path / "empty.tsv")
+    with open(tsv_path, "w") as f:
+        f.write(contents)
+
+    with pytest.raises(ValueError):
+        logRegres.streaming_gradient_descent_optimization(tsv_path, NUM_ITER = 2, seed = 0)
+
+# ====================================================================================
+# ============================= SOFTMAX REGRESSION CHECKS ============================
+# ====================================================================================
+
+
+# ================= FUNCTION TO CHECK SOFTMAX SEPARATES THREE CLASSES ================
+def test_softmax_separates_three_classes():
+    logRegres = logRegression.Logistic_Regression_Optimization_Algorithm(0)
+    random_state = np.random.RandomState(0)
+    centers = np.array([[3.0, 0.0], [-3.0, 3.0], [-3.0, -3.0]])
+    dataset = np.vstack([center + 0.5 * random_state.randn(20, 2) for center in centers])
+    dataset = np.column_stack((np.ones(len(dataset)), dataset))
+    labels = np.repeat(["cat", "dog", "eel"], 20)
+
+    classes, regr_weights = logRegres.softmax_regression_optimization(dataset, labels, NUM_ITER = 50, ALPHA = 0.5, seed = 0)
+
+    # One weight column per class, and predictions map back to the original class labels
+    assert list(classes) == ["cat", "dog", "eel"]
+    assert regr_weights.shape == (3, 3)
+    assert list(logRegres.predict(dataset, regr_weights, classes = classes)) == list(labels)
+    assert list(logRegres.predict(dataset, regr_weights)) == list(np.repeat([0, 1, 2], 20))
+    np.testing.assert_allclose(logRegres.predict_proba(dataset, regr_weights).sum(axis = 1), 1.0)
+
+# ========== FUNCTION TO CHECK TWO-CLASS SOFTMAX MATCHES LOGISTIC REGRESSION =========
+def test_two_class_softmax_matches_logistic_regression():
+    logRegres, dataset, labels = load_standardized_horse_data()
+
+    # Starting from zero weights, the difference of the two softmax columns follows binary SGD with twice the step size
+    classes, softmax_weights = logRegres.softmax_regression_optimization(dataset, labels, NUM_ITER = 5, ALPHA = 0.05, TOLERANCE = 0.0, seed = 0)
+    binary_weights = logRegres.mini_batch_gradient_descent_optimization(dataset, labels, NUM_ITER = 5, ALPHA = 0.1, TOLERANCE = 0.0, seed = 0, initial_weights = np.zeros(dataset.shape[1]))
+
+    np.testing.assert_allclose(softmax_weights[:, 1] - softmax_weights[:, 0], binary_weights, rtol = 1e-9, atol = 1e-12)
+    np.testing.assert_allclose(logRegres.predict_proba(dataset, softmax_weights)[:, 1], logRegres.predict_proba(dataset, binary_weights), rtol = 1e-9)
+    assert list(logRegres.predict(dataset, softmax_weights, classes = classes)) == list(logRegres.predict(dataset, binary_weights))
+
+
+
+# ====================================================================================
+# ============================== SPARSE (CSR) INPUT CHECKS ===========================
+# ====================================================================================
+
+
+# ============== FUNCTION TO CHECK CSR AND DENSE INPUTS TRAIN ALIKE ==================
+@pytest.mark.parametrize("optimizer", ["sgd", "adam"])
+def test_csr_and_dense_mini_batch_training_agree(optimizer):
+    logRegres, dataset, labels = load_standardized_horse_data()
+    sparse_dataset = sp.csr_matrix(dataset * (np.abs(dataset) > 0.5))
+
+    dense_weights = logRegres.mini_batch_gradient_descent_optimization(sparse_dataset.toarray(), labels, NUM_ITER = 5, ALPHA = 0.05, optimizer = optimizer, L2_PENALTY = 1e-2, seed = 0)
+    sparse_weights = logRegres.mini_batch_gradient_descent_optimization(sparse_dataset, labels, NUM_ITER = 5, ALPHA = 0.05, optimizer = optimizer, L2_PENALTY = 1e-2, seed = 0)
+    np.testing.assert_allclose(sparse_weights, dense_weights, rtol = 1e-9, atol = 1e-12)
+    np.testing.assert_allclose(logRegres.predict_proba(sparse_dataset, sparse_weights), logRegres.predict_proba(sparse_dataset.toarray(), dense_weights), rtol = 1e-9)
+
+# ========== FUNCTION TO CHECK CSR AND DENSE STOCHASTIC ASCENT TRAIN ALIKE ===========
+def test_csr_and_dense_stochastic_ascent_agree():
+    logRegres, dataset, labels = load_standardized_horse_data()
+    sparse_dataset = sp.csr_matrix(dataset * (np.abs(dataset) > 0.5))
+
+    dense_weights = logRegres.advanced_stochastic_gradient_ascent_optimization(sparse_dataset.toarray(), labels, NUM_ITER = 5, seed = 0, L2_PENALTY = 1e-3)
+    sparse_weights = logRegres.advanced_stochastic_gradient_ascent_optimization(sparse_dataset, labels, NUM_ITER = 5, seed = 0, L2_PENALTY = 1e-3)
+    np.testing.assert_allclose(sparse_weights, dense_weights, rtol = 1e-9, atol = 1e-12)
+
+# ========= FUNCTION TO CHECK CSR AND DENSE SIMPLE STOCHASTIC ASCENT AGREE ===========
+def test_csr_and_dense_simple_stochastic_ascent_agree():
+    logRegres, dataset, labels = load_standardized_horse_data()
+    sparse_dataset = sp.csr_matrix(dataset * (np.abs(dataset) > 0.5))
+
+    dense_weights = logRegres.simple_stochastic_gradient_ascent_optimization(sparse_dataset.toarray(), labels)
+    sparse_weights = logRegres.simple_stochastic_gradient_ascent_optimization(sparse_dataset, labels)
+    np.testing.assert_allclose(sparse_weights, dense_weights, rtol = 1e-9, atol = 1e-12)
+
+# ============== FUNCTION TO CHECK CSR AND DENSE SOFTMAX TRAINING AGREE ==============
+def test_csr_and_dense_softmax_training_agree():
+    logRegres, dataset, labels = load_standardized_horse_data()
+    sparse_dataset = sp.csr_matrix(dataset * (np.abs(dataset) > 0.5))
+
+    dense_classes, dense_weights = logRegres.softmax_regression_optimization(sparse_dataset.toarray(), labels, NUM_ITER = 5, ALPHA = 0.05, L2_PENALTY = 1e-2, seed = 0)
+    sparse_classes, sparse_weights = logRegres.softmax_regression_optimization(sparse_dataset, labels, NUM_ITER = 5, ALPHA = 0.05, L2_PENALTY = 1e-2, seed = 0)
+    assert list(sparse_classes) == list(dense_classes)
+    np.testing.assert_allclose(sparse_weights, dense_weights, rtol = 1e-9, atol = 1e-12)
+
+# ============ FUNCTION TO CHECK OVERSIZED L2 DECAY IS REJECTED ON CSR INPUT =========
+def test_csr_training_rejects_non_positive_decay_factor():
+    logRegres, dataset, labels = load_standardized_horse_data()
+    sparse_dataset = sp.csr_matrix(dataset)
+
+    with pytest.raises(ValueError):
+        logRegres.mini_batch_gradient_descent_optimization(sparse_dataset, labels, ALPHA = 10, L2_PENALTY = 0.2)
+    with pytest.raises(ValueError):
+        logRegres.advanced_stochastic_gradient_ascent_optimization(sparse_dataset, labels, L2_PENALTY = 0.5)
+
+
+# ====================================================================================
+# ============================= CHECKPOINT RESUME CHECKS =============================
+# ====================================================================================
+
+
+# ============ FUNCTION TO CHECK RESUMED MINI-BATCH RUN MATCHES FULL RUN =============
+@pytest.mark.parametrize("optimizer, sparse", [("adam", False), ("sgd", False), ("sgd", True)])
+def test_resumed_mini_batch_run_matches_uninterrupted_run(tmp_path, optimizer, sparse):
+    logRegres, dataset, labels = load_standardized_horse_data()
+    dataset = sp.csr_matrix(dataset * (np.abs(dataset) > 0.5)) if sparse else dataset
+    checkpoint_path = str(tmp_path / "checkpoint.npz")
+
+    full_weights = logRegres.mini_batch_gradient_descent_optimization(dataset, labels, NUM_ITER = 6, ALPHA = 0.05, optimizer = optimizer, TOLERANCE = 0.0, L2_PENALTY = 1e-2, seed = 0)
+    full_loss_history = logRegres.convergence_report["loss_history"]
+
+    # Stops after three epochs, then a fresh instance picks up from the checkpoint for the remaining three.
+    # The resumed call passes another seed, so only the checkpointed random stream can reproduce the full run
+    logRegres.mini_batch_gradient_descent_optimization(dataset, labels, NUM_ITER = 3, ALPHA = 0.05, optimizer = optimizer, TOLERANCE = 0.0, L2_PENALTY = 1e-2, seed = 0, CHECKPOINT_FILE = checkpoint_path)
+    resumed_algorithm = logRegression.Logistic_Regression_Optimization_Algorithm(0)
+    resumed_weights = resumed_algorithm.mini_batch_gradient_descent_optimization(dataset, labels, NUM_ITER = 6, ALPHA = 0.05, optimizer = optimizer, TOLERANCE = 0.0, L2_PENALTY = 1e-2, seed = 1, CHECKPOINT_FILE = checkpoint_path, resume = True)
+
+    np.testing.assert_allclose(resumed_weights, full_weights, rtol = 1e-12, atol = 1e-15)
+    np.testing.assert_allclose(resumed_algorithm.convergence_report["loss_history"], full_loss_history, rtol = 1e-12)
+
+# ========= FUNCTION TO CHECK RESUMED STOCHASTIC ASCENT RUN MATCHES FULL RUN =========
+@pytest.mark.parametrize("sparse", [False, True])
+def test_resumed_stochastic_ascent_run_matches_uninterrupted_run(tmp_path, sparse):
+    logRegres, dataset, labels = load_standardized_horse_data()
+    dataset = sp.csr_matrix(dataset * (np.abs(dataset) > 0.5)) if sparse else dataset
+    checkpoint_path = str(tmp_path / "checkpoint.npz")
+
+    full_weights = logRegres.advanced_stochastic_gradient_ascent_optimization(dataset, labels, NUM_ITER = 6, seed = 0, L2_PENALTY = 1e-3)
+
+    # The resumed call passes another seed, so only the checkpointed epoch and random stream can reproduce the full run
+    logRegres.advanced_stochastic_gradient_ascent_optimization(dataset, labels, NUM_ITER = 3, seed = 0, L2_PENALTY = 1e-3, CHECKPOINT_FILE = checkpoint_path)
+    resumed_weights = logRegres.advanced_stochastic_gradient_ascent_optimization(dataset, labels, NUM_ITER = 6, seed = 1, L2_PENALTY = 1e-3, CHECKPOINT_FILE = checkpoint_path, resume = True)
+
+    np.testing.assert_allclose(resumed_weights, full_weights, rtol = 1e-12, atol = 1e-15)
+
+# ========== FUNCTION TO CHECK RESUME REJECTS MISMATCHED OPTIMIZER SETTINGS ==========
+@pytest.mark.parametrize("optimizer, ALPHA", [("adam", 0.05), ("sgd", 0.1)])
+def test_resume_rejects_mismatched_optimizer_settings(tmp_path, optimizer, ALPHA):
+    logRegres, dataset, labels = load_standardized_horse_data()
+    checkpoint_path = str(tmp_path / "checkpoint.npz")
+    logRegres.mini_batch_gradient_descent_optimization(dataset, labels, NUM_ITER = 2, ALPHA = 0.05, optimizer = "sgd", seed = 0, CHECKPOINT_FILE = checkpoint_path)
+
+    with pytest.raises(ValueError):
+        logRegres.mini_batch_gradient_descent_optimization(dataset, labels, NUM_ITER = 4, ALPHA = ALPHA, optimizer = optimizer, seed = 0, CHECKPOINT_FILE = checkpoint_path, resume = True)
+    with pytest.raises(ValueError):
+        logRegres.advanced_stochastic_gradient_ascent_optimization(dataset, labels, NUM_ITER = 4, seed = 0, CHECKPOINT_FILE = checkpoint_path, resume = True)
@@ -29,6 +29,7 @@ CREDIT:             Machine Learning in Action (Peter Harrington)
 
 from time import time as t                  # Package for tracking modular and program runtime
 import numpy as np                          # Library for simple linear mathematical operations
+import imputation_pipeline as imp           # Modular program for cached imputation and standardization of feature files
 
 
 # ====================================================================================
@@ -79,6 +80,14 @@ class AdaBoost_Adaptive_Booster_Meta_Algorithm(object):
         print("\nFIRST 20 ENTRIES IN DATASET ARE: \n{}\n\nCLASS LABEL VECTOR IS: \n{}\n".format(dataset[:20], labels))
         return dataset, labels
 
+    # ============== METHOD TO ADAPTIVELY LOAD IN PREPROCESSED DATASETS ==============
+    def adaptive_load_preprocessed_data(self, TRAINING_FILENAME, TEST_FILENAME, strategy = "mean"):
+        # Missing zeros are imputed from training statistics and cached, so repeated runs skip parsing entirely
+        training_dataset, training_labels, test_dataset, test_labels, _ = imp.load_preprocessed_data(TRAINING_FILENAME, TEST_FILENAME, strategy)
+
+        """ print("\nFIRST 20 ENTRIES IN PREPROCESSED DATASET ARE: \n{}\n".format(training_dataset[:20])) """
+        return training_dataset, training_labels, test_dataset, test_labels
+
     # ================= METHOD TO CLASSIFY ELEMENT FROM DECISION STUMP ===============
     def classify_decision_stump(self, input_dataset, dimension, threshold_value, threshold_inequality):
         classification_array = np.ones((np.shape(input_dataset)[0], 1))
@@ -261,6 +270,13 @@ def main():
     ada.adaboost_testing_with_decision_stump([[5, 5], [0, 0], [1.5, 1.2], [-1, -1]], weak_classifiers)
     """
 
+    """
+    # Apply full AdaBoost against horse colic data with missing values imputed from training medians
+    training_dataset, training_labels, test_dataset, test_labels = ada.adaptive_load_preprocessed_data("./horse_colic_training02.txt", "./horse_colic_test02.txt", "median")
+    weak_classifiers = ada.adaboost_training_with_decision_stump(training_dataset, training_labels, 10)
+    predicted_labels = ada.adaboost_testing_with_decision_stump(test_dataset, weak_classifiers)
+    """
+
     
     # Apply full AdaBoost against horse colic data with 10 training iterations
     training_dataset, training_labels = ada.adaptive_load_data("./horse_colic_training02.txt")
@@ -0,0 +1,64 @@
+"""
+NAME:               imputation_pipeline.py (data_projects/machine_learning_in_action/algo_ch07/)
+
+DESCRIPTION:        Python loader for the chapter 5 preprocessing pipeline of feature files.
+
+                    Chapter 7 boosts on the same horse colic files as chapter 5, so it reuses
+                    the single imputation pipeline kept in algo_ch05/imputation_pipeline.py.
+                    That module is loaded from its file path under its own module name, which
+                    leaves sys.path untouched, and its functions are re-exported here for
+                    adaboost.py. Fixes to the pipeline therefore apply to both chapters.
+
+NOTE:               Original source code is in Python 2, but my code is in Python 3.
+
+CREDIT:             Machine Learning In Action (Peter Harrington)
+"""
+
+
+# ====================================================================================
+# ================================ IMPORT STATEMENTS =================================
+# ====================================================================================
+
+
+import os                                   # Library for basic operating system mechanics
+import importlib.util                       # Library for loading a module from an explicit file path
+
+
+# ====================================================================================
+# ============================== INITIALIZING CONSTANTS ==============================
+# ====================================================================================
+
+
+PIPELINE_FILENAME = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "algo_ch05", "imputation_pipeline.py")     # Single shared copy of the preprocessing pipeline
+
+
+# ====================================================================================
+# ============================ SHARED PIPELINE FUNCTIONS =============================
+# ====================================================================================
+
+
+# Loads the chapter 5 module under a distinct name so that it never shadows this loader
+pipeline_specification = importlib.util.spec_from_file_location("algo_ch05_imputation_pipeline", PIPELINE_FILENAME)
+shared_pipeline = importlib.util.module_from_spec(pipeline_specification)
+pipeline_specification.loader.exec_module(shared_pipeline)
+
+CACHE_DIRECTORY = shared_pipeline.CACHE_DIRECTORY
+MISSING_VALUE = shared_pipeline.MISSING_VALUE
+parse_feature_file = shared_pipeline.parse_feature_file
+fit_imputation_pipeline = shared_pipeline.fit_imputation_pipeline
+apply_imputation_pipeline = shared_pipeline.apply_imputation_pipeline
+get_cache_path = shared_pipeline.get_cache_path
+load_preprocessed_data = shared_pipeline.load_preprocessed_data
+
+
+# ====================================================================================
+# ================================ MAIN RUN FUNCTION =================================
+# ====================================================================================
+
+
+def main():
+    # Runs the shared pipeline demo against the chapter 7 horse colic files
+    return shared_pipeline.main("./horse_colic_training02.txt", "./horse_colic_test02.txt")
+
+if __name__ == "__main__":
+    main()